@@ -1,7 +1,12 @@
-from . import chess
-from . import color
-from . import school_tasks
-from . import texts
+from typing import TYPE_CHECKING
+
+from just_test._lazy import lazy_submodules
+
+if TYPE_CHECKING:
+    from . import chess
+    from . import color
+    from . import school_tasks
+    from . import texts
 
 __all__ = [
     "chess",
@@ -9,3 +14,6 @@ __all__ = [
     "school_tasks",
     "texts",
 ]
+
+# The submodules are imported on the first access
+__getattr__, __dir__ = lazy_submodules(__name__, __all__)
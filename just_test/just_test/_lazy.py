@@ -0,0 +1,42 @@
+import importlib
+
+from types import ModuleType
+from typing import Callable
+
+
+def lazy_submodules(
+        package_name: str,
+        submodules: list[str]
+) -> tuple[Callable[[str], ModuleType], Callable[[], list[str]]]:
+    """
+    Returns the module `__getattr__` and `__dir__` functions (PEP 562) that import the submodules
+    of the package on the first access, so importing the package does not import their dependencies.
+
+    Args:
+        package_name (str): The `__name__` of the package.
+        submodules (list[str]): The names of the submodules, usually `__all__`.
+
+    Returns:
+        tuple[Callable[[str], ModuleType], Callable[[], list[str]]]: `__getattr__` and `__dir__` of the package.
+
+    Example:
+
+    >>> import just_test
+    >>> 'texts' in dir(just_test), just_test.texts.__name__
+    (True, 'just_test.texts')
+
+    """
+    package_globals = importlib.import_module(package_name).__dict__
+    names = frozenset(submodules)
+
+    def __getattr__(name: str) -> ModuleType:
+        if name not in names:
+            raise AttributeError(f'module {package_name!r} has no attribute {name!r}')
+
+        # Importing a submodule also sets it as an attribute of the package, so this is called once
+        return importlib.import_module(f'{package_name}.{name}')
+
+    def __dir__() -> list[str]:
+        return sorted(set(package_globals) | names)
+
+    return __getattr__, __dir__
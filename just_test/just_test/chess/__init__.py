@@ -1,7 +1,12 @@
-from . import fen
-from . import lines
-from . import lines2
-from . import moveit
+from typing import TYPE_CHECKING
+
+from just_test._lazy import lazy_submodules
+
+if TYPE_CHECKING:
+    from . import fen
+    from . import lines
+    from . import lines2
+    from . import moveit
 
 __all__ = [
     'fen',
@@ -9,3 +14,6 @@ __all__ = [
     'lines2',
     'moveit'
 ]
+
+# The submodules are imported on the first access
+__getattr__, __dir__ = lazy_submodules(__name__, __all__)
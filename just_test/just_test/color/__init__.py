@@ -1,9 +1,17 @@
-from . import gen_colors
-from . import inter_colors
-from . import mix_colors
+from typing import TYPE_CHECKING
+
+from just_test._lazy import lazy_submodules
+
+if TYPE_CHECKING:
+    from . import gen_colors
+    from . import inter_colors
+    from . import mix_colors
 
 __all__ = [
     "gen_colors",
     "inter_colors",
     "mix_colors",
 ]
+
+# The submodules are imported on the first access
+__getattr__, __dir__ = lazy_submodules(__name__, __all__)
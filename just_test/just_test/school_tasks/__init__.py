@@ -1,5 +1,13 @@
-from . import school_tasks
+from typing import TYPE_CHECKING
+
+from just_test._lazy import lazy_submodules
+
+if TYPE_CHECKING:
+    from . import school_tasks
 
 __all__ = [
     "school_tasks",
 ]
+
+# The submodules are imported on the first access
+__getattr__, __dir__ = lazy_submodules(__name__, __all__)
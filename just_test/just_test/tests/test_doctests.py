@@ -1,5 +1,6 @@
 import doctest
 from just_test import texts
+from just_test import util
 
 
 def test_doctests_texts_books_prepare_direct_speech():
@@ -14,3 +15,94 @@ def test_doctests_texts_books_prepare_sent_tokenize():
     failure_count, test_count = doctest.testmod(texts.books.prepare.sent_tokenize, verbose=True)
     assert failure_count == 0, f"{failure_count} doctests failed out of {test_count}"
     assert test_count, "At least one doctest passed"
+
+
+def test_doctests_util_csv_writer():
+    """Run doctests in the 'util.csv_writer' module."""
+    failure_count, test_count = doctest.testmod(util.csv_writer, verbose=True)
+    assert failure_count == 0, f"{failure_count} doctests failed out of {test_count}"
+    assert test_count, "At least one doctest passed"
+
+
+def test_doctests_texts_books_prepare_cbow_windows():
+    """Run doctests in the 'texts.books.prepare.cbow_windows' module."""
+    failure_count, test_count = doctest.testmod(texts.books.prepare.cbow_windows, verbose=True)
+    assert failure_count == 0, f"{failure_count} doctests failed out of {test_count}"
+    assert test_count, "At least one doctest passed"
+
+
+def test_doctests_texts_books_prepare_vocabulary():
+    """Run doctests in the 'texts.books.prepare.vocabulary' module."""
+    failure_count, test_count = doctest.testmod(texts.books.prepare.vocabulary, verbose=True)
+    assert failure_count == 0, f"{failure_count} doctests failed out of {test_count}"
+    assert test_count, "At least one doctest passed"
+
+
+def test_doctests_util_npy_writer():
+    """Run doctests in the 'util.npy_writer' module."""
+    failure_count, test_count = doctest.testmod(util.npy_writer, verbose=True)
+    assert failure_count == 0, f"{failure_count} doctests failed out of {test_count}"
+    assert test_count, "At least one doctest passed"
+
+
+def test_doctests_texts_books_prepare_paragraphs_reader():
+    """Run doctests in the 'texts.books.prepare.paragraphs_reader' module."""
+    failure_count, test_count = doctest.testmod(texts.books.prepare.paragraphs_reader, verbose=True)
+    assert failure_count == 0, f"{failure_count} doctests failed out of {test_count}"
+    assert test_count, "At least one doctest passed"
+
+
+def test_doctests_texts_books_prepare_paragraphs_index():
+    """Run doctests in the 'texts.books.prepare.paragraphs_index' module."""
+    failure_count, test_count = doctest.testmod(texts.books.prepare.paragraphs_index, verbose=True)
+    assert failure_count == 0, f"{failure_count} doctests failed out of {test_count}"
+    assert test_count, "At least one doctest passed"
+
+
+def test_doctests_texts_books_prepare_near_duplicates():
+    """Run doctests in the 'texts.books.prepare.near_duplicates' module."""
+    failure_count, test_count = doctest.testmod(texts.books.prepare.near_duplicates, verbose=True)
+    assert failure_count == 0, f"{failure_count} doctests failed out of {test_count}"
+    assert test_count, "At least one doctest passed"
+
+
+def test_doctests_texts_books_prepare_paragraph_cache():
+    """Run doctests in the 'texts.books.prepare.paragraph_cache' module."""
+    failure_count, test_count = doctest.testmod(texts.books.prepare.paragraph_cache, verbose=True)
+    assert failure_count == 0, f"{failure_count} doctests failed out of {test_count}"
+    assert test_count, "At least one doctest passed"
+
+
+def test_doctests_texts_books_prepare_segments_manifest():
+    """Run doctests in the 'texts.books.prepare.segments_manifest' module."""
+    failure_count, test_count = doctest.testmod(texts.books.prepare.segments_manifest, verbose=True)
+    assert failure_count == 0, f"{failure_count} doctests failed out of {test_count}"
+    assert test_count, "At least one doctest passed"
+
+
+def test_doctests_texts_books_prepare_token_counts():
+    """Run doctests in the 'texts.books.prepare.token_counts' module."""
+    failure_count, test_count = doctest.testmod(texts.books.prepare.token_counts, verbose=True)
+    assert failure_count == 0, f"{failure_count} doctests failed out of {test_count}"
+    assert test_count, "At least one doctest passed"
+
+
+def test_doctests_texts_books_prepare_word_tokenize():
+    """Run doctests in the 'texts.books.prepare.word_tokenize' module."""
+    failure_count, test_count = doctest.testmod(texts.books.prepare.word_tokenize, verbose=True)
+    assert failure_count == 0, f"{failure_count} doctests failed out of {test_count}"
+    assert test_count, "At least one doctest passed"
+
+
+def test_doctests_util_text_files():
+    """Run doctests in the 'util.text_files' module."""
+    failure_count, test_count = doctest.testmod(util.text_files, verbose=True)
+    assert failure_count == 0, f"{failure_count} doctests failed out of {test_count}"
+    assert test_count, "At least one doctest passed"
+
+
+def test_doctests_util_stage_stats():
+    """Run doctests in the 'util.stage_stats' module."""
+    failure_count, test_count = doctest.testmod(util.stage_stats, verbose=True)
+    assert failure_count == 0, f"{failure_count} doctests failed out of {test_count}"
+    assert test_count, "At least one doctest passed"
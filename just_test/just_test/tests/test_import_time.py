@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+
+from pathlib import Path
+
+import pytest
+
+import just_test
+
+# The parent directory of the package
+PACKAGE_ROOT = Path(just_test.__file__).resolve().parents[1]
+
+HEAVY_MODULES = ('matplotlib', 'nltk', 'numpy', 'pandas', 'tqdm')
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(PACKAGE_ROOT), os.environ.get('PYTHONPATH', '')]))
+    return subprocess.run([sys.executable, *args], env=env, capture_output=True, text=True, check=True)
+
+
+def get_import_times(statement: str) -> dict[str, int]:
+    """
+    Runs the statement with `python -X importtime`, returns the cumulative import times in microseconds.
+    The modules imported with `importlib.import_module`, as the lazy submodules are, are not reported.
+    """
+    result = run_python('-X', 'importtime', '-c', statement)
+
+    res = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+
+        _, cumulative, name = line.removeprefix('import time:').split('|')
+        res[name.strip()] = int(cumulative)
+
+    return res
+
+
+@pytest.mark.parametrize("statement", [
+    "import just_test",
+    "import just_test.texts.books.prepare",
+    "from just_test.texts.books.prepare.sent_tokenize import simple_sent_tokenize",
+    "from just_test.texts.books.prepare.direct_speech import reconstruct_direct_speech",
+])
+def test_no_heavy_imports(statement):
+    import_times = get_import_times(statement)
+    assert 'just_test' in import_times
+
+    heavy = sorted(name for name in import_times if name.split('.')[0] in HEAVY_MODULES)
+    assert not heavy, f'{statement!r} imports {heavy}'
+
+
+def test_package_import_time():
+    # Generous, the package alone takes a few milliseconds
+    assert get_import_times('import just_test.texts.books.prepare')['just_test'] < 500_000
+
+
+def test_lazy_attributes():
+    statement = (
+        'import sys; import just_test.texts.books.prepare as prepare; prepare.vocabulary.Vocabulary; '
+        'print(*sorted(sys.modules))'
+    )
+    modules = run_python('-c', statement).stdout.split()
+    assert 'just_test.texts.books.prepare.vocabulary' in modules
+    assert 'just_test.texts.books.prepare.english_cbow_dataset' not in modules
+    assert 'just_test.chess' not in modules
+
+    with pytest.raises(AttributeError):
+        just_test.texts.books.prepare.missing_module
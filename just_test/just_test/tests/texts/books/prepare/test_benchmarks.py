@@ -0,0 +1,198 @@
+"""
+    Throughput benchmarks of the hot paths of `texts.books.prepare`, opt-in and based on pytest-benchmark.
+
+    Environment variables:
+    `JUST_TEST_BENCHMARK`: set to 1 to run the benchmarks, they are skipped otherwise,
+    `JUST_TEST_BENCHMARK_BASELINE`: the path to the baseline JSON file, defaults to `BASELINE_PATH`,
+    `JUST_TEST_BENCHMARK_TOLERANCE`: the allowed relative throughput drop, defaults to 0.25,
+    `JUST_TEST_BENCHMARK_SAVE`: set to 1 to save the measured throughputs as the baseline instead of comparing.
+
+    The throughput is the number of input characters per second of the fastest round. A benchmark fails
+    if its throughput is less than `(1 - tolerance)` of the baseline. The baseline depends on the machine,
+    so save it on the machine where the benchmarks are compared, for example:
+
+        JUST_TEST_BENCHMARK=1 JUST_TEST_BENCHMARK_SAVE=1 pytest just_test/tests/texts/books/prepare/test_benchmarks.py
+
+"""
+
+import io
+import json
+import os
+import random
+
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from just_test.texts.books.prepare.cbow_writers import CBOWCsvWriter
+from just_test.texts.books.prepare.direct_speech import reconstruct_direct_speech
+from just_test.texts.books.prepare.english import prepare_english_book_text
+from just_test.texts.books.prepare.english_cbow_dataset import EnglishBookCBOWDatasetCreator
+from just_test.texts.books.prepare.paragraphs_reader import TextParagraphsReader
+from just_test.texts.books.prepare.sent_tokenize import simple_sent_tokenize
+
+pytestmark = pytest.mark.skipif(
+    os.environ.get('JUST_TEST_BENCHMARK') != '1',
+    reason='Benchmarks are run only with JUST_TEST_BENCHMARK=1'
+)
+
+RESOURCES_PATH = Path(__file__).parent / "../../../resources"
+BASELINE_PATH = RESOURCES_PATH / "texts/books/prepare/benchmark_baseline.json"
+
+# Sizes of the synthetic inputs in characters
+SIZES = {
+    'small': 4 * 1024,
+    'medium': 64 * 1024,
+    'book': 512 * 1024,
+}
+
+WORDS = (
+    'the and to a of she it said in was you i that as her at on all with had but for so be not very what this '
+    'they little out down up his if about then no know like one would went could herself again queen thought '
+    'time see king off turtle how me well mock hatter quite gryphon began way head think rabbit voice first '
+    'much looked never go any duchess dormouse round when get say do more into only came other cat great'
+).split()
+NAMES = ('Alice', 'the Hatter', 'the Queen', 'the Gryphon', 'the Duchess', 'the Mock Turtle')
+SPEECH_VERBS = ('said', 'cried', 'asked', 'replied', 'whispered')
+
+
+def create_words(rnd: random.Random, min_count: int = 3, max_count: int = 14) -> str:
+    return ' '.join(rnd.choice(WORDS) for _ in range(rnd.randint(min_count, max_count)))
+
+
+def create_sentence(rnd: random.Random) -> str:
+    sentence = create_words(rnd)
+    # About one sentence in six has a dash, one in eight has a parenthesis, one in ten has a semicolon
+    if rnd.random() < 0.17:
+        sentence += rnd.choice([' -- ', '—', ' - ']) + create_words(rnd, 2, 6)
+    if rnd.random() < 0.12:
+        sentence += f' ({create_words(rnd, 1, 5)})'
+    if rnd.random() < 0.1:
+        sentence += '; ' + create_words(rnd, 2, 8)
+
+    return sentence[0].upper() + sentence[1:] + rnd.choice('....!?')
+
+
+def create_paragraph(rnd: random.Random) -> str:
+    kind = rnd.random()
+    if kind < 0.4:
+        # Dialogue: "Quote," said Alice, "quote."
+        first = create_sentence(rnd)
+        text = f'"{first[:-1]}," {rnd.choice(SPEECH_VERBS)} {rnd.choice(NAMES)}'
+        if rnd.random() < 0.5:
+            text += f', "{create_sentence(rnd).lower()}"'
+        else:
+            text += f'. "{create_sentence(rnd)} {create_sentence(rnd)}"'
+        if rnd.random() < 0.2:
+            text += f" 'Inner {create_words(rnd, 1, 4)}!'"
+    else:
+        text = ' '.join(create_sentence(rnd) for _ in range(rnd.randint(1, 6)))
+
+    # Books are hard-wrapped
+    lines, line = [], []
+    for word in text.split(' '):
+        line.append(word)
+        if sum(len(w) + 1 for w in line) > 70:
+            lines.append(' '.join(line))
+            line = []
+    if line:
+        lines.append(' '.join(line))
+
+    return '\n'.join(lines)
+
+
+def create_synthetic_book(size: int, seed: int = 1719) -> str:
+    """Creates a text of about `size` characters with paragraphs separated by empty lines."""
+    rnd = random.Random(seed)
+    paragraphs = []
+    length = 0
+    while length < size:
+        paragraph = create_paragraph(rnd)
+        paragraphs.append(paragraph)
+        length += len(paragraph) + 2
+
+    return '\n\n'.join(paragraphs)[:size]
+
+
+@pytest.fixture(scope='module', params=list(SIZES))
+def book(request) -> tuple[str, str, list[str]]:
+    text = create_synthetic_book(SIZES[request.param])
+    return request.param, text, list(TextParagraphsReader(io.StringIO(text)))
+
+
+def check_throughput(benchmark, name: str, size: int) -> None:
+    throughput = size / benchmark.stats.stats.min
+    benchmark.extra_info['throughput'] = throughput
+
+    baseline_path = Path(os.environ.get('JUST_TEST_BENCHMARK_BASELINE', BASELINE_PATH))
+    baseline = {}
+    if baseline_path.exists():
+        with baseline_path.open('r', encoding='UTF-8') as fp:
+            baseline = json.load(fp)
+
+    if os.environ.get('JUST_TEST_BENCHMARK_SAVE') == '1':
+        baseline[name] = round(throughput)
+        with baseline_path.open('w', encoding='UTF-8') as fp:
+            json.dump(dict(sorted(baseline.items())), fp, indent=1)
+            fp.write('\n')
+        return
+
+    if name not in baseline:
+        pytest.skip(f'No baseline for {name}')
+
+    tolerance = float(os.environ.get('JUST_TEST_BENCHMARK_TOLERANCE', '0.25'))
+    expected = baseline[name] * (1 - tolerance)
+    assert throughput >= expected, \
+        f'{name}: {throughput:.0f} chars/s, the baseline is {baseline[name]:.0f} chars/s, tolerance {tolerance:.0%}'
+
+
+def run_benchmark(benchmark, func, size: int) -> None:
+    # The book-sized inputs take long, fewer rounds are enough
+    rounds = 3 if size >= SIZES['book'] else 10
+    benchmark.pedantic(func, rounds=rounds, warmup_rounds=1)
+
+
+def test_paragraphs_reader(benchmark, book):
+    size_name, text, _ = book
+    run_benchmark(benchmark, lambda: list(TextParagraphsReader(io.StringIO(text))), len(text))
+    check_throughput(benchmark, f'paragraphs_reader[{size_name}]', len(text))
+
+
+def test_prepare_english_book_text(benchmark, book):
+    size_name, text, paragraphs = book
+    run_benchmark(benchmark, lambda: [prepare_english_book_text(p) for p in paragraphs], len(text))
+    check_throughput(benchmark, f'prepare_english_book_text[{size_name}]', len(text))
+
+
+def test_reconstruct_direct_speech(benchmark, book):
+    size_name, text, paragraphs = book
+    prepared = [prepare_english_book_text(p) for p in paragraphs]
+
+    def run():
+        return [reconstruct_direct_speech(p, sent_tokenize=simple_sent_tokenize) for p in prepared]
+
+    run_benchmark(benchmark, run, len(text))
+    check_throughput(benchmark, f'reconstruct_direct_speech[{size_name}]', len(text))
+
+
+def test_simple_sent_tokenize(benchmark, book):
+    size_name, text, paragraphs = book
+    run_benchmark(benchmark, lambda: [simple_sent_tokenize(p) for p in paragraphs], len(text))
+    check_throughput(benchmark, f'simple_sent_tokenize[{size_name}]', len(text))
+
+
+def test_process_text(benchmark, book, tmp_path):
+    size_name, text, paragraphs = book
+    creator = EnglishBookCBOWDatasetCreator([], str(tmp_path / 'cbow.csv'), sent_tokenize=simple_sent_tokenize)
+    sentences_creator = creator._create_sentences_creator()
+
+    def run():
+        output_path = tmp_path / 'cbow.csv'
+        with CBOWCsvWriter(output_path, window_size=creator.window_size, mask_token=creator.MASK_TOKEN) as writer:
+            for paragraph in paragraphs:
+                creator._process_text(paragraph, writer, sentences_creator)
+
+    run_benchmark(benchmark, run, len(text))
+    check_throughput(benchmark, f'process_text[{size_name}]', len(text))
@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+from just_test.texts.books.prepare.cbow_windows import (
+    create_cbow_pairs,
+    create_cbow_pairs_by_slices,
+    create_cbow_window_ids,
+    create_cbow_windows,
+)
+
+MASK_TOKEN = '<MASK>'
+
+
+def create_sentences(count: int, seed: int) -> list[list[str]]:
+    rnd = random.Random(seed)
+    words = ['the', 'alice', ',', '``', "''", "n't", 'queen', '.', '', '<mask>']
+    return [
+        [rnd.choice(words) for _ in range(rnd.randint(1, 30))]
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.parametrize("window_size", [1, 2, 5])
+@pytest.mark.parametrize("seed", range(5))
+def test_pairs_by_slices_equal_reference(window_size, seed):
+    for tokens in create_sentences(50, seed):
+        expected = create_cbow_pairs(tokens, window_size, MASK_TOKEN)
+        assert create_cbow_pairs_by_slices(tokens, window_size) == expected
+
+
+@pytest.mark.parametrize("window_size", [1, 2, 5])
+@pytest.mark.parametrize("seed", range(5))
+def test_window_ids_equal_reference(window_size, seed):
+    pad_id = 0
+    sentences = [[len(token) + 1 for token in tokens] for tokens in create_sentences(50, seed)]
+
+    expected_contexts, expected_targets = [], []
+    for ids in sentences:
+        for window in create_cbow_windows(ids, window_size, pad_id):
+            expected_contexts.append(list(window[:window_size] + window[window_size + 1:]))
+            expected_targets.append(window[window_size])
+
+    contexts, targets = create_cbow_window_ids(sentences, window_size, pad_id)
+    assert contexts.shape == (len(expected_targets), 2 * window_size)
+    assert contexts.tolist() == expected_contexts
+    assert targets.tolist() == expected_targets
+
+
+@pytest.mark.parametrize("sentences", [[], [[]], [[], []]])
+def test_window_ids_without_tokens(sentences):
+    contexts, targets = create_cbow_window_ids(sentences, 3, 0)
+    assert contexts.shape == (0, 6)
+    assert targets.shape == (0,)
@@ -0,0 +1,675 @@
+import csv
+import gzip
+import json
+import lzma
+import re
+
+from collections import Counter
+from pathlib import Path
+
+import nltk
+import numpy as np
+import pytest
+from nltk.tokenize.punkt import PunktSentenceTokenizer
+
+from just_test.texts.books.prepare.cbow_dataset_options import (
+    CBOWDatasetOptions,
+    CheckpointOptions,
+    NearDuplicateOptions,
+    OutputOptions,
+    ParallelOptions,
+    ProfileOptions,
+    SegmentsOptions,
+    SubsamplingOptions,
+)
+from just_test.texts.books.prepare.cbow_writers import CBOWCsvWriter, CBOWNpyWriter, CBOWShardedCsvWriter
+from just_test.texts.books.prepare.english_cbow_dataset import EnglishBookCBOWDatasetCreator
+from just_test.texts.books.prepare.paragraphs_reader import TextParagraphsReader
+from just_test.texts.books.prepare.sent_tokenize import SimpleSentenceSpanTokenizer, simple_sent_tokenize
+from just_test.texts.books.prepare.vocabulary import Vocabulary
+from just_test.texts.books.prepare.word_tokenize import regex_word_tokenize
+from just_test.util.stage_stats import StageStats
+from just_test.util.text_files import open_text
+
+RESOURCES_PATH = Path(__file__).parent / "../../../resources"
+TEXT_CASES_PATH = RESOURCES_PATH / "texts/books/prepare/reconstruct_direct_speech_cases.txt"
+
+
+@pytest.fixture
+def raw_text_paths(tmp_path) -> list[str]:
+    """Splits the test cases file into two books, one paragraph per case."""
+    with TEXT_CASES_PATH.open('r', encoding='utf-8') as fp:
+        file_text = fp.read(1000000)
+
+    paragraphs = []
+    for case_text in re.split(r'\n==================================================\n', file_text):
+        paragraphs.extend(p for p in re.split(r'\n=\n', case_text) if p.strip())
+
+    res = []
+    half = len(paragraphs) // 2
+    for idx, book in enumerate([paragraphs[:half], paragraphs[half:]]):
+        path = tmp_path / f'book_{idx}.txt'
+        path.write_text('\n\n'.join(book), encoding='utf-8')
+        res.append(str(path))
+
+    return res
+
+
+def create_dataset(
+        raw_text_paths: list[str],
+        output_csv_path: Path,
+        seed: int = 1719,
+        **options
+) -> EnglishBookCBOWDatasetCreator:
+    """Creates the dataset with the given `CBOWDatasetOptions`."""
+    creator = EnglishBookCBOWDatasetCreator(
+        raw_text_paths,
+        str(output_csv_path),
+        window_size=2,
+        seed=seed,
+        sent_tokenize=simple_sent_tokenize,
+        options=CBOWDatasetOptions(**options)
+    )
+    creator.create()
+    return creator
+
+
+@pytest.mark.parametrize("num_workers, batch_size", [(2, 1), (2, 7), (3, 1000)])
+def test_parallel_output_is_identical(raw_text_paths, tmp_path, num_workers, batch_size):
+    create_dataset(raw_text_paths, tmp_path / 'serial.csv')
+    create_dataset(
+        raw_text_paths,
+        tmp_path / 'parallel.csv',
+        parallel=ParallelOptions(num_workers=num_workers, batch_size=batch_size)
+    )
+    expected = (tmp_path / 'serial.csv').read_text(encoding='utf-8')
+    result = (tmp_path / 'parallel.csv').read_text(encoding='utf-8')
+
+    assert expected.startswith('context,target,split\n')
+    assert len(expected.splitlines()) > 100
+    assert result == expected
+
+
+def read_csv_windows(csv_path: Path) -> dict[str, list[tuple[str, str]]]:
+    res = {'train': [], 'val': [], 'test': []}
+    with csv_path.open('r', encoding='utf-8', newline='') as fp:
+        for context, target, split in list(csv.reader(fp))[1:]:
+            res[split].append((context, target))
+
+    return res
+
+
+def decode_windows(contexts, targets, vocabulary: Vocabulary) -> list[tuple[str, str]]:
+    return [
+        (' '.join(vocabulary.tokens[i] for i in context if i), vocabulary.tokens[target])
+        for context, target in zip(contexts.tolist(), targets.tolist())
+    ]
+
+
+def test_npy_output_format(raw_text_paths, tmp_path):
+    create_dataset(raw_text_paths, tmp_path / 'cbow.csv')
+    expected = read_csv_windows(tmp_path / 'cbow.csv')
+
+    create_dataset(raw_text_paths, tmp_path / 'arrays' / 'cbow.csv', output=OutputOptions(format='npy'))
+    vocabulary = Vocabulary.load(tmp_path / 'arrays' / 'cbow.vocab.txt')
+    assert vocabulary.tokens[0] == EnglishBookCBOWDatasetCreator.MASK_TOKEN
+    assert not (tmp_path / 'arrays' / 'cbow.csv').exists()
+
+    for split, windows in expected.items():
+        contexts = np.load(tmp_path / 'arrays' / f'cbow.{split}.context.npy', mmap_mode='r')
+        targets = np.load(tmp_path / 'arrays' / f'cbow.{split}.target.npy', mmap_mode='r')
+        assert contexts.shape == (len(windows), 4)
+        assert decode_windows(contexts, targets, vocabulary) == windows
+
+
+def test_parquet_output_format(raw_text_paths, tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+
+    create_dataset(raw_text_paths, tmp_path / 'cbow.csv')
+    expected = read_csv_windows(tmp_path / 'cbow.csv')
+
+    create_dataset(raw_text_paths, tmp_path / 'arrays' / 'cbow.csv', output=OutputOptions(format='parquet'))
+    vocabulary = Vocabulary.load(tmp_path / 'arrays' / 'cbow.vocab.txt')
+
+    for split, windows in expected.items():
+        table = pq.read_table(tmp_path / 'arrays' / f'cbow.{split}.parquet')
+        contexts = np.array(table['context'].to_pylist(), dtype=np.int32).reshape(-1, 4)
+        targets = table['target'].to_numpy()
+        assert decode_windows(contexts, targets, vocabulary) == windows
+
+
+def test_compressed_raw_texts(raw_text_paths, tmp_path):
+    create_dataset(raw_text_paths, tmp_path / 'plain.csv')
+
+    compressed_paths = []
+    for raw_text_path, open_file, suffix in zip(raw_text_paths, [gzip.open, lzma.open], ['.gz', '.xz']):
+        compressed_path = f'{raw_text_path}{suffix}'
+        with open(raw_text_path, 'rb') as fp, open_file(compressed_path, 'wb') as compressed_fp:
+            compressed_fp.write(fp.read())
+        compressed_paths.append(compressed_path)
+
+    create_dataset(compressed_paths, tmp_path / 'compressed.csv')
+    expected = (tmp_path / 'plain.csv').read_text(encoding='utf-8')
+    assert (tmp_path / 'compressed.csv').read_text(encoding='utf-8') == expected
+
+
+@pytest.mark.parametrize("num_workers, checkpoint_interval, crash_after", [(1, 10, 35), (1, 7, 50), (2, 10, 55)])
+def test_resume_from_checkpoint(raw_text_paths, tmp_path, monkeypatch, num_workers, checkpoint_interval, crash_after):
+    create_dataset(raw_text_paths, tmp_path / 'expected.csv')
+    expected = (tmp_path / 'expected.csv').read_text(encoding='utf-8')
+
+    read_paragraphs = EnglishBookCBOWDatasetCreator._read_paragraphs
+
+    def crashing_read_paragraphs(self, *args, **kwargs):
+        for i, item in enumerate(read_paragraphs(self, *args, **kwargs)):
+            if i == crash_after:
+                raise RuntimeError('Crash')
+            yield item
+
+    creator = EnglishBookCBOWDatasetCreator(
+        raw_text_paths,
+        str(tmp_path / 'cbow.csv'),
+        window_size=2,
+        sent_tokenize=simple_sent_tokenize,
+        options=CBOWDatasetOptions(
+            parallel=ParallelOptions(num_workers=num_workers, batch_size=4),
+            checkpoints=CheckpointOptions(checkpoint_interval)
+        )
+    )
+    with monkeypatch.context() as m:
+        m.setattr(EnglishBookCBOWDatasetCreator, '_read_paragraphs', crashing_read_paragraphs)
+        with pytest.raises(RuntimeError, match='Crash'):
+            creator.create()
+
+    assert creator.get_checkpoint_path().exists()
+    assert (tmp_path / 'cbow.csv').read_text(encoding='utf-8') != expected
+
+    creator.create(resume=True)
+    assert not creator.get_checkpoint_path().exists()
+    assert (tmp_path / 'cbow.csv').read_text(encoding='utf-8') == expected
+
+
+def test_resume_with_different_parameters(raw_text_paths, tmp_path):
+    output_csv_path = tmp_path / 'cbow.csv'
+    creator = EnglishBookCBOWDatasetCreator(
+        raw_text_paths,
+        str(output_csv_path),
+        window_size=2,
+        options=CBOWDatasetOptions(checkpoints=CheckpointOptions(10))
+    )
+    creator.get_checkpoint_path().write_text(
+        '{"version": 1, "config": {"window_size": 3}}',
+        encoding='utf-8'
+    )
+
+    with pytest.raises(ValueError, match='different parameters'):
+        creator.create(resume=True)
+
+
+def test_checkpoint_interval_validation():
+    with pytest.raises(ValueError):
+        CheckpointOptions(0)
+    with pytest.raises(ValueError):
+        CBOWDatasetOptions(output=OutputOptions(format='npy'), checkpoints=CheckpointOptions(10))
+
+
+def test_incremental_build_with_segments(raw_text_paths, tmp_path):
+    segments_dir = tmp_path / 'segments'
+
+    # The output of each book does not depend on the other books
+    for idx, raw_text_path in enumerate(raw_text_paths):
+        segments = SegmentsOptions(str(tmp_path / f'segments_{idx}'))
+        create_dataset([raw_text_path], tmp_path / f'book_{idx}.csv', segments=segments)
+    book_texts = [(tmp_path / f'book_{idx}.csv').read_text(encoding='utf-8') for idx in range(len(raw_text_paths))]
+
+    creator = create_dataset(raw_text_paths[:1], tmp_path / 'cbow.csv', segments=SegmentsOptions(str(segments_dir)))
+    assert creator.segment_counts == {'built': 1}
+    assert (tmp_path / 'cbow.csv').read_text(encoding='utf-8') == book_texts[0]
+
+    # Only the new book is processed
+    creator = create_dataset(
+        raw_text_paths,
+        tmp_path / 'cbow.csv',
+        segments=SegmentsOptions(str(segments_dir)),
+        parallel=ParallelOptions(num_workers=2)
+    )
+    assert creator.segment_counts == {'built': 1, 'reused': 1}
+    result = (tmp_path / 'cbow.csv').read_text(encoding='utf-8')
+    assert result == book_texts[0] + book_texts[1].split('\n', 1)[1]
+    assert len(list(segments_dir.glob('*.csv'))) == 2
+
+    # A changed book is processed again, and the segment of its previous content is removed
+    with open(raw_text_paths[0], 'a', encoding='utf-8') as fp:
+        fp.write('\n\nThe Rabbit took a watch out of its waistcoat-pocket, and looked at it.')
+    creator = create_dataset(raw_text_paths, tmp_path / 'cbow.csv', segments=SegmentsOptions(str(segments_dir)))
+    assert creator.segment_counts == {'built': 1, 'reused': 1, 'removed': 1}
+    assert (tmp_path / 'cbow.csv').read_text(encoding='utf-8').endswith(book_texts[1].split('\n', 1)[1])
+    assert len(list(segments_dir.glob('*.csv'))) == 2
+
+    # Different parameters invalidate the segments
+    creator = create_dataset(raw_text_paths, tmp_path / 'cbow.csv', segments=SegmentsOptions(str(segments_dir)), seed=1)
+    assert creator.segment_counts == {'built': 2}
+
+    # So does a different tokenizer
+    creator = create_dataset(
+        raw_text_paths,
+        tmp_path / 'cbow.csv',
+        seed=1,
+        segments=SegmentsOptions(str(segments_dir)),
+        word_tokenize=regex_word_tokenize
+    )
+    assert creator.segment_counts == {'built': 2}
+
+
+def test_segments_share_process_pool(raw_text_paths, tmp_path, monkeypatch):
+    expected_segments = SegmentsOptions(str(tmp_path / 'expected_segments'))
+    create_dataset(raw_text_paths, tmp_path / 'expected.csv', segments=expected_segments)
+
+    executors = []
+    create_executor = EnglishBookCBOWDatasetCreator._create_executor
+
+    def create_counted_executor(self):
+        executors.append(create_executor(self))
+        return executors[-1]
+
+    monkeypatch.setattr(EnglishBookCBOWDatasetCreator, '_create_executor', create_counted_executor)
+    creator = create_dataset(
+        raw_text_paths,
+        tmp_path / 'cbow.csv',
+        segments=SegmentsOptions(str(tmp_path / 'segments')),
+        parallel=ParallelOptions(num_workers=2)
+    )
+
+    assert creator.segment_counts == {'built': 2}
+    assert len(executors) == 1
+    expected = (tmp_path / 'expected.csv').read_text(encoding='utf-8')
+    assert (tmp_path / 'cbow.csv').read_text(encoding='utf-8') == expected
+
+
+def test_segments_cleanup_keeps_other_files(raw_text_paths, tmp_path):
+    segments_dir = tmp_path / 'segments'
+    segments_dir.mkdir()
+    user_path = segments_dir / 'notes.csv'
+    user_path.write_text('a,b\n', encoding='utf-8')
+    # The output file in the segments directory
+    output_path = segments_dir / 'cbow.csv'
+
+    create_dataset(raw_text_paths, output_path, segments=SegmentsOptions(str(segments_dir)))
+    segment_paths = set(segments_dir.glob('*.csv')) - {user_path, output_path}
+    assert len(segment_paths) == 2
+
+    # The segments of other parameters are removed when their books are no longer in the dataset
+    create_dataset(raw_text_paths[:1], output_path, segments=SegmentsOptions(str(segments_dir)), seed=1)
+    assert len(set(segments_dir.glob('*.csv')) - {user_path, output_path}) == 1
+    assert user_path.read_text(encoding='utf-8') == 'a,b\n'
+    assert output_path.exists()
+
+
+def test_segments_validation(tmp_path):
+    with pytest.raises(ValueError):
+        CBOWDatasetOptions(output=OutputOptions(format='npy'), segments=SegmentsOptions(str(tmp_path / 'segments')))
+    with pytest.raises(ValueError):
+        CBOWDatasetOptions(checkpoints=CheckpointOptions(10), segments=SegmentsOptions(str(tmp_path / 'segments')))
+
+
+@pytest.mark.parametrize("num_workers, count_sketch_width", [(1, None), (2, None), (1, 1 << 16)])
+def test_subsampling(raw_text_paths, tmp_path, num_workers, count_sketch_width):
+    create_dataset(raw_text_paths, tmp_path / 'plain.csv')
+    plain_windows = read_csv_windows(tmp_path / 'plain.csv')
+    plain_targets = [target for windows in plain_windows.values() for _, target in windows]
+
+    creator = EnglishBookCBOWDatasetCreator(
+        raw_text_paths,
+        str(tmp_path / 'cbow.csv'),
+        window_size=2,
+        sent_tokenize=simple_sent_tokenize,
+        options=CBOWDatasetOptions(
+            parallel=ParallelOptions(num_workers=num_workers),
+            subsampling=SubsamplingOptions(threshold=1e-3, min_count=2, count_sketch_width=count_sketch_width)
+        )
+    )
+    creator.create()
+    assert not creator.get_sentences_path().exists()
+
+    windows = read_csv_windows(tmp_path / 'cbow.csv')
+    targets = [target for split_windows in windows.values() for _, target in split_windows]
+    plain_counts = Counter(plain_targets)
+    counts = Counter(targets)
+
+    # Rare tokens are removed, frequent tokens are subsampled
+    assert min(plain_counts[token] for token in counts) >= 2
+    assert counts['the'] < plain_counts['the'] / 2
+    assert all(counts[token] <= plain_counts[token] for token in counts)
+
+    report = creator.vocabulary_report
+    assert report.windows_count == len(plain_targets)
+    assert report.kept_windows_count == len(targets)
+    assert report.kept_vocabulary_size == len(counts)
+    assert report.vocabulary_size == (len(plain_counts) if count_sketch_width is None else None)
+    assert report.reduction > 1.5
+
+
+def test_subsampling_is_reproducible(raw_text_paths, tmp_path):
+    subsampling = SubsamplingOptions(threshold=1e-2)
+    create_dataset(raw_text_paths, tmp_path / 'serial.csv', subsampling=subsampling)
+    create_dataset(
+        raw_text_paths,
+        tmp_path / 'parallel.csv',
+        subsampling=subsampling,
+        parallel=ParallelOptions(num_workers=2, batch_size=3)
+    )
+    expected = read_csv_windows(tmp_path / 'serial.csv')
+    assert read_csv_windows(tmp_path / 'parallel.csv') == expected
+
+    create_dataset(
+        raw_text_paths,
+        tmp_path / 'arrays' / 'cbow.csv',
+        subsampling=subsampling,
+        output=OutputOptions(format='npy')
+    )
+    vocabulary = Vocabulary.load(tmp_path / 'arrays' / 'cbow.vocab.txt')
+    for split, windows in expected.items():
+        contexts = np.load(tmp_path / 'arrays' / f'cbow.{split}.context.npy')
+        targets = np.load(tmp_path / 'arrays' / f'cbow.{split}.target.npy')
+        assert decode_windows(contexts, targets, vocabulary) == windows
+
+
+@pytest.mark.parametrize("kwargs", [{}, {'threshold': 0}, {'min_count': 0}])
+def test_subsampling_validation(kwargs):
+    with pytest.raises(ValueError):
+        SubsamplingOptions(**kwargs)
+
+
+def read_csv_rows(csv_path: Path) -> list[tuple[str, ...]]:
+    with csv_path.open('r', encoding='utf-8', newline='') as fp:
+        rows = list(csv.reader(fp))
+
+    assert rows[0] == ['context', 'target', 'split']
+    return [tuple(row) for row in rows[1:]]
+
+
+@pytest.mark.parametrize("num_shards", [1, 4])
+def test_sharded_output(raw_text_paths, tmp_path, num_shards):
+    create_dataset(raw_text_paths, tmp_path / 'cbow.csv')
+    expected = read_csv_rows(tmp_path / 'cbow.csv')
+
+    create_dataset(raw_text_paths, tmp_path / 'shards' / 'cbow.csv', output=OutputOptions(num_shards=num_shards))
+    shard_paths = sorted((tmp_path / 'shards').iterdir())
+    assert [path.name for path in shard_paths] == [
+        f'cbow.{k:05d}-of-{num_shards:05d}.csv' for k in range(num_shards)
+    ]
+
+    shards = [read_csv_rows(path) for path in shard_paths]
+    rows = [row for shard in shards for row in shard]
+    assert sorted(rows) == sorted(expected)
+    assert rows != expected
+    assert min(len(shard) for shard in shards) > len(expected) / num_shards / 2
+
+    # The same order with the same seed
+    create_dataset(
+        raw_text_paths,
+        tmp_path / 'shards' / 'cbow.csv',
+        output=OutputOptions(num_shards=num_shards),
+        parallel=ParallelOptions(num_workers=2)
+    )
+    assert [read_csv_rows(path) for path in shard_paths] == shards
+
+
+def test_sharded_writer_with_many_shards(tmp_path):
+    sentences = [[f'word{i}' for i in range(k, k + 10)] for k in range(100)]
+    output_path = tmp_path / 'cbow.csv'
+    with CBOWShardedCsvWriter(output_path, window_size=2, mask_token='<mask>', num_shards=2000, seed=0) as writer:
+        for _ in range(10):
+            writer.write(sentences, 'train')
+        # The rows are buffered, no file is created before the buffers are full
+        assert not list(tmp_path.iterdir())
+
+    shard_paths = CBOWShardedCsvWriter.get_output_paths(output_path, 2000)
+    assert sorted(tmp_path.iterdir()) == shard_paths
+    assert sum(len(read_csv_rows(path)) for path in shard_paths) == 10 * 100 * 10
+
+
+def test_sharded_writer_default_output_paths(tmp_path):
+    shard_paths = CBOWShardedCsvWriter.get_output_paths(tmp_path / 'cbow.csv')
+    assert len(shard_paths) == CBOWShardedCsvWriter.DEFAULT_NUM_SHARDS
+    assert shard_paths[0].name == f'cbow.00000-of-{CBOWShardedCsvWriter.DEFAULT_NUM_SHARDS:05d}.csv'
+
+    # The same arguments as the constructor
+    with CBOWShardedCsvWriter(tmp_path / 'cbow.csv', window_size=2, mask_token='<mask>') as writer:
+        writer.write([['a', 'b', 'c']], 'train')
+    assert sorted(tmp_path.iterdir()) == shard_paths
+
+
+@pytest.mark.parametrize("writer_class, kwargs", [
+    (CBOWCsvWriter, {}),
+    (CBOWNpyWriter, {}),
+    (CBOWShardedCsvWriter, {'num_shards': 3, 'seed': 0}),
+])
+def test_writer_output_paths(tmp_path, writer_class, kwargs):
+    output_path = tmp_path / 'cbow.csv'
+    with writer_class(output_path, window_size=2, mask_token='<mask>', **kwargs) as writer:
+        writer.write([['a', 'b', 'c']], 'train')
+
+    assert sorted(tmp_path.iterdir()) == sorted(writer_class.get_output_paths(output_path, **kwargs))
+
+
+@pytest.mark.parametrize("kwargs", [{'num_shards': 0}, {'num_shards': 4, 'format': 'npy'}])
+def test_shards_validation(kwargs):
+    with pytest.raises(ValueError):
+        OutputOptions(**kwargs)
+
+
+@pytest.mark.parametrize("options", [
+    {'checkpoints': CheckpointOptions(10)},
+    {'segments': SegmentsOptions('segments')},
+])
+def test_shards_with_checkpoints_or_segments(options):
+    with pytest.raises(ValueError, match='not supported'):
+        CBOWDatasetOptions(output=OutputOptions(num_shards=4), **options)
+
+
+def read_paragraphs(raw_text_paths: list[str]) -> list[str]:
+    paragraphs = []
+    for path in raw_text_paths:
+        with open_text(path) as fp:
+            paragraphs.extend(TextParagraphsReader(fp))
+
+    return paragraphs
+
+
+def test_read_stats_count_only_read_paragraphs(raw_text_paths, tmp_path):
+    creator = EnglishBookCBOWDatasetCreator(raw_text_paths, str(tmp_path / 'cbow.csv'))
+    creator._state.stats = StageStats()
+    # As on resume from a checkpoint in the second file
+    paragraphs = [text for _, text in creator._read_paragraphs(raw_text_paths, start_position=(1, 10))]
+
+    assert paragraphs == read_paragraphs(raw_text_paths[1:])[10:]
+    assert creator.stats.counts['paragraphs'] == len(paragraphs)
+    assert creator.stats.counts['chars_in'] == sum(len(paragraph) for paragraph in paragraphs)
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_profile_stats(raw_text_paths, tmp_path, num_workers):
+    create_dataset(
+        raw_text_paths,
+        tmp_path / 'cbow.csv',
+        parallel=ParallelOptions(num_workers=num_workers),
+        profile=ProfileOptions(stats_path=str(tmp_path / 'stats.json'))
+    )
+    windows = read_csv_rows(tmp_path / 'cbow.csv')
+
+    stats = json.loads((tmp_path / 'stats.json').read_text(encoding='utf-8'))
+    assert set(stats['seconds']) == {
+        'total', 'read', 'prepare', 'direct_speech', 'sent_tokenize', 'word_tokenize', 'write'
+    }
+    counts = stats['counts']
+    assert counts['windows'] == len(windows)
+    assert counts['chars_in'] == sum(len(paragraph) for paragraph in read_paragraphs(raw_text_paths))
+    assert counts['paragraphs'] == 64
+    assert counts['sentences'] > counts['paragraphs'] - counts.get('filtered_paragraphs', 0)
+    # The counts of the worker processes are merged
+    assert counts['direct_speech_fast'] + counts['direct_speech_full'] == (
+        counts['paragraphs'] - counts.get('filtered_paragraphs', 0)
+    )
+    assert counts['direct_speech_full'] > 0
+
+
+def is_punkt_installed() -> bool:
+    try:
+        nltk.data.find('tokenizers/punkt/english.pickle')
+    except LookupError:
+        return False
+
+    return True
+
+
+@pytest.mark.skipif(not is_punkt_installed(), reason='The Punkt English model is not installed')
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_default_sent_tokenize(raw_text_paths, tmp_path, num_workers):
+    punkt = nltk.data.load('tokenizers/punkt/english.pickle')
+    EnglishBookCBOWDatasetCreator(
+        raw_text_paths, str(tmp_path / 'expected.csv'), window_size=2, sent_tokenize=punkt.tokenize
+    ).create()
+    EnglishBookCBOWDatasetCreator(
+        raw_text_paths,
+        str(tmp_path / 'cbow.csv'),
+        window_size=2,
+        options=CBOWDatasetOptions(parallel=ParallelOptions(num_workers=num_workers, batch_size=5))
+    ).create()
+
+    assert read_csv_rows(tmp_path / 'cbow.csv') == read_csv_rows(tmp_path / 'expected.csv')
+
+
+def test_default_sent_tokenize_with_untrained_punkt(raw_text_paths, tmp_path, monkeypatch):
+    # The default path loads the Punkt model and splits the paragraphs of a batch by their spans
+    monkeypatch.setattr(nltk.data, 'load', lambda resource_url: PunktSentenceTokenizer())
+    EnglishBookCBOWDatasetCreator(
+        raw_text_paths, str(tmp_path / 'expected.csv'), window_size=2, sent_tokenize=PunktSentenceTokenizer().tokenize
+    ).create()
+    EnglishBookCBOWDatasetCreator(raw_text_paths, str(tmp_path / 'cbow.csv'), window_size=2).create()
+
+    windows = read_csv_rows(tmp_path / 'cbow.csv')
+    assert windows == read_csv_rows(tmp_path / 'expected.csv')
+    assert windows
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_sentence_span_tokenizer(raw_text_paths, tmp_path, num_workers):
+    create_dataset(raw_text_paths, tmp_path / 'expected.csv')
+    creator = EnglishBookCBOWDatasetCreator(
+        raw_text_paths,
+        str(tmp_path / 'cbow.csv'),
+        window_size=2,
+        sent_tokenize=SimpleSentenceSpanTokenizer(),
+        options=CBOWDatasetOptions(parallel=ParallelOptions(num_workers=num_workers, batch_size=5))
+    )
+    creator.create()
+
+    expected = (tmp_path / 'expected.csv').read_text(encoding='utf-8')
+    assert (tmp_path / 'cbow.csv').read_text(encoding='utf-8') == expected
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_regex_word_tokenize(raw_text_paths, tmp_path, num_workers):
+    create_dataset(raw_text_paths, tmp_path / 'expected.csv')
+    create_dataset(
+        raw_text_paths,
+        tmp_path / 'cbow.csv',
+        word_tokenize=regex_word_tokenize,
+        parallel=ParallelOptions(num_workers=num_workers, batch_size=5)
+    )
+
+    expected = (tmp_path / 'expected.csv').read_text(encoding='utf-8')
+    assert (tmp_path / 'cbow.csv').read_text(encoding='utf-8') == expected
+
+
+@pytest.mark.parametrize("num_workers, paragraph_cache_size", [(1, 1), (1, 1000), (2, 3), (2, 1000)])
+def test_paragraph_cache(raw_text_paths, tmp_path, num_workers, paragraph_cache_size):
+    # The books repeat each other's paragraphs
+    repeated_paths = raw_text_paths + raw_text_paths[::-1]
+    parallel = ParallelOptions(num_workers=num_workers, batch_size=5)
+    create_dataset(repeated_paths, tmp_path / 'expected.csv', parallel=parallel)
+
+    creator = create_dataset(
+        repeated_paths,
+        tmp_path / 'cbow.csv',
+        parallel=parallel,
+        paragraph_cache_size=paragraph_cache_size,
+        profile=ProfileOptions()
+    )
+
+    # The samples are assigned to the cached paragraphs as well
+    expected = (tmp_path / 'expected.csv').read_text(encoding='utf-8')
+    assert (tmp_path / 'cbow.csv').read_text(encoding='utf-8') == expected
+
+    cache = creator.paragraph_cache
+    assert len(cache) <= paragraph_cache_size
+    assert cache.memory_bytes > 0
+    assert creator.stats.counts['paragraph_cache_hits'] == cache.hits
+    if paragraph_cache_size == 1000:
+        # Every paragraph of the second half is a repeat
+        assert cache.hit_ratio >= 0.5
+    with (tmp_path / 'cbow.csv').open('r', encoding='utf-8') as fp:
+        assert creator.stats.counts['windows'] == sum(1 for _ in fp) - 1
+
+
+def test_paragraph_cache_is_shared_by_segments(raw_text_paths, tmp_path):
+    # A new edition of the first book
+    edition_path = tmp_path / 'book_0_edition.txt'
+    edition_path.write_text(
+        Path(raw_text_paths[0]).read_text(encoding='utf-8') + '\n\nTHE END', encoding='utf-8'
+    )
+
+    creator = create_dataset(
+        raw_text_paths + [str(edition_path)],
+        tmp_path / 'cbow.csv',
+        segments=SegmentsOptions(str(tmp_path / 'segments')),
+        paragraph_cache_size=1000
+    )
+
+    assert creator.paragraph_cache.hits > 0
+
+
+def test_paragraph_cache_validation():
+    with pytest.raises(ValueError):
+        CBOWDatasetOptions(paragraph_cache_size=0)
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_near_duplicates(raw_text_paths, tmp_path, num_workers):
+    options = NearDuplicateOptions(threshold=0.8, capacity=1000)
+    create_dataset(raw_text_paths, tmp_path / 'expected.csv', near_duplicates=options)
+
+    # The repeated books are removed as near-duplicates
+    creator = create_dataset(
+        raw_text_paths + raw_text_paths,
+        tmp_path / 'cbow.csv',
+        parallel=ParallelOptions(num_workers=num_workers, batch_size=5),
+        near_duplicates=options,
+        profile=ProfileOptions()
+    )
+
+    expected = (tmp_path / 'expected.csv').read_text(encoding='utf-8')
+    assert (tmp_path / 'cbow.csv').read_text(encoding='utf-8') == expected
+
+    near_duplicates = creator.near_duplicates
+    assert near_duplicates.removed_count >= 64
+    assert creator.stats.counts['near_duplicate_paragraphs'] == near_duplicates.removed_count
+    assert near_duplicates.checked_count == creator.stats.counts['paragraphs'] - creator.stats.counts.get(
+        'filtered_paragraphs', 0
+    )
+
+
+@pytest.mark.parametrize("kwargs", [{'threshold': 0}, {'threshold': 1}, {'threshold': 0.8, 'capacity': 0}])
+def test_near_duplicates_validation(kwargs):
+    with pytest.raises(ValueError):
+        NearDuplicateOptions(**kwargs)
+
+
+@pytest.mark.parametrize("options", [
+    {'checkpoints': CheckpointOptions(10)},
+    {'segments': SegmentsOptions('segments')},
+])
+def test_near_duplicates_with_checkpoints_or_segments(options):
+    with pytest.raises(ValueError, match='not supported'):
+        CBOWDatasetOptions(near_duplicates=NearDuplicateOptions(threshold=0.8), **options)
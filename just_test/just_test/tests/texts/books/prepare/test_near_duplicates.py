@@ -0,0 +1,126 @@
+import random
+
+import numpy as np
+import pytest
+
+from just_test.texts.books.prepare.near_duplicates import BloomFilter, MinHashDeduplicator
+
+
+def create_paragraph(rnd: random.Random, words_count: int = 60) -> str:
+    vocabulary = [f'word{i}' for i in range(5000)]
+    return ' '.join(rnd.choice(vocabulary) for _ in range(words_count))
+
+
+def test_bloom_filter_has_no_false_negatives():
+    rng = np.random.default_rng(0)
+    keys = rng.integers(0, 1 << 63, size=10000, dtype=np.uint64)
+
+    bloom_filter = BloomFilter(10000, error_rate=1e-3)
+    bloom_filter.add(keys)
+
+    assert bloom_filter.contains(keys).all()
+    assert bloom_filter.count == 10000
+
+
+def test_bloom_filter_false_positive_rate():
+    rng = np.random.default_rng(0)
+    bloom_filter = BloomFilter(10000, error_rate=1e-2)
+    bloom_filter.add(rng.integers(0, 1 << 63, size=10000, dtype=np.uint64))
+
+    other_keys = rng.integers(0, 1 << 63, size=100000, dtype=np.uint64)
+    rate = bloom_filter.contains(other_keys).mean()
+    assert rate < 2e-2
+    assert bloom_filter.get_false_positive_rate() == pytest.approx(1e-2, rel=0.2)
+    # About 9.6 bits per key for 1%
+    assert bloom_filter.memory_bytes == pytest.approx(10000 * 9.6 / 8, rel=0.05)
+
+
+@pytest.mark.parametrize("kwargs", [
+    {'capacity': 0},
+    {'capacity': 10, 'error_rate': 0},
+    {'capacity': 10, 'error_rate': 1},
+])
+def test_bloom_filter_validation(kwargs):
+    with pytest.raises(ValueError):
+        BloomFilter(**kwargs)
+
+
+@pytest.mark.parametrize("similarity", [0.2, 0.5, 0.8])
+def test_signature_agreement_estimates_jaccard_similarity(similarity):
+    deduplicator = MinHashDeduplicator(capacity=100)
+    # Pairs of sets of 100 shingles with `common` shingles in common
+    common = round(200 * similarity / (1 + similarity))
+    agreements = []
+    for k in range(20):
+        shingles = [f'shingle{k} {i}' for i in range(200 - common)]
+        first = deduplicator.get_signature(shingles[:100])
+        second = deduplicator.get_signature(shingles[:common] + shingles[100:])
+        agreements.append((first == second).mean())
+
+    jaccard = common / (200 - common)
+    assert np.mean(agreements) == pytest.approx(jaccard, abs=0.03)
+
+
+def test_signature_has_no_overflow():
+    deduplicator = MinHashDeduplicator(capacity=100)
+    assert int(deduplicator._a.max()) * 0xFFFFFFFF + int(deduplicator._b.max()) < 1 << 64
+    assert deduplicator.get_signature(['a b c']).max() < deduplicator.PRIME
+
+
+def test_near_duplicates_are_removed():
+    rnd = random.Random(0)
+    paragraphs = [create_paragraph(rnd) for _ in range(200)]
+    deduplicator = MinHashDeduplicator(threshold=0.7, capacity=1000)
+
+    assert not any(deduplicator.is_duplicate(p) for p in paragraphs)
+
+    # One word of 60 is changed, the similarity of the 3-word shingles is about 0.9
+    near_duplicates = []
+    for paragraph in paragraphs:
+        words = paragraph.split(' ')
+        words[rnd.randrange(len(words))] = 'changed'
+        near_duplicates.append(' '.join(words))
+
+    removed = [p for p in near_duplicates if deduplicator.is_duplicate(p)]
+    assert len(removed) >= 190
+    assert deduplicator.checked_count == 400
+    assert deduplicator.removed_count == len(removed)
+    assert deduplicator.removed_bytes == sum(len(p.encode('UTF-8')) for p in removed)
+
+
+def test_dissimilar_paragraphs_are_kept():
+    rnd = random.Random(1)
+    paragraphs = [create_paragraph(rnd) for _ in range(200)]
+    deduplicator = MinHashDeduplicator(threshold=0.7, capacity=1000)
+    for paragraph in paragraphs:
+        deduplicator.is_duplicate(paragraph)
+
+    # Half of the words are changed, the similarity is far below the threshold
+    kept = 0
+    for paragraph in paragraphs:
+        words = paragraph.split(' ')
+        words[::2] = ['changed'] * len(words[::2])
+        kept += not deduplicator.is_duplicate(' '.join(words))
+
+    assert kept >= 190
+
+
+def test_exact_duplicates_ignore_case_and_punctuation():
+    deduplicator = MinHashDeduplicator(capacity=100)
+    assert not deduplicator.is_duplicate('THE END')
+    assert deduplicator.is_duplicate('The end.')
+    assert not deduplicator.is_duplicate('The beginning.')
+
+
+@pytest.mark.parametrize("threshold", [0.5, 0.7, 0.8, 0.9])
+def test_get_bands_and_rows(threshold):
+    bands, rows = MinHashDeduplicator.get_bands_and_rows(threshold, 128)
+    assert bands * rows <= 128
+    # The probability of a candidate pair is steepest near the threshold
+    assert abs((1 / bands) ** (1 / rows) - threshold) < 0.1
+
+
+@pytest.mark.parametrize("kwargs", [{'threshold': 0}, {'threshold': 1}, {'num_perm': 1}, {'shingle_size': 0}])
+def test_validation(kwargs):
+    with pytest.raises(ValueError):
+        MinHashDeduplicator(capacity=100, **kwargs)
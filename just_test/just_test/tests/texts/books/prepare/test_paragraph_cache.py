@@ -0,0 +1,61 @@
+import pytest
+
+from just_test.texts.books.prepare.paragraph_cache import ParagraphCache
+
+
+def test_least_recently_used_is_evicted():
+    cache = ParagraphCache(max_size=2)
+    keys = [cache.get_key(text) for text in ['a', 'b', 'c']]
+    cache.put(keys[0], [['a']])
+    cache.put(keys[1], [['b']])
+    # Makes 'a' the most recently used
+    assert cache.get(keys[0]) == [['a']]
+    cache.put(keys[2], [['c']])
+
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == [['a']]
+    assert cache.get(keys[2]) == [['c']]
+    assert (cache.hits, cache.misses) == (3, 1)
+    assert cache.hit_ratio == 0.75
+
+
+def test_memory_bytes():
+    cache = ParagraphCache(max_size=1)
+    assert cache.memory_bytes == 0
+
+    small_key, large_key = cache.get_key('small'), cache.get_key('large')
+    cache.put(small_key, [['a']])
+    small_size = cache.memory_bytes
+    cache.put(large_key, [['token'] * 100] * 10)
+
+    assert cache.memory_bytes > small_size
+    assert cache.memory_bytes >= ParagraphCache.get_sentences_size([['token'] * 100] * 10)
+
+    # Putting a cached key again does not change the size
+    memory_bytes = cache.memory_bytes
+    cache.put(large_key, [['token'] * 100] * 10)
+    assert cache.memory_bytes == memory_bytes
+
+
+def test_get_key():
+    assert ParagraphCache.get_key('THE END') == ParagraphCache.get_key('THE END')
+    assert ParagraphCache.get_key('THE END') != ParagraphCache.get_key('THE END.')
+    assert len(ParagraphCache.get_key('THE END')) == 16
+
+
+def test_str():
+    cache = ParagraphCache(max_size=10)
+    key = cache.get_key('a')
+    cache.get(key)
+    cache.put(key, [['a']])
+    cache.get(key)
+
+    assert str(cache).startswith('Paragraph cache: 1 of 10 paragraphs')
+    assert 'hit ratio 50.0% (1 of 2)' in str(cache)
+
+
+def test_validation():
+    with pytest.raises(ValueError):
+        ParagraphCache(max_size=0)
@@ -0,0 +1,113 @@
+import os
+
+import pytest
+
+from just_test.texts.books.prepare.paragraphs_index import IndexedTextParagraphsReader, ParagraphsIndex
+from just_test.texts.books.prepare.paragraphs_reader import MappedTextParagraphsReader
+
+TEXT = (
+    '\n'
+    '“I’m glad I’ve seen that done,” thought Alice.\n'
+    '\n'
+    '“If that’s all you know about it, you may stand down,” continued the\n'
+    'King.\n'
+    '\n'
+    '\n'
+    '==================================================\n'
+    '“I can’t go no lower,” said the Hatter: “I’m on the floor, as it is.”\n'
+    '\n'
+    '“Then you may _sit_ down,” the King replied.\n'
+    '\n'
+    'Here the other guinea-pig cheered, and was suppressed.\n'
+)
+
+
+@pytest.fixture
+def text_path(tmp_path):
+    path = tmp_path / 'book.txt'
+    path.write_text(TEXT, encoding='utf-8')
+    return path
+
+
+def read_paragraphs(path) -> list[str]:
+    with MappedTextParagraphsReader(path) as reader:
+        return reader.read_all()
+
+
+def test_indexed_reader(text_path):
+    expected_paragraphs = read_paragraphs(text_path)
+    assert len(expected_paragraphs) == 5
+
+    with IndexedTextParagraphsReader(text_path) as reader:
+        assert len(reader) == len(expected_paragraphs)
+        assert list(reader) == expected_paragraphs
+        assert [reader[i] for i in range(len(reader))] == expected_paragraphs
+        assert reader[-2] == expected_paragraphs[-2]
+        assert list(reader[2:]) == expected_paragraphs[2:]
+        assert reader[1:][1] == expected_paragraphs[2]
+
+        with pytest.raises(IndexError):
+            _ = reader[len(expected_paragraphs)]
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 5, 8])
+def test_shards(text_path, n):
+    expected_paragraphs = read_paragraphs(text_path)
+
+    with IndexedTextParagraphsReader(text_path) as reader:
+        shards = [list(reader.shard(k, n)) for k in range(n)]
+
+    assert sum(shards, []) == expected_paragraphs
+    assert max(map(len, shards)) - min(map(len, shards)) <= 1
+
+
+def test_closing_shard_does_not_close_reader(text_path):
+    expected_paragraphs = read_paragraphs(text_path)
+
+    with IndexedTextParagraphsReader(text_path) as reader:
+        with reader.shard(0, 2) as shard:
+            assert list(shard) == expected_paragraphs[:2]
+        reader[1:].close()
+
+        assert list(reader) == expected_paragraphs
+
+
+@pytest.mark.parametrize("k, n", [(0, 0), (-1, 2), (2, 2)])
+def test_invalid_shard(text_path, k, n):
+    with IndexedTextParagraphsReader(text_path) as reader:
+        with pytest.raises(ValueError):
+            reader.shard(k, n)
+
+
+def test_index_is_cached(text_path):
+    index_path = ParagraphsIndex.get_index_path(text_path)
+    assert not index_path.exists()
+
+    index = ParagraphsIndex.load_or_build(text_path)
+    assert index_path.exists()
+
+    cached_index = ParagraphsIndex.load_or_build(text_path)
+    assert cached_index.offsets.tolist() == index.offsets.tolist()
+    assert cached_index.lengths.tolist() == index.lengths.tolist()
+
+    # The file has changed
+    with text_path.open('a', encoding='utf-8') as fp:
+        fp.write('\nThe end.\n')
+
+    with IndexedTextParagraphsReader(text_path) as reader:
+        assert len(reader) == len(index) + 1
+        assert reader[-1] == 'The end.'
+
+    # Only the modification time has changed
+    stat = os.stat(text_path)
+    os.utime(text_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert not ParagraphsIndex.load(index_path).is_valid(text_path)
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / 'empty.txt'
+    path.write_text('', encoding='utf-8')
+
+    with IndexedTextParagraphsReader(path) as reader:
+        assert len(reader) == 0
+        assert list(reader.shard(0, 2)) == []
@@ -1,10 +1,20 @@
+import asyncio
+import bz2
+import gzip
 import io
 import itertools
+import lzma
+import random
 import re
 
 import pytest
 
-from just_test.texts.books.prepare.paragraphs_reader import TextParagraphsReader
+from just_test.texts.books.prepare.paragraphs_reader import (
+    AsyncTextParagraphsReader,
+    MappedTextParagraphsReader,
+    PrefetchingParagraphsReader,
+    TextParagraphsReader,
+)
 
 TEST_CASES = [
     {
@@ -349,3 +359,209 @@ def test_parameter_max_chunks_in_paragraph():
         pass
 
     assert paragraphs == expected_paragraphs
+
+
+@pytest.mark.parametrize(
+    "data", TEST_CASES
+)
+def test_mapped_reader_with_various_texts(data, tmp_path):
+    text = data['text']
+    expected_paragraphs = data['paragraphs']
+
+    path = tmp_path / 'text.txt'
+    path.write_text(text, encoding='utf-8')
+
+    with MappedTextParagraphsReader(path) as reader:
+        assert reader.read_all() == expected_paragraphs
+        assert reader.read() == ''
+
+    # Windows line breaks
+    path.write_bytes(text.replace('\n', '\r\n').encode('utf-8'))
+
+    with MappedTextParagraphsReader(path) as reader:
+        spans = list(reader.iter_spans())
+        assert [reader.read_span(start, end) for start, end in spans] == expected_paragraphs
+        assert reader.read_all() == expected_paragraphs
+
+
+@pytest.mark.parametrize("read_chunk_size", [15, 16, 64, None])
+def test_mapped_reader_equals_stream_reader(tmp_path, read_chunk_size):
+    # The punctuation is attached to the words: a line of punctuation only is a part of the delimiter,
+    # and the stream reader does not join such a delimiter when it spans more than two chunks
+    words = ['Alice', 'été', 'Привет', '“Oh!”', 'Alice—', 'end.', ' ', '\xa0', '\t', '\n', '\n', '\n \n']
+    rnd = random.Random(1719)
+    for _ in range(300):
+        text = ''.join(rnd.choice(words) for _ in range(rnd.randint(0, 100)))
+        path = tmp_path / 'text.txt'
+        path.write_text(text, encoding='utf-8')
+
+        with path.open('r', encoding='utf-8') as fp:
+            stream_paragraphs = TextParagraphsReader(fp, read_chunk_size=read_chunk_size).read_all()
+
+        # The stream reader returns the whitespace before the first delimiter, and the whitespace of a delimiter
+        # broken by a chunk boundary, as empty paragraphs. The mapped reader skips whitespace-only spans.
+        with MappedTextParagraphsReader(path) as reader:
+            assert reader.read_all() == [p for p in stream_paragraphs if p]
+
+
+def test_adaptive_chunk_size():
+    text = '\n\n'.join(['Alice was beginning to get very tired.'] * 1000)
+    reader = TextParagraphsReader(io.StringIO(text), read_chunk_size=100, adaptive=True, max_read_chunk_size=1000)
+
+    assert reader.read_all() == ['Alice was beginning to get very tired.'] * 1000
+    assert 100 < reader.chunk_size <= 1000
+
+
+def test_adaptive_mode_splits_oversized_paragraph():
+    text = ' '.join(['Alice'] * 100)
+    reader = TextParagraphsReader(
+        io.StringIO(text),
+        read_chunk_size=15,
+        max_chunks_in_paragraph=2,
+        adaptive=True,
+        max_read_chunk_size=100
+    )
+
+    paragraphs = reader.read_all()
+    assert len(paragraphs) > 1
+    assert ' '.join(paragraphs) == text
+    assert all(len(paragraph) <= 30 + 100 for paragraph in paragraphs)
+
+
+@pytest.mark.parametrize("read_chunk_size, max_chunks_in_paragraph", [(None, 6), (4096, 100), (15, 100)])
+def test_default_max_chunks_in_paragraph(read_chunk_size, max_chunks_in_paragraph):
+    reader = TextParagraphsReader(io.StringIO(''), read_chunk_size=read_chunk_size)
+    assert reader.max_chunks_in_paragraph == max_chunks_in_paragraph
+    assert reader.max_paragraph_size <= TextParagraphsReader.DEFAULT_MAX_PARAGRAPH_SIZE
+
+
+def test_adaptive_mode_tracks_paragraph_size():
+    short_text = ' '.join(['Alice'] * 1000)
+    long_text = ' '.join(['Alice'] * 10000)
+    reader = TextParagraphsReader(
+        io.StringIO(f'{short_text}\n\n{long_text}'),
+        read_chunk_size=100,
+        adaptive=True,
+        max_read_chunk_size=200
+    )
+
+    # The split limit is 100 chunks of 100 characters
+    paragraphs = reader.read_all()
+    assert paragraphs[0] == short_text
+    assert ' '.join(paragraphs[1:]) == long_text
+    assert len(paragraphs) > 2
+    assert all(len(paragraph) <= 100 * 100 + 200 for paragraph in paragraphs)
+
+
+def test_invalid_max_read_chunk_size():
+    with pytest.raises(ValueError):
+        TextParagraphsReader(io.StringIO(''), read_chunk_size=100, max_read_chunk_size=99)
+
+
+COMPRESSED_OPENERS = [gzip.open, bz2.open, lzma.open]
+
+
+def create_book_text(paragraphs: int) -> str:
+    rnd = random.Random(1719)
+    words = ['Alice', 'été', '“Oh!”', '—', 'said', 'the', 'Queen']
+    return '\n\n'.join(
+        '\n'.join(' '.join(rnd.choices(words, k=8)) for _ in range(rnd.randint(1, 4)))
+        for _ in range(paragraphs)
+    )
+
+
+@pytest.mark.parametrize(
+    "data", TEST_CASES
+)
+def test_prefetching_reader_with_various_texts(data):
+    reader = TextParagraphsReader(io.StringIO(data['text']), read_chunk_size=data.get('read_chunk_size', None))
+
+    with PrefetchingParagraphsReader(reader, batch_size=2, max_batches=1) as prefetching_reader:
+        assert prefetching_reader.read_all() == data['paragraphs']
+        assert prefetching_reader.read() == ''
+
+
+@pytest.mark.parametrize("open_file", COMPRESSED_OPENERS)
+def test_prefetching_reader_with_compressed_file(tmp_path, open_file):
+    text = create_book_text(1000)
+    expected_paragraphs = TextParagraphsReader(io.StringIO(text)).read_all()
+
+    path = tmp_path / 'book.txt.compressed'
+    with open_file(path, 'wt', encoding='utf-8') as fp:
+        fp.write(text)
+
+    with open_file(path, 'rt', encoding='utf-8') as fp:
+        with PrefetchingParagraphsReader(TextParagraphsReader(fp, read_chunk_size=1000), max_batches=2) as reader:
+            assert list(reader) == expected_paragraphs
+
+
+def test_prefetching_reader_error():
+    def paragraphs():
+        yield 'One.'
+        raise OSError('Network is unreachable')
+
+    reader = PrefetchingParagraphsReader(paragraphs(), batch_size=1)
+    assert next(reader) == 'One.'
+    with pytest.raises(OSError, match='Network is unreachable'):
+        next(reader)
+    with pytest.raises(StopIteration):
+        next(reader)
+
+
+def test_prefetching_reader_close():
+    reader = PrefetchingParagraphsReader(itertools.count(), batch_size=1, max_batches=1)
+    assert next(reader) == 0
+    reader.close()
+
+    assert not reader._thread.is_alive()
+    assert reader.read() == ''
+    # Closing again does nothing
+    reader.close()
+
+
+@pytest.mark.parametrize(
+    "data", TEST_CASES
+)
+def test_async_reader_with_various_texts(data):
+    reader = AsyncTextParagraphsReader(
+        io.StringIO(data['text']),
+        batch_size=2,
+        read_chunk_size=data.get('read_chunk_size', None)
+    )
+
+    async def read_all():
+        return await reader.read_all(), await reader.read()
+
+    assert asyncio.run(read_all()) == (data['paragraphs'], '')
+
+
+def test_async_reader_reads_ahead():
+    text = '\n\n'.join(f'Paragraph {i}.' for i in range(10))
+    reader = AsyncTextParagraphsReader(io.StringIO(text), batch_size=4)
+
+    async def read_first():
+        first = await reader.read()
+        # The next batch is read before the first one is consumed
+        next_batch = await reader._next_batch
+        return first, next_batch, list(reader._batch)
+
+    first, next_batch, rest = asyncio.run(read_first())
+    assert first == 'Paragraph 0.'
+    assert rest == [f'Paragraph {i}.' for i in range(1, 4)]
+    assert next_batch == [f'Paragraph {i}.' for i in range(4, 8)]
+
+
+@pytest.mark.parametrize("open_file", COMPRESSED_OPENERS)
+def test_async_reader_with_compressed_file(tmp_path, open_file):
+    text = create_book_text(1000)
+    expected_paragraphs = TextParagraphsReader(io.StringIO(text)).read_all()
+
+    path = tmp_path / 'book.txt.compressed'
+    with open_file(path, 'wt', encoding='utf-8') as fp:
+        fp.write(text)
+
+    async def read_all():
+        with open_file(path, 'rt', encoding='utf-8') as fp:
+            return [paragraph async for paragraph in AsyncTextParagraphsReader(fp, read_chunk_size=1000)]
+
+    assert asyncio.run(read_all()) == expected_paragraphs
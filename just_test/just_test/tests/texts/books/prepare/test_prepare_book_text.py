@@ -8,10 +8,12 @@ from just_test.texts.books.prepare.english import prepare_english_book_text
 
 RESOURCES_PATH = Path(__file__).parent / "../../../resources"
 BOOK_CASES_PATH = RESOURCES_PATH / "texts/books/prepare/prepare_english_book_cases.txt"
+# Outputs of the former sequential `re.sub` implementation on all test texts
+GOLDEN_CASES_PATH = RESOURCES_PATH / "texts/books/prepare/prepare_english_book_golden.txt"
 
 
-def create_test_cases() -> list[tuple[str, str]]:
-    with BOOK_CASES_PATH.open('r', encoding='utf-8') as fp:
+def create_test_cases(cases_path: Path = BOOK_CASES_PATH) -> list[tuple[str, str]]:
+    with cases_path.open('r', encoding='utf-8') as fp:
         file_text = fp.read(1000000)
 
     res = []
@@ -34,3 +36,9 @@ def test_prepare_english_book_text(test_case):
     assert result == expected
     print('--------------------------------')
     print(text)
+
+
+@pytest.mark.parametrize("test_case", create_test_cases(GOLDEN_CASES_PATH))
+def test_prepare_english_book_text_golden(test_case):
+    text, expected = test_case
+    assert prepare_english_book_text(text) == expected
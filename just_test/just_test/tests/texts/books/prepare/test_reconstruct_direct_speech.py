@@ -4,7 +4,16 @@ from pathlib import Path
 
 import pytest
 
-from just_test.texts.books.prepare.direct_speech import reconstruct_direct_speech
+from just_test.texts.books.prepare.direct_speech import (
+    DIRECT_SPEECH_REGEX,
+    PART_DIRECT,
+    SECONDARY_DIRECT_SPEECH_REGEX,
+    _split_text_to_parts,
+    _split_text_to_spans,
+    reconstruct_direct_speech,
+)
+from just_test.texts.books.prepare.sentence_part import close_text
+from just_test.util.stage_stats import StageStats
 
 
 RESOURCES_PATH = Path(__file__).parent / "../../../resources"
@@ -38,3 +47,84 @@ def test_reconstruct_direct_speech(test_case):
 
     result = reconstruct_direct_speech(text)
     assert result == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('', ''),
+    ('   ', ''),
+    ('alice was beginning to get very tired', 'Alice was beginning to get very tired.'),
+    ("  it was the White Rabbit, trotting slowly back again, ", "It was the White Rabbit, trotting slowly back again."),
+    ("'Tis so,' said the Duchess: 'and the moral of that is", "'Tis so,' said the Duchess: 'and the moral of that is."),
+    ('How queer it seems!', 'How queer it seems!'),
+])
+def test_reconstruct_direct_speech_fast_path(text, expected):
+    stats = StageStats()
+
+    result = reconstruct_direct_speech(text, stats=stats)
+    assert result == expected
+    assert stats.counts == {'direct_speech_fast': 1}
+
+
+def test_reconstruct_direct_speech_full_path():
+    stats = StageStats()
+
+    reconstruct_direct_speech('"What a day!" he exclaimed.', stats=stats)
+    assert stats.counts == {'direct_speech_full': 1}
+
+
+def split_text_by_regex(text: str, secondary: bool) -> list[tuple[str, bool]]:
+    """Splits the text into `(text, direct)` parts by the direct speech regex, without the corner cases."""
+    pattern = SECONDARY_DIRECT_SPEECH_REGEX if secondary else DIRECT_SPEECH_REGEX
+    quote = "'" if secondary else '"'
+
+    res = []
+    pos = 0
+    for match in pattern.finditer(text):
+        part_text = text[pos:match.start()].strip()
+        if part_text:
+            res.append((part_text, False))
+
+        part_text = match.group().strip().strip(quote)
+        if part_text:
+            res.append((part_text, True))
+        pos = match.end()
+
+    part_text = text[pos:].strip()
+    if part_text:
+        res.append((part_text, False))
+
+    return res
+
+
+@pytest.mark.parametrize("secondary", [False, True])
+@pytest.mark.parametrize("test_case", create_test_cases())
+def test_split_text_to_spans(test_case, secondary):
+    text = test_case[0]
+    quote = "'" if secondary else '"'
+
+    expected = []
+    for start, end, flags in _split_text_to_spans(text, secondary=secondary):
+        assert text[start:end] == text[start:end].strip()
+        if flags & PART_DIRECT:
+            expected.append((text[start:end].strip(quote), True))
+        else:
+            expected.append((text[start:end], False))
+
+    assert expected == split_text_by_regex(text, secondary)
+
+    parts = [(part.text, part.direct) for part in _split_text_to_parts(text, secondary=secondary)]
+    if len(parts) == len(expected) - 1:
+        # Corner case: the secondary direct speech at the end is attached to the previous part
+        assert secondary
+        assert parts[:-1] == expected[:-2]
+        assert parts[-1] == (f'{expected[-2][0]} {expected[-1][0]}', expected[-2][1])
+    else:
+        assert parts[:-1] == expected[:-1]
+        if parts:
+            # Corner case: the last direct speech without a final punctuation mark is closed or non-direct
+            last_text, last_direct = expected[-1]
+            assert parts[-1] in [
+                (last_text, last_direct),
+                (close_text(last_text), last_direct),
+                (last_text, False),
+            ]
@@ -0,0 +1,90 @@
+import random
+import re
+
+from pathlib import Path
+
+import pytest
+from nltk.tokenize.punkt import PunktSentenceTokenizer
+
+from just_test.texts.books.prepare.sent_tokenize import (
+    PunktSentenceSpanTokenizer,
+    SimpleSentenceSpanTokenizer,
+    count_sentences,
+    simple_sent_spans,
+    simple_sent_tokenize,
+)
+
+
+RESOURCES_PATH = Path(__file__).parent / "../../../resources"
+TEXT_CASES_PATH = RESOURCES_PATH / "texts/books/prepare/reconstruct_direct_speech_cases.txt"
+
+
+def create_texts() -> list[str]:
+    with TEXT_CASES_PATH.open('r', encoding='utf-8') as fp:
+        file_text = fp.read(1000000)
+
+    texts = [text for text in re.split(r'\n=+\n', file_text) if text.strip()]
+
+    # Random texts with whitespace and punctuation at the ends
+    rnd = random.Random(0)
+    alphabet = ['a', 'B', ' ', '\n', '.', '!', '?', '"', "'", ',', ' ', 'é']
+    texts.extend(''.join(rnd.choices(alphabet, k=rnd.randint(0, 30))) for _ in range(2000))
+
+    return texts
+
+
+TEXTS = create_texts()
+
+
+def test_simple_spans_match_simple_sent_tokenize():
+    tokenizer = SimpleSentenceSpanTokenizer()
+    for text in TEXTS:
+        assert tokenizer(text) == simple_sent_tokenize(text), text
+
+
+def test_tokenize_batch():
+    tokenizer = SimpleSentenceSpanTokenizer()
+    batch = tokenizer.tokenize_batch(TEXTS)
+
+    assert len(batch) == len(TEXTS)
+    assert batch.bounds[-1] == len(batch.spans)
+    for i, text in enumerate(TEXTS):
+        assert batch.get_sentences(i) == simple_sent_tokenize(text)
+        assert batch.count(i) == len(batch.get_spans(i))
+
+
+@pytest.mark.parametrize("text", [
+    'Mr. Smith went to Washington. He arrived at 5 p.m. and left!',
+    '"Is it?" she asked. "Yes."',
+    '',
+])
+def test_punkt_spans(text):
+    punkt = PunktSentenceTokenizer()
+    tokenizer = PunktSentenceSpanTokenizer(punkt)
+
+    assert tokenizer(text) == punkt.tokenize(text)
+    assert tokenizer.tokenize_batch([text, text]).get_sentences(1) == punkt.tokenize(text)
+
+
+def test_simple_sent_spans_is_lazy():
+    spans = simple_sent_spans('One. Two. Three.')
+    assert next(spans) == (0, 4)
+    assert list(spans) == [(5, 9), (10, 16)]
+
+
+@pytest.mark.parametrize("limit", [None, 1, 2, 3])
+def test_count_sentences(limit):
+    for text in TEXTS:
+        expected = len(simple_sent_tokenize(text))
+        if limit is not None:
+            expected = min(expected, limit)
+        assert count_sentences(text, limit=limit) == expected, text
+
+
+def test_count_sentences_stops_early():
+    text = 'Sentence. ' * 10000
+
+    # The scan stops at the first boundary, before the long tail without boundaries
+    assert count_sentences('One. Two' + ' two' * 1000000, limit=2) == 2
+    assert count_sentences(text) == 2
+    assert count_sentences(text, limit=None) == 10000
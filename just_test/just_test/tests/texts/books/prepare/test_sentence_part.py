@@ -1,5 +1,6 @@
 import pytest
 
+from just_test.texts.books.prepare.sent_tokenize import simple_sent_tokenize
 from just_test.texts.books.prepare.sentence_part import SentencePart
 
 @pytest.mark.parametrize("test_case", [
@@ -358,3 +359,70 @@ def test_sentence_part_close(test_case):
     sentence_part.close()
     assert sentence_part.text == expected
     assert sentence_part.opened is False
+
+
+class CountingTokenizer:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, text: str) -> list[str]:
+        self.calls += 1
+        return simple_sent_tokenize(text)
+
+
+def test_sentence_part_cache():
+    tokenizer = CountingTokenizer()
+    sentence_part = SentencePart('the Cat only grinned. It looked good-natured', sent_tokenize=tokenizer)
+
+    assert sentence_part.is_multi_sentence is True
+    assert sentence_part.is_multi_sentence is True
+    assert len(sentence_part.sent_tokenize()) == 2
+    assert tokenizer.calls == 1
+
+    # The text has changed
+    sentence_part.capitalize()
+    assert sentence_part.opened is True
+    assert sentence_part.is_multi_sentence is True
+    assert tokenizer.calls == 2
+
+    # The text has not changed
+    sentence_part.capitalize()
+    assert sentence_part.is_multi_sentence is True
+    assert tokenizer.calls == 2
+
+    sentence_part.close()
+    assert sentence_part.opened is False
+    assert sentence_part.punct == '.'
+
+    sentence_part.replace_punct('!')
+    assert sentence_part.punct == '!'
+
+    sentence_part.text = 'It looked good-natured,'
+    assert sentence_part.opened is True
+    assert sentence_part.punct == ','
+    assert sentence_part.is_multi_sentence is False
+    assert tokenizer.calls == 3
+
+
+def test_sentence_part_slots():
+    sentence_part = SentencePart('the Cat only grinned.', direct=True)
+    assert not hasattr(sentence_part, '__dict__')
+
+    for part in sentence_part.sent_tokenize():
+        assert part.direct is True
+        assert part._sent_tokenize is sentence_part._sent_tokenize
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('the Cat only grinned. It looked good-natured', True),
+    ('the Cat only grinned.', False),
+    ('Really? Yes!', True),
+    ('   ', False),
+])
+def test_is_multi_sentence_without_tokenization(text, expected):
+    sentence_part = SentencePart(text)
+
+    assert sentence_part.is_multi_sentence is expected
+    # The sentences are counted by the default tokenizer without tokenization
+    assert sentence_part._sentences is None
+    assert (len(sentence_part.sent_tokenize()) > 1) is expected
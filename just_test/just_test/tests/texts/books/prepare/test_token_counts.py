@@ -0,0 +1,74 @@
+import random
+
+from collections import Counter
+
+import pytest
+
+from just_test.texts.books.prepare.token_counts import CountMinSketch, TokenSubsampler, VocabularyReport
+
+
+def create_tokens(count: int, seed: int = 0) -> list[str]:
+    rnd = random.Random(seed)
+    # Zipf-like frequencies
+    return [f'token{int(1 / (rnd.random() + 1e-6))}' for _ in range(count)]
+
+
+def test_count_min_sketch_estimates():
+    tokens = create_tokens(20000)
+    expected = Counter(tokens)
+
+    sketch = CountMinSketch(256, depth=4)
+    for i in range(0, len(tokens), 1000):
+        sketch.update(tokens[i:i + 1000])
+
+    assert sketch.total() == len(tokens)
+    errors = [sketch[token] - count for token, count in expected.items()]
+    assert min(errors) >= 0
+    # The error bound `e * total / width` holds for almost all tokens
+    assert sum(error > 2.72 * len(tokens) / 256 for error in errors) <= len(errors) * 0.05
+
+
+def test_count_min_sketch_is_exact_without_collisions():
+    tokens = create_tokens(1000)
+    sketch = CountMinSketch(1 << 20)
+    sketch.update(tokens)
+
+    assert all(sketch[token] == count for token, count in Counter(tokens).items())
+    assert sketch['missing'] == 0
+
+
+@pytest.mark.parametrize("width, depth", [(0, 4), (10, 0)])
+def test_count_min_sketch_validation(width, depth):
+    with pytest.raises(ValueError):
+        CountMinSketch(width, depth=depth)
+
+
+def test_subsampling_flattens_frequencies():
+    tokens = create_tokens(50000)
+    counts = Counter(tokens)
+    subsampler = TokenSubsampler(counts, total=len(tokens), threshold=1e-3, seed=1)
+
+    kept = Counter(subsampler.filter(tokens))
+    most_common, most_common_count = counts.most_common(1)[0]
+    assert kept[most_common] < most_common_count * 0.2
+    # Rare tokens are always kept
+    assert all(kept[token] == count for token, count in counts.items() if count < 2.6e-3 * len(tokens))
+
+    # Reproducible with the same seed
+    subsampler = TokenSubsampler(counts, total=len(tokens), threshold=1e-3, seed=1)
+    assert Counter(subsampler.filter(tokens)) == kept
+
+
+def test_min_count():
+    tokens = create_tokens(5000)
+    counts = Counter(tokens)
+    subsampler = TokenSubsampler(counts, total=len(tokens), min_count=3)
+
+    kept = subsampler.filter(tokens)
+    assert kept == [token for token in tokens if counts[token] >= 3]
+
+
+def test_vocabulary_report():
+    report = VocabularyReport(vocabulary_size=10, kept_vocabulary_size=8, windows_count=300, kept_windows_count=100)
+    assert report.reduction == 3.0
+    assert str(report) == 'Vocabulary: 8 of 10 tokens, windows: 100 of 300 (3.00x smaller)'
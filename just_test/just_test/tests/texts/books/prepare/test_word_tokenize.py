@@ -0,0 +1,85 @@
+import random
+import re
+
+from pathlib import Path
+
+import pytest
+
+from just_test.texts.books.prepare.direct_speech import reconstruct_direct_speech
+from just_test.texts.books.prepare.english import prepare_english_book_text
+from just_test.texts.books.prepare.sent_tokenize import simple_sent_tokenize
+from just_test.texts.books.prepare.word_tokenize import (
+    UNSUPPORTED_TEXT_REGEX,
+    nltk_word_tokenize,
+    regex_word_tokenize,
+)
+
+
+RESOURCES_PATH = Path(__file__).parent / "../../../resources"
+TEXT_CASES_PATH = RESOURCES_PATH / "texts/books/prepare/reconstruct_direct_speech_cases.txt"
+
+
+def create_sentences() -> list[str]:
+    """The sentences of the test texts, prepared as `EnglishBookCBOWDatasetCreator` does."""
+    with TEXT_CASES_PATH.open('r', encoding='utf-8') as fp:
+        file_text = fp.read(1000000)
+
+    sentences = []
+    for text in re.split(r'\n=+\n', file_text):
+        if not text.strip():
+            continue
+        text = prepare_english_book_text(text)
+        text = text.replace(';', '.').replace(':', '.')
+        text = reconstruct_direct_speech(text, sent_tokenize=simple_sent_tokenize)
+        sentences.extend(simple_sent_tokenize(text))
+
+    return sentences
+
+
+def create_random_texts() -> list[str]:
+    """Random combinations of the words, clitics and punctuation that the Treebank rules treat specially."""
+    rnd = random.Random(0)
+    pieces = [
+        'a', 'Alice', 'I', 'x_y', 'é', '12', 'do', 'is', 'em', 'tis', 'not', 'cannot', 'Gonna',
+        "n't", "'s", "'S", "'ll", "'re", "'Re", "'d", "'m", "'ve",
+        "'", '"', '.', '..', '...', ',', '-', '--', '!', '?', ' ', ' ', ' ', ' ',
+    ]
+    return [''.join(rnd.choices(pieces, k=rnd.randint(1, 10))) for _ in range(20000)]
+
+
+SENTENCES = create_sentences()
+RANDOM_TEXTS = create_random_texts()
+
+
+def test_sentences_conformance():
+    for sentence in SENTENCES:
+        assert regex_word_tokenize(sentence) == nltk_word_tokenize(sentence), sentence
+
+
+def test_sentences_are_supported():
+    # The prepared sentences are tokenized by the regular expression, not by nltk
+    unsupported = [s for s in SENTENCES if UNSUPPORTED_TEXT_REGEX.search(s)]
+    assert len(unsupported) <= len(SENTENCES) // 100, unsupported[:10]
+
+
+def test_random_texts_conformance():
+    for text in RANDOM_TEXTS:
+        assert regex_word_tokenize(text) == nltk_word_tokenize(text), text
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('"Why," said the Dodo, "the best way to explain it is to do it."',
+     ['``', 'Why', ',', "''", 'said', 'the', 'Dodo', ',', '``', 'the', 'best', 'way', 'to', 'explain',
+      'it', 'is', 'to', 'do', 'it', '.', "''"]),
+    ("I don't know what they're at, I'm sure, Mr. Smith.",
+     ['I', 'do', "n't", 'know', 'what', 'they', "'re", 'at', ',', 'I', "'m", 'sure', ',', 'Mr.', 'Smith', '.']),
+    ("'Off with her head!' 3,000 soldiers... -- the Queen's", [
+        "'", 'Off', 'with', 'her', 'head', '!', "'", '3,000', 'soldiers', '...', '--', 'the', 'Queen', "'s"]),
+    ('', []),
+    # Tokenized by nltk
+    ('It costs $3.88 (roughly).', ['It', 'costs', '$', '3.88', '(', 'roughly', ')', '.']),
+    ('I wanna go\tnow.', ['I', 'wan', 'na', 'go', 'now', '.']),
+])
+def test_regex_word_tokenize(text, expected):
+    assert regex_word_tokenize(text) == expected
+    assert nltk_word_tokenize(text) == expected
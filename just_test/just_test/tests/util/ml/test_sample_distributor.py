@@ -0,0 +1,21 @@
+import json
+
+from just_test.util.ml.sample_distributor import SampleDistributor
+
+
+def test_restored_state_continues_distribution():
+    lengths = [(i * 37) % 101 + 1 for i in range(300)]
+
+    expected_distributor = SampleDistributor(train_ratio=0.8, val_ratio=0.1, test_ratio=0.1, seed=42)
+    expected = [expected_distributor.get_sample(length) for length in lengths]
+
+    distributor = SampleDistributor(train_ratio=0.8, val_ratio=0.1, test_ratio=0.1, seed=42)
+    result = [distributor.get_sample(length) for length in lengths[:120]]
+    state = json.loads(json.dumps(distributor.get_state()))
+
+    restored = SampleDistributor(train_ratio=0.8, val_ratio=0.1, test_ratio=0.1, seed=0)
+    restored.set_state(state)
+    result.extend(restored.get_sample(length) for length in lengths[120:])
+
+    assert result == expected
+    assert restored.get_state() == expected_distributor.get_state()
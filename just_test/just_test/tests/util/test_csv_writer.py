@@ -0,0 +1,66 @@
+import io
+
+import pytest
+
+from just_test.util.csv_writer import BufferedCsvWriter
+
+HEADER = ['context', 'target', 'split']
+
+ROWS = [
+    ['alice was beginning', 'to', 'train'],
+    ['" she said', ',', 'val'],
+    ["it 's , `` you", "''", 'test'],
+    ['a,b', 'c"d', 'train'],
+    ['line\nbreak', ' ', 'train'],
+    ['', 'x', 'val'],
+]
+
+
+def write_with_pandas(chunks: list[list[list[str]]]) -> str:
+    pd = pytest.importorskip('pandas')
+
+    stream = io.StringIO()
+    header_printed = False
+    for chunk in chunks:
+        df = pd.DataFrame(chunk, columns=HEADER)
+        df.to_csv(stream, index=False, header=not header_printed)
+        header_printed = True
+
+    return stream.getvalue()
+
+
+@pytest.mark.parametrize("buffer_size", [1, 10, None])
+@pytest.mark.parametrize("chunks", [
+    [ROWS],
+    [ROWS[:2], [], ROWS[2:]],
+    [[], []],
+    [[row] for row in ROWS],
+])
+def test_same_output_as_pandas(chunks, buffer_size):
+    expected = write_with_pandas(chunks)
+
+    stream = io.StringIO()
+    with BufferedCsvWriter(stream, header=HEADER, buffer_size=buffer_size) as writer:
+        for chunk in chunks:
+            writer.writerows(chunk)
+
+    assert stream.getvalue() == expected
+    assert writer.rows_written == sum(len(chunk) for chunk in chunks)
+
+
+def test_rows_are_buffered():
+    stream = io.StringIO()
+    writer = BufferedCsvWriter(stream, buffer_size=1000)
+    writer.writerows(iter(ROWS))
+    assert stream.getvalue() == ''
+
+    writer.close()
+    assert len(stream.getvalue().splitlines()) == len(ROWS) + 1
+
+
+def test_no_rows_no_header():
+    stream = io.StringIO()
+    with BufferedCsvWriter(stream, header=HEADER):
+        pass
+
+    assert stream.getvalue() == ''
@@ -0,0 +1,75 @@
+import csv
+import json
+import time
+
+from just_test.util.stage_stats import NullStageStats, StageStats
+
+
+def test_stage_seconds():
+    stats = StageStats()
+    for _ in range(3):
+        with stats.stage('sleep'):
+            time.sleep(0.01)
+
+    assert 0.03 <= stats.seconds['sleep'] < 1
+
+
+def test_timed_iter():
+    def slow_items():
+        for i in range(3):
+            time.sleep(0.01)
+            yield i
+
+    stats = StageStats()
+    assert list(stats.timed_iter('read', slow_items())) == [0, 1, 2]
+    assert stats.seconds['read'] >= 0.03
+
+
+def test_merge_and_summary():
+    stats = StageStats()
+    stats.seconds.update({'total': 2.0, 'write': 0.5})
+    stats.add('windows', 100)
+
+    worker_stats = StageStats()
+    worker_stats.seconds['tokenize'] = 1.0
+    worker_stats.add('windows', 300)
+    stats.merge(worker_stats.to_dict())
+
+    assert stats.counts['windows'] == 400
+    assert stats.get_rates() == {'windows': 200.0}
+    assert stats.summary().splitlines() == [
+        'Stage seconds:',
+        '  total: 2.000',
+        '  tokenize: 1.000 (50.0%)',
+        '  write: 0.500 (25.0%)',
+        'Counts:',
+        '  windows: 400 (200.0/s)',
+    ]
+
+
+def test_save(tmp_path):
+    stats = StageStats()
+    stats.seconds['total'] = 1.5
+    stats.add('paragraphs', 10)
+
+    stats.save(tmp_path / 'stats.json')
+    assert json.loads((tmp_path / 'stats.json').read_text()) == {
+        'seconds': {'total': 1.5}, 'counts': {'paragraphs': 10}
+    }
+
+    stats.save(tmp_path / 'stats.csv')
+    with (tmp_path / 'stats.csv').open(newline='') as fp:
+        assert list(csv.reader(fp)) == [
+            ['kind', 'name', 'value'], ['seconds', 'total', '1.5'], ['count', 'paragraphs', '10']
+        ]
+
+
+def test_null_stats():
+    stats = NullStageStats()
+    with stats.stage('write'):
+        stats.add('windows', 10)
+    assert list(stats.timed_iter('read', [1, 2])) == [1, 2]
+    stats.merge({'seconds': {'total': 1.0}, 'counts': {'windows': 1}})
+
+    assert not stats.enabled
+    assert stats.to_dict() == {'seconds': {}, 'counts': {}}
@@ -0,0 +1,57 @@
+import bz2
+import gzip
+import lzma
+
+import pytest
+
+from just_test.util.text_files import open_text
+
+TEXT = 'Alice was beginning to get very tired.\r\n\r\n“Oh dear!” — été\n' * 1000
+
+
+def write_zstd(path, data: bytes) -> None:
+    zstandard = pytest.importorskip('zstandard')
+    path.write_bytes(zstandard.ZstdCompressor().compress(data))
+
+
+@pytest.mark.parametrize("suffix, write_compressed", [
+    ('.gz', lambda path, data: path.write_bytes(gzip.compress(data))),
+    ('.GZ', lambda path, data: path.write_bytes(gzip.compress(data))),
+    ('.bz2', lambda path, data: path.write_bytes(bz2.compress(data))),
+    ('.xz', lambda path, data: path.write_bytes(lzma.compress(data))),
+    ('.zst', write_zstd),
+])
+@pytest.mark.parametrize("buffer_size", [None, 100])
+def test_open_compressed_text(tmp_path, suffix, write_compressed, buffer_size):
+    plain_path = tmp_path / 'book.txt'
+    plain_path.write_bytes(TEXT.encode('utf-8'))
+    with open(plain_path, 'r', encoding='utf-8') as fp:
+        expected = fp.read()
+
+    path = tmp_path / f'book.txt{suffix}'
+    write_compressed(path, TEXT.encode('utf-8'))
+
+    with open_text(path, buffer_size=buffer_size) as fp:
+        chunks = []
+        while chunk := fp.read(1000):
+            chunks.append(chunk)
+
+    assert fp.closed
+    assert ''.join(chunks) == expected
+
+
+def test_open_plain_text(tmp_path):
+    path = tmp_path / 'book.txt'
+    path.write_bytes(TEXT.encode('utf-8'))
+
+    with open_text(path) as fp:
+        assert fp.read() == TEXT.replace('\r\n', '\n')
+
+
+def test_open_invalid_compressed_file(tmp_path):
+    path = tmp_path / 'book.txt.gz'
+    path.write_bytes(TEXT.encode('utf-8'))
+
+    with open_text(path) as fp:
+        with pytest.raises(gzip.BadGzipFile):
+            fp.read()
@@ -1,15 +1,43 @@
-from . import english_cbow_dataset
-from . import direct_speech
-from . import paragraphs_reader
-from . import english
-from . import sent_tokenize
-from . import sentence_part
+from typing import TYPE_CHECKING
+
+from just_test._lazy import lazy_submodules
+
+if TYPE_CHECKING:
+    from . import cbow_dataset_options
+    from . import cbow_windows
+    from . import cbow_writers
+    from . import english_cbow_dataset
+    from . import direct_speech
+    from . import near_duplicates
+    from . import paragraph_cache
+    from . import paragraphs_index
+    from . import paragraphs_reader
+    from . import segments_manifest
+    from . import english
+    from . import sent_tokenize
+    from . import sentence_part
+    from . import token_counts
+    from . import vocabulary
+    from . import word_tokenize
 
 __all__ = [
+    "cbow_dataset_options",
+    "cbow_windows",
+    "cbow_writers",
     "english_cbow_dataset",
     "direct_speech",
+    "near_duplicates",
+    "paragraph_cache",
+    "paragraphs_index",
     "paragraphs_reader",
+    "segments_manifest",
     "english",
     "sent_tokenize",
     "sentence_part",
+    "token_counts",
+    "vocabulary",
+    "word_tokenize",
 ]
+
+# The submodules are imported on the first access
+__getattr__, __dir__ = lazy_submodules(__name__, __all__)
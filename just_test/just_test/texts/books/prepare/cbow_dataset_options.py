@@ -0,0 +1,254 @@
+from dataclasses import dataclass, field
+from typing import Callable, ClassVar, Optional
+
+
+@dataclass(frozen=True)
+class ParallelOptions:
+    """
+    Processing of the paragraphs in a process pool.
+
+    Attributes:
+        num_workers (int): Number of worker processes. With 1 (default), paragraphs are processed
+            in the current process. Otherwise, paragraphs are sent to a process pool in ordered
+            batches, and the output is identical to the single-process run.
+        batch_size (int): Number of paragraphs in one batch sent to a worker process. Defaults to 256.
+    """
+
+    num_workers: int = 1
+    batch_size: int = 256
+
+    def __post_init__(self):
+        if self.num_workers < 1:
+            raise ValueError('num_workers < 1')
+        if self.batch_size < 1:
+            raise ValueError('batch_size < 1')
+
+
+@dataclass(frozen=True)
+class OutputOptions:
+    """
+    The format of the output files.
+
+    Attributes:
+        format (str): One of `FORMATS`. Defaults to 'csv'.
+            - 'csv': `context,target,split` text columns in a single CSV file.
+            - 'parquet': token-id-encoded windows, a Parquet file per split and a vocabulary file,
+              see `CBOWParquetWriter`. If pyarrow is not installed, falls back to 'npy'.
+            - 'npy': token-id-encoded windows, `.npy` files per split and a vocabulary file,
+              see `CBOWNpyWriter`.
+        num_shards (int): Optional, the number of shuffled shards, only for the 'csv' format.
+            The rows are written in a random order, reproducible with the seed, to `num_shards` CSV files,
+            see `CBOWShardedCsvWriter`. Each shard is shuffled in memory, so choose `num_shards` for shards
+            that fit in memory. By default, a single CSV file is written in the reading order.
+    """
+
+    FORMATS: ClassVar[tuple[str, ...]] = ('csv', 'parquet', 'npy')
+
+    format: str = 'csv'
+    num_shards: Optional[int] = None
+
+    def __post_init__(self):
+        if self.format not in self.FORMATS:
+            raise ValueError(f'Unknown output format: {self.format}')
+        if self.num_shards is not None:
+            if self.num_shards < 1:
+                raise ValueError('num_shards < 1')
+            if self.format != 'csv':
+                raise ValueError('Shards are supported only for the csv output format')
+
+
+@dataclass(frozen=True)
+class CheckpointOptions:
+    """
+    Checkpoints to resume an interrupted run, only for the 'csv' output format.
+
+    A checkpoint records the input file, the paragraph number, the `SampleDistributor` state and the output
+    byte offset in the `get_checkpoint_path()` file of the creator, which is removed when the dataset is created.
+
+    Attributes:
+        interval (int): The number of paragraphs between checkpoints.
+    """
+
+    interval: int
+
+    def __post_init__(self):
+        if self.interval < 1:
+            raise ValueError('checkpoint interval < 1')
+
+
+@dataclass(frozen=True)
+class SegmentsOptions:
+    """
+    Incremental builds, only for the 'csv' output format.
+
+    Each book is processed into a separate segment file, named by the content hash of the book,
+    and the output is the concatenation of the segments in the order of the input paths.
+    A rebuild processes only new or changed books, see `SegmentsManifest`. The splits are
+    assigned by a `SampleDistributor` per book, seeded with the seed and the content hash,
+    so the split of a book does not depend on the other books. All segments are rebuilt when
+    the parameters change, the tokenizers are compared by their qualified names.
+
+    Attributes:
+        directory (str): The directory of the segments and their manifest.
+    """
+
+    directory: str
+
+
+@dataclass(frozen=True)
+class SubsamplingOptions:
+    """
+    Removal of frequent and rare tokens, which requires the token counts of the whole dataset.
+
+    The dataset is created in two passes, the first one writes the tokenized sentences to the
+    `get_sentences_path()` file of the creator and counts the tokens. The vocabulary size and the output size
+    reduction are reported in the `vocabulary_report` of the creator.
+
+    Attributes:
+        threshold (float): Optional, the threshold of the word2vec frequent-token subsampling,
+            see `TokenSubsampler`. By default, the frequent tokens are not subsampled.
+        min_count (int): The minimum number of occurrences of a token in the dataset, the rarer tokens
+            are removed from the sentences before the windows are created. Defaults to 1.
+        count_sketch_width (int): Optional, the width of a `CountMinSketch` to count the tokens in a fixed amount
+            of memory. By default, the tokens are counted exactly.
+    """
+
+    threshold: Optional[float] = None
+    min_count: int = 1
+    count_sketch_width: Optional[int] = None
+
+    def __post_init__(self):
+        if self.threshold is not None and self.threshold <= 0:
+            raise ValueError('subsampling threshold <= 0')
+        if self.min_count < 1:
+            raise ValueError('min_count < 1')
+        if self.threshold is None and self.min_count == 1:
+            raise ValueError('Subsampling requires a threshold or min_count > 1')
+
+
+@dataclass(frozen=True)
+class NearDuplicateOptions:
+    """
+    Removal of near-duplicate paragraphs, see `MinHashDeduplicator`.
+
+    A paragraph is compared with all the paragraphs read before it, and a near-duplicate is removed before
+    it is assigned a sample, as a paragraph without words. The number of the removed paragraphs and their size
+    are reported at the end of `create()`, see the `near_duplicates` of the creator.
+
+    Attributes:
+        threshold (float): The similarity of near-duplicate paragraphs.
+        capacity (int): The expected number of unique paragraphs, the memory of the filter is proportional to it.
+            Defaults to 10 million. The filter is allocated in full when `create()` starts, whatever the size
+            of the corpus: about 160 MB for the default capacity with the threshold 0.8, and 450 MB with
+            the threshold 0.5. Lower the capacity for a small corpus.
+    """
+
+    threshold: float
+    capacity: int = 10_000_000
+
+    def __post_init__(self):
+        if not 0 < self.threshold < 1:
+            raise ValueError('near-duplicate threshold must be between 0 and 1')
+        if self.capacity < 1:
+            raise ValueError('near-duplicate capacity < 1')
+
+
+@dataclass(frozen=True)
+class ProfileOptions:
+    """
+    Measurement of the stages of the creation.
+
+    The seconds of the stages (read, prepare, direct_speech, sent_tokenize, word_tokenize, write, total)
+    are measured, and the characters of the read paragraphs (`chars_in`, after decompression), paragraphs,
+    sentences and windows are counted, see the `stats` of the creator. The summary is printed at the end
+    of `create()`. With several worker processes, the seconds of the worker stages are summed over the workers.
+
+    Attributes:
+        stats_path (str): Optional, a JSON file, or a CSV file if the path ends with .csv, to save the stats to,
+            see `StageStats.save()`.
+    """
+
+    stats_path: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class CBOWDatasetOptions:
+    """
+    The options of the `EnglishBookCBOWDatasetCreator` pipeline.
+
+    The optional stages are disabled by default, an option object enables the stage.
+    Checkpoints and segments, and the stages that need all the paragraphs before the current one,
+    cannot be combined, see `INCOMPATIBLE_OPTIONS`.
+
+    Attributes:
+        word_tokenize (Callable[[str], list[str]]): Optional, a callable function for tokenizing
+            a sentence into words. Must be picklable with several worker processes.
+            Defaults to nltk `word_tokenize`, see `nltk_word_tokenize`. `regex_word_tokenize` returns
+            the same tokens several times faster.
+        parallel (ParallelOptions): The process pool, by default the paragraphs are processed
+            in the current process.
+        output (OutputOptions): The output format, by default a single CSV file.
+        checkpoints (CheckpointOptions): Optional, checkpoints to resume an interrupted run.
+        segments (SegmentsOptions): Optional, a directory of segments for incremental builds.
+        subsampling (SubsamplingOptions): Optional, the subsampling of frequent and rare tokens.
+        paragraph_cache_size (int): Optional, the number of paragraphs in a `ParagraphCache` of the tokenized
+            sentences, shared by all books. A repeated paragraph is taken from the cache instead of being
+            processed again, but it is still assigned a sample, so the splits do not depend on the cache.
+            With several worker processes, the repeats of a paragraph that is still being processed
+            are not hits. The hit ratio and the memory use are reported at the end of `create()`,
+            see the `paragraph_cache` of the creator. By default, the paragraphs are not cached.
+        near_duplicates (NearDuplicateOptions): Optional, the removal of near-duplicate paragraphs.
+        profile (ProfileOptions): Optional, the measurement of the stages.
+
+    Example:
+
+    >>> options = CBOWDatasetOptions(parallel=ParallelOptions(num_workers=4), segments=SegmentsOptions('segments'))
+    >>> options.parallel.num_workers, options.segments.directory
+    (4, 'segments')
+    >>> CBOWDatasetOptions(checkpoints=CheckpointOptions(1000), segments=SegmentsOptions('segments'))
+    Traceback (most recent call last):
+    ...
+    ValueError: checkpoints are not supported with segments
+
+    """
+
+    # The pairs of options that cannot be set together
+    INCOMPATIBLE_OPTIONS: ClassVar[tuple[tuple[str, str], ...]] = (
+        ('checkpoints', 'segments'),
+        ('checkpoints', 'subsampling'),
+        ('checkpoints', 'near_duplicates'),
+        ('checkpoints', 'shards'),
+        ('segments', 'subsampling'),
+        ('segments', 'near_duplicates'),
+        ('segments', 'shards'),
+    )
+
+    word_tokenize: Optional[Callable[[str], list[str]]] = None
+    parallel: ParallelOptions = field(default_factory=ParallelOptions)
+    output: OutputOptions = field(default_factory=OutputOptions)
+    checkpoints: Optional[CheckpointOptions] = None
+    segments: Optional[SegmentsOptions] = None
+    subsampling: Optional[SubsamplingOptions] = None
+    paragraph_cache_size: Optional[int] = None
+    near_duplicates: Optional[NearDuplicateOptions] = None
+    profile: Optional[ProfileOptions] = None
+
+    def __post_init__(self):
+        if self.paragraph_cache_size is not None and self.paragraph_cache_size < 1:
+            raise ValueError('paragraph_cache_size < 1')
+        if self.output.format != 'csv':
+            if self.checkpoints is not None:
+                raise ValueError('Checkpoints are supported only for the csv output format')
+            if self.segments is not None:
+                raise ValueError('Segments are supported only for the csv output format')
+
+        enabled = {
+            'checkpoints': self.checkpoints is not None,
+            'segments': self.segments is not None,
+            'subsampling': self.subsampling is not None,
+            'near_duplicates': self.near_duplicates is not None,
+            'shards': self.output.num_shards is not None,
+        }
+        for first, second in self.INCOMPATIBLE_OPTIONS:
+            if enabled[first] and enabled[second]:
+                raise ValueError(f'{first} are not supported with {second}'.replace('_', '-'))
@@ -0,0 +1,123 @@
+from typing import Iterator, Sequence, TypeVar
+
+import nltk
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+T = TypeVar('T')
+
+
+def create_cbow_windows(tokens: Sequence[T], window_size: int, mask_token: T) -> Iterator[tuple[T, ...]]:
+    """
+    Creates a window of `2 * window_size + 1` tokens for each token of the sentence.
+
+    The sentence is padded with `mask_token` on both sides, so the target token
+    is always in the middle of its window.
+
+    Example:
+
+    >>> list(create_cbow_windows(['a', 'b', 'c'], 1, '<MASK>'))
+    [('<MASK>', 'a', 'b'), ('a', 'b', 'c'), ('b', 'c', '<MASK>')]
+
+    """
+    padding = [mask_token] * window_size
+    return nltk.ngrams(padding + list(tokens) + padding, window_size * 2 + 1)
+
+
+def create_cbow_pairs(tokens: Sequence[str], window_size: int, mask_token: str) -> list[tuple[str, str]]:
+    """
+    Creates `(context, target)` pairs for each token of the sentence.
+
+    The context is the space-separated tokens of the window, except for the target and the mask tokens.
+    This is the reference implementation, see `create_cbow_pairs_by_slices`.
+
+    Example:
+
+    >>> create_cbow_pairs(['a', 'b', 'c'], 1, '<MASK>')
+    [('b', 'a'), ('a c', 'b'), ('b', 'c')]
+
+    """
+    data = []
+    for window in create_cbow_windows(tokens, window_size, mask_token):
+        target_token = window[window_size]
+        context = []
+        for i, token in enumerate(window):
+            if token == mask_token or i == window_size:
+                continue
+            else:
+                context.append(token)
+        data.append((' '.join(context), target_token))
+
+    return data
+
+
+def create_cbow_pairs_by_slices(tokens: Sequence[str], window_size: int) -> list[tuple[str, str]]:
+    """
+    Creates the same `(context, target)` pairs as `create_cbow_pairs`.
+
+    Instead of padding the sentence and filtering the mask tokens out of each window,
+    the context is joined from the slices of the sentence to the left and to the right of the target.
+
+    Example:
+
+    >>> create_cbow_pairs_by_slices(['a', 'b', 'c'], 1)
+    [('b', 'a'), ('a c', 'b'), ('b', 'c')]
+
+    """
+    tokens = list(tokens)
+    return [
+        (' '.join(tokens[max(i - window_size, 0):i] + tokens[i + 1:i + 1 + window_size]), target_token)
+        for i, target_token in enumerate(tokens)
+    ]
+
+
+def create_cbow_window_ids(
+        sentences: Sequence[Sequence[int]],
+        window_size: int,
+        pad_id: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Creates CBOW windows for the token ids of one or more sentences at once.
+
+    The vectorized version of `create_cbow_windows`: the sentences are laid out in a single array,
+    separated by `window_size` padding ids, and the windows are taken with `sliding_window_view`.
+
+    Args:
+        sentences (Sequence[Sequence[int]]): Token ids of the sentences.
+        window_size (int): Size of the context window around the target token.
+        pad_id (int): The id used to pad the context at the sentence boundaries.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Contexts of shape `(n, 2 * window_size)`, padded with `pad_id`,
+            and targets of shape `(n,)`, where `n` is the total number of tokens.
+
+    Example:
+
+    >>> contexts, targets = create_cbow_window_ids([[1, 2, 3], [4, 5]], 1, 0)
+    >>> contexts.tolist(), targets.tolist()
+    ([[0, 2], [1, 3], [2, 0], [0, 5], [4, 0]], [1, 2, 3, 4, 5])
+
+    """
+    padding = [pad_id] * window_size
+    padding_mask = [False] * window_size
+
+    ids = list(padding)
+    is_target = list(padding_mask)
+    for sentence in sentences:
+        ids.extend(sentence)
+        ids.extend(padding)
+        is_target.extend([True] * len(sentence))
+        is_target.extend(padding_mask)
+
+    # No tokens
+    if len(ids) < 2 * window_size + 1:
+        return np.empty((0, 2 * window_size), dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    # The window `k` is centered on the token `k + window_size`
+    windows = sliding_window_view(np.array(ids, dtype=np.int64), 2 * window_size + 1)
+    windows = windows[np.array(is_target[window_size:len(is_target) - window_size], dtype=bool)]
+
+    contexts = np.concatenate([windows[:, :window_size], windows[:, window_size + 1:]], axis=1)
+    targets = windows[:, window_size]
+
+    return contexts, targets
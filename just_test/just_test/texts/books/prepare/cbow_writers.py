@@ -0,0 +1,442 @@
+import io
+import os
+import random
+
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+from just_test.texts.books.prepare.cbow_windows import create_cbow_pairs_by_slices, create_cbow_window_ids
+from just_test.texts.books.prepare.token_counts import CountMinSketch
+from just_test.texts.books.prepare.vocabulary import Vocabulary
+from just_test.util.csv_writer import BufferedCsvWriter
+from just_test.util.ml.sample_distributor import SampleDistributor
+from just_test.util.npy_writer import NpyAppendWriter
+
+
+class CBOWWriter:
+    """
+    Base class for the CBOW dataset writers.
+
+    A writer receives tokenized sentences of a paragraph together with the split
+    of the paragraph, creates the CBOW windows and writes them.
+
+    Args:
+        output_path (Path): The path to the output file. Writers that produce several files
+            use it as the common prefix, see `get_output_paths()`.
+        window_size (int): Size of the context window around the target word.
+        mask_token (str): A token used to pad the context window.
+    """
+
+    def __init__(self, output_path: Path, window_size: int, mask_token: str):
+        self.output_path = Path(output_path)
+        self.window_size = window_size
+        self.mask_token = mask_token
+
+    @classmethod
+    def get_output_paths(cls, output_path: Path, **kwargs) -> list[Path]:
+        """
+        Returns the paths of all files created by the writer.
+
+        Args:
+            output_path (Path): The output path of the writer.
+            **kwargs: The other arguments of the writer constructor, the paths of some writers depend on them.
+        """
+        raise NotImplementedError
+
+    def write(self, sentences: list[list[str]], sample: str) -> None:
+        raise NotImplementedError
+
+    def get_checkpoint(self) -> dict:
+        """
+        Flushes the written windows and returns a JSON-serializable state of the output,
+        which can be passed to the writer constructor to continue writing after this point.
+        """
+        raise NotImplementedError(f'{type(self).__name__} does not support checkpoints')
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> 'CBOWWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+class CBOWCsvWriter(CBOWWriter):
+    """
+    Writes the `context,target,split` text columns to a single CSV file.
+
+    Args:
+        checkpoint (dict): Optional, the result of `get_checkpoint()`. The file is truncated
+            to the checkpoint, and the writing continues from there.
+    """
+
+    HEADER = ('context', 'target', 'split')
+
+    def __init__(self, output_path: Path, window_size: int, mask_token: str, checkpoint: Optional[dict] = None):
+        super().__init__(output_path, window_size, mask_token)
+
+        if checkpoint is None:
+            self._file = self.output_path.open('w', encoding='UTF-8')
+            self._writer = BufferedCsvWriter(self._file, header=self.HEADER)
+        else:
+            os.truncate(self.output_path, checkpoint['offset'])
+            self._file = self.output_path.open('a', encoding='UTF-8')
+            self._writer = BufferedCsvWriter(self._file, header=None if checkpoint['offset'] else self.HEADER)
+
+    @classmethod
+    def get_output_paths(cls, output_path: Path, **kwargs) -> list[Path]:
+        return [Path(output_path)]
+
+    def write(self, sentences: list[list[str]], sample: str) -> None:
+        rows = []
+        for tokens in sentences:
+            for context, target in create_cbow_pairs_by_slices(tokens, self.window_size):
+                rows.append((context, target, sample))
+
+        self._writer.writerows(rows)
+
+    def get_checkpoint(self) -> dict:
+        self._writer.flush()
+        self._file.flush()
+        return {'offset': self._file.tell()}
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._writer.close()
+            self._file.close()
+
+
+class _AppendFile:
+    """A text stream that opens the file only for the time of each write, to append the text."""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def write(self, text: str) -> None:
+        with self.path.open('a', encoding='UTF-8') as fp:
+            fp.write(text)
+
+
+class CBOWShardedCsvWriter(CBOWWriter):
+    """
+    Writes the `context,target,split` rows to `num_shards` CSV files in a random order.
+
+    This is an external shuffle in bounded memory: each row is appended to a temporary file of a random shard,
+    and on `close()` the shards are shuffled one at a time and written with the header,
+    see `get_output_paths()`. The order is the same for the same rows and `seed`.
+
+    Each shard has to fit in memory: `close()` reads a whole shard to shuffle it, as a list of lines,
+    which takes a few times the size of the shard file. Choose `num_shards` by the expected output size,
+    for example 1000 shards of 10 MB for a 10 GB dataset.
+
+    The rows of each shard are buffered, and a temporary file is opened only to append a full buffer,
+    so at most one file is open at a time for any `num_shards`.
+
+    A loader can read the shards in a random order, without a global shuffle.
+
+    Args:
+        num_shards (int): Number of the shard files. Defaults to `DEFAULT_NUM_SHARDS`.
+        seed (int): Random seed for the shard assignment and the shuffle. Defaults to 1719.
+    """
+
+    HEADER = CBOWCsvWriter.HEADER
+    DEFAULT_NUM_SHARDS = 16
+    # The buffer size of each temporary shard file, in characters
+    SHARD_BUFFER_SIZE = 64 * 1024
+
+    def __init__(
+            self,
+            output_path: Path,
+            window_size: int,
+            mask_token: str,
+            num_shards: int = DEFAULT_NUM_SHARDS,
+            seed: int = 1719
+    ):
+        if num_shards < 1:
+            raise ValueError('num_shards < 1')
+
+        super().__init__(output_path, window_size, mask_token)
+
+        self.num_shards = num_shards
+        self.rnd = random.Random(seed)
+
+        self._tmp_writers = []
+        for path in self.get_output_paths(self.output_path, num_shards):
+            tmp_path = self.get_tmp_shard_path(path)
+            tmp_path.unlink(missing_ok=True)
+            self._tmp_writers.append(BufferedCsvWriter(_AppendFile(tmp_path), buffer_size=self.SHARD_BUFFER_SIZE))
+
+    @classmethod
+    def get_output_paths(cls, output_path: Path, num_shards: int = DEFAULT_NUM_SHARDS, **kwargs) -> list[Path]:
+        return cls.get_shard_paths(output_path, num_shards)
+
+    @staticmethod
+    def get_shard_paths(output_path: Path, num_shards: int) -> list[Path]:
+        return [Path(output_path).with_suffix(f'.{k:05d}-of-{num_shards:05d}.csv') for k in range(num_shards)]
+
+    @staticmethod
+    def get_tmp_shard_path(shard_path: Path) -> Path:
+        return shard_path.with_name(f'{shard_path.name}.tmp')
+
+    def write(self, sentences: list[list[str]], sample: str) -> None:
+        rows = []
+        for tokens in sentences:
+            for context, target in create_cbow_pairs_by_slices(tokens, self.window_size):
+                rows.append((context, target, sample))
+
+        shard_rows = defaultdict(list)
+        for row, shard in zip(rows, self.rnd.choices(range(self.num_shards), k=len(rows))):
+            shard_rows[shard].append(row)
+
+        for shard, rows in shard_rows.items():
+            self._tmp_writers[shard].writerows(rows)
+
+    def close(self) -> None:
+        if self._tmp_writers is None:
+            return
+
+        for writer in self._tmp_writers:
+            writer.close()
+        self._tmp_writers = None
+
+        header_stream = io.StringIO()
+        with BufferedCsvWriter(header_stream, header=self.HEADER) as header_writer:
+            header_writer.writerows([])
+        header_bytes = header_stream.getvalue().encode('UTF-8')
+
+        for shard_path in self.get_output_paths(self.output_path, self.num_shards):
+            tmp_path = self.get_tmp_shard_path(shard_path)
+            # A shard without rows has no temporary file
+            lines = []
+            if tmp_path.exists():
+                with tmp_path.open('rb') as fp:
+                    lines = fp.readlines()
+
+            self.rnd.shuffle(lines)
+            with shard_path.open('wb') as fp:
+                fp.write(header_bytes)
+                fp.writelines(lines)
+            tmp_path.unlink(missing_ok=True)
+
+
+class CBOWSentencesWriter(CBOWWriter):
+    """
+    Writes the tokenized sentences instead of the windows and counts the tokens.
+
+    This is the first pass of the creation with subsampling: the sentences are written one per line
+    as `<split>\t<space-separated tokens>`, and are read back with `read()` when the token counts are known.
+
+    Args:
+        token_counts (Union[Counter, CountMinSketch]): The counter of the tokens, updated on `write()`.
+    """
+
+    def __init__(
+            self,
+            output_path: Path,
+            window_size: int,
+            mask_token: str,
+            token_counts: Union[Counter, CountMinSketch]
+    ):
+        super().__init__(output_path, window_size, mask_token)
+
+        self.token_counts = token_counts
+        self.tokens_count = 0
+        self._file = self.output_path.open('w', encoding='UTF-8')
+
+    @classmethod
+    def get_output_paths(cls, output_path: Path, **kwargs) -> list[Path]:
+        return [Path(output_path)]
+
+    @staticmethod
+    def read(path: Path) -> Iterator[tuple[str, list[str]]]:
+        """Returns the splits and the tokens of the written sentences."""
+        with Path(path).open('r', encoding='UTF-8') as fp:
+            for line in fp:
+                sample, sentence = line.rstrip('\n').split('\t', 1)
+                yield sample, sentence.split(' ')
+
+    def write(self, sentences: list[list[str]], sample: str) -> None:
+        for tokens in sentences:
+            self.token_counts.update(tokens)
+            self.tokens_count += len(tokens)
+
+        self._file.write(''.join(f'{sample}\t{" ".join(tokens)}\n' for tokens in sentences))
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class CBOWArrayWriter(CBOWWriter):
+    """
+    Base class for the writers of token-id-encoded windows.
+
+    Each window is stored as a fixed-width context of `2 * window_size` token ids,
+    padded with the id of the mask token (0), and a target token id.
+    The ids are the line numbers of the vocabulary file, which is written on `close()`.
+    Each split is written to separate files, so it can be read without scanning the others.
+
+    Args:
+        block_size (int): Number of windows of a split buffered in memory before they are written.
+            Defaults to 65536.
+    """
+
+    PAD_ID = 0
+    DTYPE = np.int32
+    DEFAULT_BLOCK_SIZE = 65536
+
+    def __init__(self, output_path: Path, window_size: int, mask_token: str, block_size: Optional[int] = None):
+        super().__init__(output_path, window_size, mask_token)
+
+        self.block_size = block_size or self.DEFAULT_BLOCK_SIZE
+        self.vocabulary = Vocabulary([mask_token])
+        self._blocks: dict[str, list[tuple[np.ndarray, np.ndarray]]] = {
+            sample: [] for sample in SampleDistributor.SAMPLES
+        }
+        self._block_lengths: dict[str, int] = {sample: 0 for sample in SampleDistributor.SAMPLES}
+
+    @staticmethod
+    def get_vocabulary_path(output_path: Path) -> Path:
+        return Path(output_path).with_suffix('.vocab.txt')
+
+    @staticmethod
+    def get_split_path(output_path: Path, sample: str, suffix: str) -> Path:
+        return Path(output_path).with_suffix(f'.{sample}{suffix}')
+
+    def write(self, sentences: list[list[str]], sample: str) -> None:
+        if not sentences:
+            return
+
+        ids = [self.vocabulary.encode(tokens) for tokens in sentences]
+        contexts, targets = create_cbow_window_ids(ids, self.window_size, self.PAD_ID)
+
+        self._blocks[sample].append((contexts, targets))
+        self._block_lengths[sample] += len(targets)
+        if self._block_lengths[sample] >= self.block_size:
+            self._flush(sample)
+
+    def close(self) -> None:
+        if self._blocks is None:
+            return
+
+        for sample in SampleDistributor.SAMPLES:
+            self._flush(sample)
+
+        self.vocabulary.save(self.get_vocabulary_path(self.output_path))
+        self._blocks = None
+
+    def _flush(self, sample: str) -> None:
+        blocks = self._blocks[sample]
+        if not blocks:
+            return
+
+        contexts = np.concatenate([contexts for contexts, _ in blocks]).astype(self.DTYPE, copy=False)
+        targets = np.concatenate([targets for _, targets in blocks]).astype(self.DTYPE, copy=False)
+        self._write_block(sample, contexts, targets)
+
+        blocks.clear()
+        self._block_lengths[sample] = 0
+
+    def _write_block(self, sample: str, contexts: np.ndarray, targets: np.ndarray) -> None:
+        raise NotImplementedError
+
+
+class CBOWNpyWriter(CBOWArrayWriter):
+    """
+    Writes each split as two `.npy` files, which can be memory-mapped by the trainer:
+    `<name>.<split>.context.npy` of shape `(n, 2 * window_size)` and `<name>.<split>.target.npy`
+    of shape `(n,)`.
+    """
+
+    def __init__(self, output_path: Path, window_size: int, mask_token: str, block_size: Optional[int] = None):
+        super().__init__(output_path, window_size, mask_token, block_size=block_size)
+
+        self._context_writers = {
+            sample: NpyAppendWriter(
+                self.get_split_path(self.output_path, sample, '.context.npy'),
+                self.DTYPE,
+                row_shape=(2 * window_size,)
+            )
+            for sample in SampleDistributor.SAMPLES
+        }
+        self._target_writers = {
+            sample: NpyAppendWriter(self.get_split_path(self.output_path, sample, '.target.npy'), self.DTYPE)
+            for sample in SampleDistributor.SAMPLES
+        }
+
+    @classmethod
+    def get_output_paths(cls, output_path: Path, **kwargs) -> list[Path]:
+        res = [cls.get_vocabulary_path(output_path)]
+        for sample in SampleDistributor.SAMPLES:
+            res.append(cls.get_split_path(output_path, sample, '.context.npy'))
+            res.append(cls.get_split_path(output_path, sample, '.target.npy'))
+
+        return res
+
+    def close(self) -> None:
+        super().close()
+
+        for writer in list(self._context_writers.values()) + list(self._target_writers.values()):
+            writer.close()
+
+    def _write_block(self, sample: str, contexts: np.ndarray, targets: np.ndarray) -> None:
+        self._context_writers[sample].append(contexts)
+        self._target_writers[sample].append(targets)
+
+
+class CBOWParquetWriter(CBOWArrayWriter):
+    """
+    Writes each split to a `<name>.<split>.parquet` file, one row group per written block.
+
+    The `context` column is a fixed-size list of `2 * window_size` token ids, the `target` column
+    is a token id. Requires pyarrow.
+    """
+
+    def __init__(self, output_path: Path, window_size: int, mask_token: str, block_size: Optional[int] = None):
+        if not self.is_available():
+            raise ImportError('pyarrow is required to write Parquet files')
+
+        super().__init__(output_path, window_size, mask_token, block_size=block_size)
+
+        self.schema = pa.schema([
+            ('context', pa.list_(pa.int32(), 2 * window_size)),
+            ('target', pa.int32()),
+        ])
+        self._parquet_writers = {
+            sample: pq.ParquetWriter(self.get_split_path(self.output_path, sample, '.parquet'), self.schema)
+            for sample in SampleDistributor.SAMPLES
+        }
+
+    @staticmethod
+    def is_available() -> bool:
+        return pa is not None
+
+    @classmethod
+    def get_output_paths(cls, output_path: Path, **kwargs) -> list[Path]:
+        res = [cls.get_vocabulary_path(output_path)]
+        for sample in SampleDistributor.SAMPLES:
+            res.append(cls.get_split_path(output_path, sample, '.parquet'))
+
+        return res
+
+    def close(self) -> None:
+        super().close()
+
+        for writer in self._parquet_writers.values():
+            writer.close()
+
+    def _write_block(self, sample: str, contexts: np.ndarray, targets: np.ndarray) -> None:
+        context_array = pa.FixedSizeListArray.from_arrays(pa.array(contexts.ravel()), contexts.shape[1])
+        table = pa.Table.from_arrays([context_array, pa.array(targets)], schema=self.schema)
+        self._parquet_writers[sample].write_table(table)
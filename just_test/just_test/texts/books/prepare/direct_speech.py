@@ -2,8 +2,9 @@ import re
 
 from typing import Callable, Optional
 
-from just_test.texts.books.prepare.sent_tokenize import simple_sent_tokenize
-from just_test.texts.books.prepare.sentence_part import SentencePart
+from just_test.texts.books.prepare.sent_tokenize import simple_sent_tokenize, strip_span
+from just_test.texts.books.prepare.sentence_part import SentencePart, capitalize_text, close_text
+from just_test.util.stage_stats import StageStats
 
 # Matches direct speech enclosed in double quotes, ensuring it contains
 # at least one word and ends with a punctuation mark.
@@ -14,6 +15,58 @@ DIRECT_SPEECH_REGEX = re.compile(r'"[^"]*\w[^"]*(?:[!,.:;?]+\'?"|\'?"\s*$)')
 SECONDARY_DIRECT_SPEECH_REGEX = re.compile(r"(?:^|(?<=[,.:;?!]\s))'\w(?:[^']|'(?!\W))*[,.:;?!]+'")
 
 
+# Flags of the text parts returned by `_split_text_to_spans`
+PART_DIRECT = 1
+
+
+def _split_text_to_spans(text: str, secondary: bool = False) -> list[tuple[int, int, int]]:
+    """
+    Splits the given text into parts based on direct speech patterns, without copying the parts.
+
+    The same split as `_split_text_to_parts`, but each part is returned as a `(start, end, flags)` tuple
+    of offsets into `text`. Non-direct speech spans are stripped of whitespace. Direct speech spans
+    (`flags & PART_DIRECT`) cover the quoted text including the quotes, and are never empty after the quotes
+    are stripped.
+
+    Args:
+        text (str): The input text to be split into parts.
+        secondary (bool): Split by the secondary (single quotes) direct speech.
+
+    Returns:
+        list[tuple[int, int, int]]: Spans of the parts in the order of the text.
+
+    Example:
+
+    >>> _split_text_to_spans('"Hi!" he said. ')
+    [(0, 5, 1), (6, 14, 0)]
+
+    """
+    pattern = SECONDARY_DIRECT_SPEECH_REGEX if secondary else DIRECT_SPEECH_REGEX
+
+    spans: list[tuple[int, int, int]] = []
+    pos: int = 0
+    for match in pattern.finditer(text):
+        start, end = match.span()
+        if pos < start:
+            # Non-direct speech
+            part_start, part_end = strip_span(text, pos, start)
+            if part_start < part_end:
+                spans.append((part_start, part_end, 0))
+
+        # Direct speech
+        pos = end
+        part_start, part_end = strip_span(text, start, end)
+        spans.append((part_start, part_end, PART_DIRECT))
+
+    if pos < len(text):
+        # Non-direct speech
+        part_start, part_end = strip_span(text, pos, len(text))
+        if part_start < part_end:
+            spans.append((part_start, part_end, 0))
+
+    return spans
+
+
 def _split_text_to_parts(
         text: str,
         sent_tokenize: Callable[[str], list[str]] = simple_sent_tokenize,
@@ -25,12 +78,13 @@ def _split_text_to_parts(
     This function uses a regular expression to identify direct speech segments within the text.
     It separates these segments from the rest of the text and categorizes them as either direct
     speech or non-direct speech. Each segment is wrapped in a `SentencePart` object.
+    See `_split_text_to_spans` for the offsets of the segments.
 
     Args:
         text (str): The input text to be split into parts.
         sent_tokenize (Callable[[str], list[str]]): A function for tokenizing sentences within
             each text segment. Defaults to `simple_sent_tokenize`.
-        secondary
+        secondary (bool): Split by the secondary (single quotes) direct speech.
 
     Returns:
         list[SentencePart]: A list of `SentencePart` objects representing the split text segments.
@@ -38,36 +92,19 @@ def _split_text_to_parts(
             and the sentence tokenizer function.
     """
     primary = not secondary
-    if primary:
-        quote = '"'
-        pattern = DIRECT_SPEECH_REGEX
-    else:
-        pattern = SECONDARY_DIRECT_SPEECH_REGEX
-        quote = "'"
+    quote = '"' if primary else "'"
 
-    matches: list[re.Match] = list(pattern.finditer(text))
     parts: list[SentencePart] = []
-    pos: int = 0
-    for match in matches:
-        start, end = match.span()
-        if pos < start:
-            # Non-direct speech
-            part_text = text[pos:start].strip()
+    for start, end, flags in _split_text_to_spans(text, secondary=secondary):
+        if flags & PART_DIRECT:
+            # Direct speech
+            quoted_text: str = text[start:end]
+            part_text = quoted_text.strip(quote)
             if part_text:
-                parts.append(SentencePart(part_text, direct=False, sent_tokenize=sent_tokenize))
-
-        # Direct speech
-        pos = end
-        quoted_text: str = match.group().strip()
-        part_text = quoted_text.strip(quote)
-        if part_text:
-            parts.append(SentencePart(part_text, direct=True, quoted_text=quoted_text, sent_tokenize=sent_tokenize))
-
-    if pos < len(text):
-        # Non-direct speech
-        part_text = text[pos:].strip()
-        if part_text:
-            parts.append(SentencePart(part_text, direct=False, sent_tokenize=sent_tokenize))
+                parts.append(SentencePart(part_text, direct=True, quoted_text=quoted_text, sent_tokenize=sent_tokenize))
+        else:
+            # Non-direct speech
+            parts.append(SentencePart(text[start:end], direct=False, sent_tokenize=sent_tokenize))
 
     prev, last = ((None, None) + tuple(parts))[-2:]
     if last:
@@ -233,7 +270,8 @@ def _reconstruct_text_parts(parts: list[SentencePart]) -> list[SentencePart]:
 def reconstruct_direct_speech(
         text: str,
         sent_tokenize: Callable[[str], list[str]] = simple_sent_tokenize,
-        secondary: bool = False
+        secondary: bool = False,
+        stats: Optional[StageStats] = None
 ) -> str:
     """Reconstructs direct speech from a text.
 
@@ -244,6 +282,8 @@ def reconstruct_direct_speech(
             as the end of a sentence. Instead of the default value, use any model-based function.
         secondary (bool): If True, the function treats the secondary direct speech pattern as the primary one.
             Defaults to False, meaning it uses the primary direct speech pattern.
+        stats (StageStats): Optional, counts the texts by path: 'direct_speech_fast' for the texts without
+            double quotes, which are only capitalized and closed, and 'direct_speech_full' for the others.
 
     Returns:
         str: The reconstructed text
@@ -259,6 +299,19 @@ def reconstruct_direct_speech(
     """
     primary = not secondary
 
+    # Fast path: there is no direct speech without quotes
+    if primary:
+        if '"' not in text:
+            if stats is not None:
+                stats.add('direct_speech_fast')
+            return close_text(capitalize_text(text.strip()))
+
+        if stats is not None:
+            stats.add('direct_speech_full')
+
+    elif "'" not in text:
+        return text if text.strip() else ''
+
     # Split text into parts:  str -> list[SentencePart]
     parts = _split_text_to_parts(text, sent_tokenize=sent_tokenize, secondary=secondary)
 
@@ -1,142 +1,217 @@
 import re
 
+from typing import Callable, Optional, Union
 
-def prepare_prelim(text: str) -> str:
-    # Replace multiple whitespaces
-    text = re.sub(r'[^\S\n]+', ' ', text)
-    # Replace single linebreaks to whitespace
-    text = re.sub(r'(\S)[^\S\n]*\n[^\S\n]*(\S)', r'\1 \2', text)
 
-    # Remove underscore
-    text = text.replace("_", "")
+class RewriteRule:
+    """
+    A regular expression substitution, compiled once.
 
-    # Replace single quotation marks
-    # U+2018 Left single quotation mark
-    text = text.replace("\u2018", "'")
-    # U+2019 Right single quotation mark
-    text = text.replace("\u2019", "'")
+    Args:
+        pattern (str): The regular expression.
+        repl (Union[str, Callable[[re.Match], str]]): The replacement, as in `re.sub`.
+        required (str): Optional, a substring without which the pattern cannot match.
+            The rule is skipped if the text does not contain it.
+    """
 
-    # Replace double quotes marks
-    # U+201C Left double quotation mark
-    text = text.replace("\u201c", '"')
-    # U+201D Right double quotation mark
-    text = text.replace("\u201d", '"')
+    def __init__(
+            self,
+            pattern: str,
+            repl: Union[str, Callable[[re.Match], str]],
+            required: Optional[str] = None
+    ):
+        self.pattern = re.compile(pattern)
+        self.repl = repl
+        self.required = required
 
-    # Remove text in square brackets
-    text = re.sub(r'^\s*\[[^[\]\n]*\]\s*', '', text)
-    text = re.sub(r'\s*\[[^[\]\n]*\]\s*$', '', text)
+    def apply(self, text: str) -> str:
+        if self.required is not None and self.required not in text:
+            return text
 
-    def _sub_square_brackets(m: re.Match) -> str:
-        if m.group(1) or m.group(2):
-            return ' '
-        else:
-            return ''
+        return self.pattern.sub(self.repl, text)
 
-    text = re.sub(r'([^\S\n]*)\[[^[\]\n]*\]([^\S\n]*)', _sub_square_brackets, text)
 
-    # Minimize subsequent whitespaces
-    text = re.sub(r'[^\S\n]+', ' ', text)
+class RewriteRuleGroup:
+    """
+    A sequence of rewrite rules applied one after another.
 
-    return text
+    Args:
+        rules (list[RewriteRule]): The rules.
+        triggers (tuple[str, ...]): Optional, substrings at least one of which must be present
+            in the text for any rule of the group to match. The whole group is skipped otherwise.
+    """
 
+    def __init__(self, rules: list[RewriteRule], triggers: tuple[str, ...] = ()):
+        self.rules = rules
+        self.triggers = triggers
 
-def replace_dash_u2014(text: str) -> str:
-    """Replace the "U+2014 EM DASH" character."""
+    def apply(self, text: str) -> str:
+        if self.triggers and not any(trigger in text for trigger in self.triggers):
+            return text
+
+        for rule in self.rules:
+            text = rule.apply(text)
+
+        return text
+
+
+def _sub_square_brackets(m: re.Match) -> str:
+    if m.group(1) or m.group(2):
+        return ' '
+    else:
+        return ''
+
+
+# Character replacements of `prepare_prelim`, done in a single pass
+PRELIM_TRANSLATION = str.maketrans({
+    # Remove underscore
+    '_': None,
+    # U+2018 Left single quotation mark
+    '\u2018': "'",
+    # U+2019 Right single quotation mark
+    '\u2019': "'",
+    # U+201C Left double quotation mark
+    '\u201c': '"',
+    # U+201D Right double quotation mark
+    '\u201d': '"',
+})
+
+PRELIM_WHITESPACE_RULES = RewriteRuleGroup([
+    # Replace multiple whitespaces
+    RewriteRule(r'[^\S\n]+', ' '),
+    # Replace single linebreaks to whitespace
+    RewriteRule(r'(\S)[^\S\n]*\n[^\S\n]*(\S)', r'\1 \2', required='\n'),
+])
+
+PRELIM_SQUARE_BRACKETS_RULES = RewriteRuleGroup([
+    # Remove text in square brackets at the beginning or at the end of the text
+    RewriteRule(r'^\s*\[[^[\]\n]*\]\s*|\s*\[[^[\]\n]*\]\s*$', ''),
+    # Remove text in square brackets in the middle of the text
+    RewriteRule(r'([^\S\n]*)\[[^[\]\n]*\]([^\S\n]*)', _sub_square_brackets),
+], triggers=('[',))
+
+# Minimize subsequent whitespaces.
+# After `PRELIM_WHITESPACE_RULES` the only whitespace other than linebreaks is a single space,
+# so the subsequent whitespaces can appear only where underscores or square brackets are removed.
+PRELIM_MINIMIZE_WHITESPACE_RULE = RewriteRule(r'[^\S\n]{2,}', ' ', required='  ')
+
+DASH_U2014_RULES = RewriteRuleGroup([
     # eve—e—e—ening => evening
-    text = re.sub(r'(?i)((\w)\u2014)+\2(\u2014\2)+', r'\g<2>', text)
+    RewriteRule(r'(?i)((\w)\u2014)+\2(\u2014\2)+', r'\g<2>', required='\u2014'),
     # Anita—a => Anita
-    text = re.sub(r'(?i)(\w)(\u2014\1)+\b', r'\g<1>', text)
+    RewriteRule(r'(?i)(\w)(\u2014\1)+\b', r'\g<1>', required='\u2014'),
     # A—anita => Anita
-    text = re.sub(r'(?i)\b(\w)(\u2014\1)+', r'\g<1>', text)
+    RewriteRule(r'(?i)\b(\w)(\u2014\1)+', r'\g<1>', required='\u2014'),
     # and—oh => and, oh
-    text = re.sub(r'(\w)[^\S\r\n]*\u2014[^\S\r\n]*(\w)', r'\g<1>, \g<2>', text)
+    RewriteRule(r'(\w)[^\S\r\n]*\u2014[^\S\r\n]*(\w)', r'\g<1>, \g<2>', required='\u2014'),
     # to—", said => to," said
-    text = re.sub(r'(\w)\u2014([^\w\s,.:;?!()]{1,2})([,.:;?!]+)([^\S\r\n]\w)', r'\g<1>\g<3>\g<2>\g<4>', text)
+    RewriteRule(
+        r'(\w)\u2014([^\w\s,.:;?!()]{1,2})([,.:;?!]+)([^\S\r\n]\w)', r'\g<1>\g<3>\g<2>\g<4>', required='\u2014'),
     # mean—" continued => mean," continued
     # little—'" and => little,'" and
-    text = re.sub(r'(\w)\u2014([^\w\s,.:;?!()]{1,2}[^\S\r\n]\w)', r'\g<1>,\g<2>', text)
+    RewriteRule(r'(\w)\u2014([^\w\s,.:;?!()]{1,2}[^\S\r\n]\w)', r'\g<1>,\g<2>', required='\u2014'),
     # know—" => know"
-    text = re.sub(r'(\w)\u2014([^\w\s,.:;?!()]{1,2}(\s|$))', r'\g<1>\g<2>', text)
+    RewriteRule(r'(\w)\u2014([^\w\s,.:;?!()]{1,2}(\s|$))', r'\g<1>\g<2>', required='\u2014'),
     # 'Henrietta'—" resumed => 'Henrietta,'" resumed
-    text = re.sub(r'(\w)([^\w\s,.:;?!()])\u2014([^\w\s,.:;?!()][^\S\r\n]\w)', r'\g<1>,\g<2>\g<3>', text)
+    RewriteRule(r'(\w)([^\w\s,.:;?!()])\u2014([^\w\s,.:;?!()][^\S\r\n]\w)', r'\g<1>,\g<2>\g<3>', required='\u2014'),
     # But!—" cried => But!" cried
-    text = re.sub(r'(\w[,.:;?!]+)\u2014([^\w\s,.:;?!()]{1,2}(\s|$))', r'\g<1>\g<2>', text)
+    RewriteRule(r'(\w[,.:;?!]+)\u2014([^\w\s,.:;?!()]{1,2}(\s|$))', r'\g<1>\g<2>', required='\u2014'),
     # you.—Come => you. Come
-    text = re.sub(r'(\w[,.:;?!]+)\u2014(\w)', r'\g<1> \g<2>', text)
+    RewriteRule(r'(\w[,.:;?!]+)\u2014(\w)', r'\g<1> \g<2>', required='\u2014'),
     # this:— => this:
-    text = re.sub(r'(\w[,.:;?!]+)\u2014(\s|$)', r'\g<1>\g<2>', text)
+    RewriteRule(r'(\w[,.:;?!]+)\u2014(\s|$)', r'\g<1>\g<2>', required='\u2014'),
     # "—change => "change
-    text = re.sub(r'((\s|^)[^\w\s,.:;?!()]{1,2})\u2014(\w)', r'\g<1>\g<3>', text)
+    RewriteRule(r'((\s|^)[^\w\s,.:;?!()]{1,2})\u2014(\w)', r'\g<1>\g<3>', required='\u2014'),
     # along—"Catch => along, "Catch
-    text = re.sub(r'(\w)\u2014([^\w\s,.:;?!()]{1,2}\w)', r'\g<1>, \g<2>', text)
+    RewriteRule(r'(\w)\u2014([^\w\s,.:;?!()]{1,2}\w)', r'\g<1>, \g<2>', required='\u2014'),
     # the dash is between words, but not before punctuation
-    text = re.sub(r'(\w[^\w\r\n]*)\u2014([^\w,.:;?!\r\n]*\w)', r'\g<1> \g<2>', text)
+    RewriteRule(r'(\w[^\w\r\n]*)\u2014([^\w,.:;?!\r\n]*\w)', r'\g<1> \g<2>', required='\u2014'),
     # in all other cases, remove the dash
-    text = text.replace('\u2014', '')
-
-    return text
-
+    RewriteRule(r'\u2014+', '', required='\u2014'),
+], triggers=('\u2014',))
 
-def replace_double_hyphen(text: str) -> str:
-    """Replace the double hyphen separator (--)."""
+DOUBLE_HYPHEN_RULES = RewriteRuleGroup([
     # ma--a--a--ad => mad
-    text = re.sub(r'(?i)((\w)--)+\2(--\2)+', r'\g<2>', text)
+    RewriteRule(r'(?i)((\w)--)+\2(--\2)+', r'\g<2>', required='--'),
     # cocoa--a => cocoa
-    text = re.sub(r'(?i)(\w)(--\1)+\b', r'\g<1>', text)
+    RewriteRule(r'(?i)(\w)(--\1)+\b', r'\g<1>', required='--'),
     # H--hup! => Hup!
-    text = re.sub(r'(?i)\b(\w)(--\1)+', r'\g<1>', text)
+    RewriteRule(r'(?i)\b(\w)(--\1)+', r'\g<1>', required='--'),
     # and--well => and, well
-    text = re.sub(r'(\w)[^\S\r\n\-]*(?:--){1,2}[^\S\r\n\-]*(\w)', r'\g<1>, \g<2>', text)
+    RewriteRule(r'(\w)[^\S\r\n\-]*(?:--){1,2}[^\S\r\n\-]*(\w)', r'\g<1>, \g<2>', required='--'),
     # but--" he => but," he
-    text = re.sub(r'(\w)(?:--){1,2}([^\w\s,.:;?!()\-]{1,2}[^\S\r\n]\w)', r'\g<1>,\g<2>', text)
+    RewriteRule(r'(\w)(?:--){1,2}([^\w\s,.:;?!()\-]{1,2}[^\S\r\n]\w)', r'\g<1>,\g<2>', required='--'),
     # that--" => that"
-    text = re.sub(r'(\w)(?:--){1,2}([^\w\s,.:;?!()\-]{1,2}(\s|$))', r'\g<1>\g<2>', text)
+    RewriteRule(r'(\w)(?:--){1,2}([^\w\s,.:;?!()\-]{1,2}(\s|$))', r'\g<1>\g<2>', required='--'),
     # oh!--" => oh!"
-    text = re.sub(r'(\w[,.:;?!]+)(?:--){1,2}([^\w\s,.:;?!()\-]{1,2}(\s|$))', r'\g<1>\g<2>', text)
+    RewriteRule(r'(\w[,.:;?!]+)(?:--){1,2}([^\w\s,.:;?!()\-]{1,2}(\s|$))', r'\g<1>\g<2>', required='--'),
     # etc.--but => etc. but
-    text = re.sub(r'(\w[,.:;?!]+)(?:--){1,2}(\w)', r'\g<1> \g<2>', text)
+    RewriteRule(r'(\w[,.:;?!]+)(?:--){1,2}(\w)', r'\g<1> \g<2>', required='--'),
     # said:-- => said:
-    text = re.sub(r'(\w[,.:;?!]+)(?:--){1,2}(\s|$)', r'\g<1>\g<2>', text)
+    RewriteRule(r'(\w[,.:;?!]+)(?:--){1,2}(\s|$)', r'\g<1>\g<2>', required='--'),
     # "--not => "not
-    text = re.sub(r'((\s|^)[^\w\s,.:;?!()\-]{1,2})(?:--){1,2}(\w)', r'\g<1>\g<3>', text)
+    RewriteRule(r'((\s|^)[^\w\s,.:;?!()\-]{1,2})(?:--){1,2}(\w)', r'\g<1>\g<3>', required='--'),
     # commented--"and => commented, "and
-    text = re.sub(r'(\w)(?:--){1,2}([^\w\s,.:;?!()\-]{1,2}\w)', r'\g<1>, \g<2>', text)
+    RewriteRule(r'(\w)(?:--){1,2}([^\w\s,.:;?!()\-]{1,2}\w)', r'\g<1>, \g<2>', required='--'),
     # the dash is between words, but not before punctuation
-    text = re.sub(r'(\w[^\w\r\n\-]*)(?:--){1,2}([^\w,.:;?!\r\n\-]*\w)', r'\g<1> \g<2>', text)
+    RewriteRule(r'(\w[^\w\r\n\-]*)(?:--){1,2}([^\w,.:;?!\r\n\-]*\w)', r'\g<1> \g<2>', required='--'),
     # in all other cases, remove the separator
-    text = re.sub(r'([^\-]|^)(?:--){1,2}([^\-]|$)', r'\g<1>\g<2>', text)
-
-    return text
-
+    RewriteRule(r'([^\-]|^)(?:--){1,2}([^\-]|$)', r'\g<1>\g<2>', required='--'),
+], triggers=('--',))
 
-def remove_parentheses(text: str) -> str:
-    """Remove parentheses from the text."""
+PARENTHESES_RULES = RewriteRuleGroup([
     # (Beginning => Beginning
-    text = re.sub(r'(^|\n\s*\n)(\W*)\(', r'\g<1>\g<2>', text)
+    RewriteRule(r'(^|\n\s*\n)(\W*)\(', r'\g<1>\g<2>', required='('),
     # ending) => ending
-    text = re.sub(r'\)(\W*)($|\n\s*\n)', r'\g<1>\g<2>', text)
+    RewriteRule(r'\)(\W*)($|\n\s*\n)', r'\g<1>\g<2>', required=')'),
     # mind (as => mind, as
-    text = re.sub(r'(\w)([^\S\n]+)\(([^\w\s,.:;?!()]{0,2}\w)', r'\g<1>,\g<2>\g<3>', text)
+    RewriteRule(r'(\w)([^\S\n]+)\(([^\w\s,.:;?!()]{0,2}\w)', r'\g<1>,\g<2>\g<3>', required='('),
     # prepare) your => prepare, your
-    text = re.sub(r'(\w)\)([^\S\n]+\w)', r'\g<1>,\g<2>', text)
+    RewriteRule(r'(\w)\)([^\S\n]+\w)', r'\g<1>,\g<2>', required=')'),
     # think" (for => think," for
-    text = re.sub(r'(\w)([^\w\s,.:;?!()]{1,2}[^\S\n]+)\(([^\w\s,.:;?!()]{0,2}\w)', r'\g<1>,\g<2>\g<3>', text)
+    RewriteRule(r'(\w)([^\w\s,.:;?!()]{1,2}[^\S\n]+)\(([^\w\s,.:;?!()]{0,2}\w)', r'\g<1>,\g<2>\g<3>', required='('),
     # over) "yes => over, "yes
-    text = re.sub(r'(\w)\)([^\S\n]+[^\w\s,.:;?!()]{1,2}\w)', r'\g<1>,\g<2>', text)
+    RewriteRule(r'(\w)\)([^\S\n]+[^\w\s,.:;?!()]{1,2}\w)', r'\g<1>,\g<2>', required=')'),
     # it?), and => it? and
-    text = re.sub(r'(\w[,.:;?!]+[^\w\s,.:;?!()]{0,2})\)[,.:;?!]+([^\S\n]+\w)', r'\g<1>\g<2>', text)
+    RewriteRule(r'(\w[,.:;?!]+[^\w\s,.:;?!()]{0,2})\)[,.:;?!]+([^\S\n]+\w)', r'\g<1>\g<2>', required=')'),
     # space after the closing parenthesis but before the letter
     # it), and => it, and
-    text = re.sub(r'\)([^\w\s()]*[^\S\n]+)', r'\g<1>', text)
+    RewriteRule(r'\)([^\w\s()]*[^\S\n]+)', r'\g<1>', required=')'),
     # space after the letter but before the opening parenthesis
     # wig, (look
-    text = re.sub(r'([^\S\n]+[^\w\s()]*)\(', r'\g<1>', text)
+    RewriteRule(r'([^\S\n]+[^\w\s()]*)\(', r'\g<1>', required='('),
     # remove the rest of the parentheses, replacing them with a space
-    text = re.sub(r'[()]+', ' ', text)
+    RewriteRule(r'[()]+', ' '),
+], triggers=('(', ')'))
+
+
+def prepare_prelim(text: str) -> str:
+    text = PRELIM_WHITESPACE_RULES.apply(text)
+    text = text.translate(PRELIM_TRANSLATION)
+
+    # Remove text in square brackets
+    text = PRELIM_SQUARE_BRACKETS_RULES.apply(text)
+
+    text = PRELIM_MINIMIZE_WHITESPACE_RULE.apply(text)
 
     return text
 
 
+def replace_dash_u2014(text: str) -> str:
+    """Replace the "U+2014 EM DASH" character."""
+    return DASH_U2014_RULES.apply(text)
+
+
+def replace_double_hyphen(text: str) -> str:
+    """Replace the double hyphen separator (--)."""
+    return DOUBLE_HYPHEN_RULES.apply(text)
+
+
+def remove_parentheses(text: str) -> str:
+    """Remove parentheses from the text."""
+    return PARENTHESES_RULES.apply(text)
+
+
 def prepare_english_book_text(text: str) -> str:
     text = prepare_prelim(text)
 
@@ -1,18 +1,44 @@
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+import hashlib
+import itertools
+import json
+import os
 from pathlib import Path
 import re
+import shutil
 import stat
-from typing import Callable, TextIO
+from typing import Callable, Deque, Iterator, Optional, Type, Union
+import warnings
 
 import nltk
-from nltk.tokenize import word_tokenize
 from nltk.tokenize.punkt import PunktSentenceTokenizer
-import pandas as pd
 from tqdm import tqdm
 
+from just_test.texts.books.prepare.cbow_dataset_options import CBOWDatasetOptions, SubsamplingOptions
+from just_test.texts.books.prepare.cbow_writers import (
+    CBOWCsvWriter,
+    CBOWNpyWriter,
+    CBOWParquetWriter,
+    CBOWSentencesWriter,
+    CBOWShardedCsvWriter,
+    CBOWWriter,
+)
 from just_test.texts.books.prepare.direct_speech import reconstruct_direct_speech
 from just_test.texts.books.prepare.english import prepare_english_book_text
+from just_test.texts.books.prepare.near_duplicates import MinHashDeduplicator
+from just_test.texts.books.prepare.paragraph_cache import ParagraphCache
 from just_test.texts.books.prepare.paragraphs_reader import TextParagraphsReader
+from just_test.texts.books.prepare.segments_manifest import SegmentsManifest
+from just_test.texts.books.prepare.sent_tokenize import PunktSentenceSpanTokenizer, SentenceSpanTokenizer
+from just_test.texts.books.prepare.token_counts import CountMinSketch, TokenSubsampler, VocabularyReport
+from just_test.texts.books.prepare.word_tokenize import nltk_word_tokenize
+from just_test.util.csv_writer import BufferedCsvWriter
 from just_test.util.ml.sample_distributor import SampleDistributor
+from just_test.util.stage_stats import NullStageStats, StageStats
+from just_test.util.text_files import open_text
 from just_test.util.validate import validate_type
 
 
@@ -26,20 +52,37 @@ class EnglishBookCBOWDatasetCreator:
     Attributes:
         MASK_TOKEN (str): A token used to pad the context window.
         raw_text_paths (list[str]): Paths to the raw text files to be processed.
+            Files compressed with gzip (.gz), bzip2 (.bz2), xz (.xz) or zstandard (.zst) are decompressed
+            on the fly, see `open_text`.
         output_csv_path (str): Path to the output CSV file where the dataset will be saved.
+            For the other output formats, the path without suffix is the common prefix
+            of the output files.
         window_size (int): Size of the context window around the target word. Defaults to 5.
         train_ratio (float): Ratio of data to be used for training. Defaults to 0.7.
         val_ratio (float): Ratio of data to be used for validation. Defaults to 0.15.
         test_ratio (float): Ratio of data to be used for testing. Defaults to 0.15.
         seed (int): Random seed for reproducibility. Defaults to 1719.
+        sent_tokenize (Callable[[str], list[str]]): Optional, a callable function for tokenizing
+            the text into sentences. Must be picklable with several worker processes.
+            Defaults to the Punkt English model. A `SentenceSpanTokenizer`, for example
+            `SimpleSentenceSpanTokenizer`, splits the paragraphs of a worker batch in one call.
+        options (CBOWDatasetOptions): Optional, the word tokenizer, the process pool, the output format
+            and the optional stages of the pipeline, see `CBOWDatasetOptions`. By default, a single CSV file
+            is created in the current process.
+
+    The results of the last `create()` are available in the `stats`, `paragraph_cache`, `near_duplicates`,
+    `segment_counts` and `vocabulary_report` properties.
 
     Methods:
-        create():
+        create(resume: bool = False):
             Processes the raw text file and generates the CBOW dataset saved to the output CSV file.
+            With `resume`, continues from the last checkpoint, if there is one. The output is the same
+            as the output of an uninterrupted run.
 
     """
 
     MASK_TOKEN = "<MASK>"
+    CHECKPOINT_VERSION = 1
 
     def __init__(
             self,
@@ -49,7 +92,9 @@ class EnglishBookCBOWDatasetCreator:
             train_ratio: float = 0.7,
             val_ratio: float = 0.15,
             test_ratio: float = 0.15,
-            seed: int = 1719
+            seed: int = 1719,
+            sent_tokenize: Optional[Callable[[str], list[str]]] = None,
+            options: Optional[CBOWDatasetOptions] = None
     ):
         self.raw_text_paths = raw_text_paths
         self.output_csv_path = output_csv_path
@@ -58,40 +103,492 @@ class EnglishBookCBOWDatasetCreator:
         self.val_ratio = val_ratio
         self.test_ratio = test_ratio
         self.seed = seed
+        self.sent_tokenize = sent_tokenize
+        self.options = options if options is not None else CBOWDatasetOptions()
 
         # Init
-        self.sample_distributor = self._create_sample_distributor()
-        self._header_printed = False
+        self._state = _CreationState(sample_distributor=self._create_sample_distributor(self.seed))
+
+    @property
+    def stats(self) -> StageStats:
+        """The stats of the stages, enabled with `CBOWDatasetOptions.profile`."""
+        return self._state.stats
+
+    @property
+    def sample_distributor(self) -> SampleDistributor:
+        return self._state.sample_distributor
+
+    @property
+    def paragraph_cache(self) -> Optional[ParagraphCache]:
+        """The cache of the tokenized sentences, with `CBOWDatasetOptions.paragraph_cache_size`."""
+        return self._state.paragraph_cache
+
+    @property
+    def near_duplicates(self) -> Optional[MinHashDeduplicator]:
+        """The near-duplicate filter, with `CBOWDatasetOptions.near_duplicates`."""
+        return self._state.near_duplicates
+
+    @property
+    def segment_counts(self) -> Counter:
+        """The numbers of the built, reused and removed segments, with `CBOWDatasetOptions.segments`."""
+        return self._state.segment_counts
+
+    @property
+    def vocabulary_report(self) -> Optional[VocabularyReport]:
+        """The vocabulary before and after the subsampling, with `CBOWDatasetOptions.subsampling`."""
+        return self._state.vocabulary_report
+
+    def create(self, resume: bool = False):
+        self._state = self._create_state()
+        with self.stats.stage('total'):
+            self._create(resume)
+
+        if self.paragraph_cache is not None:
+            tqdm.write(str(self.paragraph_cache))
+        if self.near_duplicates is not None:
+            tqdm.write(str(self.near_duplicates))
+
+        profile = self.options.profile
+        if profile is not None:
+            tqdm.write(self.stats.summary())
+            if profile.stats_path is not None:
+                self.stats.save(profile.stats_path)
+
+    def _create_state(self) -> '_CreationState':
+        options = self.options
+        state = _CreationState(
+            sample_distributor=self._create_sample_distributor(self.seed),
+            stats=StageStats() if options.profile is not None else NullStageStats()
+        )
+        if options.paragraph_cache_size is not None:
+            state.paragraph_cache = ParagraphCache(options.paragraph_cache_size)
+        if options.near_duplicates is not None:
+            state.near_duplicates = MinHashDeduplicator(
+                threshold=options.near_duplicates.threshold,
+                capacity=options.near_duplicates.capacity,
+                seed=self.seed
+            )
+
+        return state
+
+    def _create(self, resume: bool = False) -> None:
+        if self.options.segments is not None:
+            self._create_from_segments(Path(self.options.segments.directory))
+            return
+        if self.options.subsampling is not None:
+            self._create_with_subsampling(self.options.subsampling)
+            return
 
-    def create(self):
-        # Init
-        self.sample_distributor = self._create_sample_distributor()
-        self._header_printed = False
+        checkpoint = self._load_checkpoint() if resume else None
+        start_position = (0, 0)
+        if checkpoint is not None:
+            start_position = (checkpoint['file_index'], checkpoint['paragraph_index'])
+            self.sample_distributor.set_state(checkpoint['sample_distributor'])
+
+        writer_checkpoint = checkpoint['writer'] if checkpoint is not None else None
+        with self._create_writer(Path(self.output_csv_path), checkpoint=writer_checkpoint) as output_writer:
+            self._write_paragraphs(output_writer, self.raw_text_paths, start_position)
+
+        # The dataset is complete
+        if self.options.checkpoints is not None or resume:
+            self.get_checkpoint_path().unlink(missing_ok=True)
+
+    def _write_paragraphs(
+            self,
+            output_writer: CBOWWriter,
+            raw_text_paths: list[str],
+            start_position: tuple[int, int] = (0, 0)
+    ) -> None:
+        """Processes the paragraphs from the given position, see `_read_paragraphs()`."""
+        if self.options.parallel.num_workers > 1:
+            self._create_parallel(output_writer, raw_text_paths, start_position)
+            return
+
+        sentences_creator = self._create_sentences_creator()
+        checkpoints = self.options.checkpoints
+        paragraphs = self._read_paragraphs(raw_text_paths, start_position)
+        for paragraphs_count, (position, text) in enumerate(paragraphs, 1):
+            self._process_text(text, output_writer, sentences_creator)
+
+            if checkpoints is not None and paragraphs_count % checkpoints.interval == 0:
+                self._save_checkpoint(output_writer, position, self.sample_distributor.get_state())
+
+    def _create_with_subsampling(self, subsampling: SubsamplingOptions) -> None:
+        """
+        Creates the dataset in two passes: the first one writes the sentences to a temporary file
+        and counts the tokens, the second one creates the windows of the subsampled sentences.
+        """
+        token_counts: Union[Counter, CountMinSketch]
+        if subsampling.count_sketch_width is not None:
+            token_counts = CountMinSketch(subsampling.count_sketch_width)
+        else:
+            token_counts = Counter()
+
+        sentences_path = self.get_sentences_path()
+        self._create_empty_output_file(sentences_path)
+        try:
+            with CBOWSentencesWriter(
+                    sentences_path,
+                    window_size=self.window_size,
+                    mask_token=self.MASK_TOKEN,
+                    token_counts=token_counts
+            ) as sentences_writer:
+                self._write_paragraphs(sentences_writer, self.raw_text_paths)
+
+            subsampler = TokenSubsampler(
+                token_counts,
+                total=sentences_writer.tokens_count,
+                threshold=subsampling.threshold,
+                min_count=subsampling.min_count,
+                seed=self.seed
+            )
+            kept_tokens = set()
+            kept_windows_count = 0
+            with self._create_writer(Path(self.output_csv_path)) as output_writer:
+                for sample, tokens in CBOWSentencesWriter.read(sentences_path):
+                    tokens = subsampler.filter(tokens)
+                    if len(tokens) < self.window_size + 1:
+                        continue
+
+                    with self.stats.stage('write'):
+                        output_writer.write([tokens], sample)
+                    kept_tokens.update(tokens)
+                    kept_windows_count += len(tokens)
+        finally:
+            sentences_path.unlink(missing_ok=True)
+
+        self._state.vocabulary_report = VocabularyReport(
+            vocabulary_size=len(token_counts) if isinstance(token_counts, Counter) else None,
+            kept_vocabulary_size=len(kept_tokens),
+            windows_count=sentences_writer.tokens_count,
+            kept_windows_count=kept_windows_count
+        )
+        tqdm.write(str(self.vocabulary_report))
+
+    def get_sentences_path(self) -> Path:
+        """The temporary file of the first pass of the creation with subsampling."""
+        output_path = Path(self.output_csv_path)
+        return output_path.with_name(f'{output_path.name}.sentences.tmp')
+
+    def _create_from_segments(self, segments_path: Path) -> None:
+        """Creates the missing segments and concatenates the segments of all books into the output file."""
+        segments_path.mkdir(parents=True, exist_ok=True)
+
+        manifest_path = segments_path / 'manifest.json'
+        manifest = SegmentsManifest.load(manifest_path, self._get_segments_config())
+        # The segments made with the same parameters, including those of renamed books
+        known_segment_names = manifest.get_segment_names()
+        manifest.retain(self.raw_text_paths)
+
+        segment_counts = self._state.segment_counts
+        segment_paths = []
+        # The workers are started once for all the books
+        with self._create_executor() if self.options.parallel.num_workers > 1 else nullcontext() as executor:
+            self._state.executor = executor
+            try:
+                for raw_text_path in self.raw_text_paths:
+                    content_hash = manifest.get_hash(raw_text_path)
+                    segment_path = segments_path / manifest.get_segment_name(raw_text_path)
+                    if segment_path.name in known_segment_names and segment_path.exists():
+                        segment_counts['reused'] += 1
+                    else:
+                        # Listed before it is created, so that it is removed when it is not needed, even after a crash
+                        manifest.segment_names.add(segment_path.name)
+                        manifest.save(manifest_path)
+                        self._create_segment(raw_text_path, content_hash, segment_path)
+                        known_segment_names.add(segment_path.name)
+                        segment_counts['built'] += 1
+
+                    # Save after each book, so that the finished segments survive a crash
+                    manifest.save(manifest_path)
+                    segment_paths.append(segment_path)
+            finally:
+                self._state.executor = None
+
+        # Remove the segments of the books that are no longer in the dataset.
+        # Only the files created for the manifest are removed, not the other files in the directory.
+        for segment_name in manifest.get_unused_segment_names():
+            (segments_path / segment_name).unlink(missing_ok=True)
+            manifest.segment_names.discard(segment_name)
+            segment_counts['removed'] += 1
+        manifest.save(manifest_path)
+
+        # Write the header and append the segments, skipping their headers
+        output_path = Path(self.output_csv_path)
+        self._create_empty_output_file(output_path)
+        with output_path.open('w', encoding='UTF-8') as output_file:
+            with BufferedCsvWriter(output_file, header=CBOWCsvWriter.HEADER) as writer:
+                writer.writerows([])
+        with output_path.open('ab') as output_file:
+            for segment_path in segment_paths:
+                with segment_path.open('rb') as segment_file:
+                    segment_file.readline()
+                    shutil.copyfileobj(segment_file, output_file)
+
+    def _create_segment(self, raw_text_path: str, content_hash: str, segment_path: Path) -> None:
+        """Processes a single book into a segment with its own sample distributor."""
+        seed_hash = hashlib.sha256(f'{self.seed}:{content_hash}'.encode('UTF-8')).digest()
+        self._state.sample_distributor = self._create_sample_distributor(int.from_bytes(seed_hash[:8], 'big'))
+
+        # Write to a temporary file first, so that a crash does not leave a broken segment
+        tmp_path = segment_path.with_name(f'{segment_path.name}.tmp')
+        with self._create_writer(tmp_path) as output_writer:
+            self._write_paragraphs(output_writer, [raw_text_path])
+        os.replace(tmp_path, segment_path)
+
+    def _get_segments_config(self) -> dict:
+        """The parameters that must be the same to reuse the segments, including the processing of paragraphs."""
+        word_tokenize = self.options.word_tokenize if self.options.word_tokenize is not None else nltk_word_tokenize
+        return {
+            'window_size': self.window_size,
+            'ratios': [self.train_ratio, self.val_ratio, self.test_ratio],
+            'seed': self.seed,
+            'sent_tokenize': _get_qualified_name(self.sent_tokenize),
+            'word_tokenize': _get_qualified_name(word_tokenize),
+        }
+
+    def get_checkpoint_path(self) -> Path:
+        output_path = Path(self.output_csv_path)
+        return output_path.with_name(f'{output_path.name}.checkpoint.json')
+
+    def _get_checkpoint_config(self) -> dict:
+        """The parameters that must be the same to resume from a checkpoint."""
+        return {
+            'raw_text_paths': [str(path) for path in self.raw_text_paths],
+            'window_size': self.window_size,
+            'ratios': [self.train_ratio, self.val_ratio, self.test_ratio],
+            'seed': self.seed,
+            'output_format': self.options.output.format,
+        }
+
+    def _load_checkpoint(self) -> Optional[dict]:
+        checkpoint_path = self.get_checkpoint_path()
+        if not checkpoint_path.exists():
+            return None
+
+        with checkpoint_path.open('r', encoding='UTF-8') as fp:
+            checkpoint = json.load(fp)
+
+        if checkpoint.get('version') != self.CHECKPOINT_VERSION:
+            raise ValueError(f'Unsupported checkpoint version: {checkpoint.get("version")}')
+        if checkpoint['config'] != self._get_checkpoint_config():
+            raise ValueError(f'The checkpoint {checkpoint_path} was made with different parameters')
+
+        return checkpoint
+
+    def _save_checkpoint(self, output_writer: CBOWWriter, position: tuple[int, int], distributor_state: dict) -> None:
+        """
+        Saves the checkpoint after the paragraph at `position` has been written.
+
+        Args:
+            output_writer (CBOWWriter): The writer, it is flushed.
+            position (tuple[int, int]): The index of the input file and the index of the paragraph in the file.
+            distributor_state (dict): The state of the sample distributor after the paragraph.
+        """
+        file_index, paragraph_index = position
+        checkpoint = {
+            'version': self.CHECKPOINT_VERSION,
+            'config': self._get_checkpoint_config(),
+            'raw_text_path': str(self.raw_text_paths[file_index]),
+            'file_index': file_index,
+            'paragraph_index': paragraph_index + 1,
+            'sample_distributor': distributor_state,
+            'writer': output_writer.get_checkpoint(),
+        }
+
+        # Write to a temporary file first, so that a crash does not leave a broken checkpoint
+        checkpoint_path = self.get_checkpoint_path()
+        tmp_path = checkpoint_path.with_name(f'{checkpoint_path.name}.tmp')
+        with tmp_path.open('w', encoding='UTF-8') as fp:
+            json.dump(checkpoint, fp)
+        os.replace(tmp_path, checkpoint_path)
+
+    def _create_writer(self, output_path: Path, checkpoint: Optional[dict] = None) -> CBOWWriter:
+        output = self.options.output
+        writer_class: Type[CBOWWriter]
+        if output.format == 'csv':
+            writer_class = CBOWCsvWriter
+        elif output.format == 'parquet' and CBOWParquetWriter.is_available():
+            writer_class = CBOWParquetWriter
+        else:
+            if output.format == 'parquet':
+                warnings.warn('pyarrow is not installed, the windows are written to .npy files')
+            writer_class = CBOWNpyWriter
+
+        if checkpoint is not None:
+            return writer_class(
+                output_path,
+                window_size=self.window_size,
+                mask_token=self.MASK_TOKEN,
+                checkpoint=checkpoint
+            )
+
+        writer_kwargs = {}
+        if output.num_shards is not None:
+            writer_class = CBOWShardedCsvWriter
+            writer_kwargs = {'num_shards': output.num_shards, 'seed': self.seed}
+
+        # Check output file paths. Clears the files if they already exist
+        for file_path in writer_class.get_output_paths(output_path, **writer_kwargs):
+            self._create_empty_output_file(file_path)
+
+        return writer_class(output_path, window_size=self.window_size, mask_token=self.MASK_TOKEN, **writer_kwargs)
+
+    def _create_parallel(
+            self,
+            output_writer: CBOWWriter,
+            raw_text_paths: list[str],
+            start_position: tuple[int, int] = (0, 0)
+    ) -> None:
+        """
+        Processes paragraphs in a process pool.
+
+        Filtering and sample assignment are done here, in the reading order, so the splits
+        are the same as in the single-process run. The workers only turn texts into sentences,
+        and the batches are written in the order they were submitted. A checkpoint is made
+        after a batch is written, with the position and the sample distributor state saved
+        when the batch was submitted.
+
+        """
+        checkpoints = self.options.checkpoints
+        # Limit the number of batches in flight to keep memory bounded
+        max_pending = 2 * self.options.parallel.num_workers
+        pending: Deque[_PendingBatch] = deque()
+        checkpoints_count = 0
+
+        # The pool of the run with segments is shut down by `_create_from_segments()`
+        executor = self._state.executor
+        with nullcontext(executor) if executor is not None else self._create_executor() as executor:
+            for texts, samples, position, paragraphs_count in self._read_batches(raw_text_paths, start_position):
+                # A checkpoint after the batch that reaches the next multiple of the interval
+                save_checkpoint = False
+                if checkpoints is not None and paragraphs_count // checkpoints.interval > checkpoints_count:
+                    checkpoints_count = paragraphs_count // checkpoints.interval
+                    save_checkpoint = True
+
+                pending.append(self._submit_batch(executor, texts, samples, position, save_checkpoint))
+                while len(pending) > max_pending:
+                    self._write_batch(output_writer, pending.popleft())
+
+            while pending:
+                self._write_batch(output_writer, pending.popleft())
+
+    def _read_batches(
+            self,
+            raw_text_paths: list[str],
+            start_position: tuple[int, int]
+    ) -> Iterator[tuple[list[str], list[str], tuple[int, int], int]]:
+        """
+        Reads the paragraphs that are not filtered out and assigns their samples, see `_read_paragraphs()`.
+
+        Returns:
+            Iterator[tuple[list[str], list[str], tuple[int, int], int]]: The batches of `batch_size` texts,
+                their samples, the position of the last read paragraph and the number of the read paragraphs.
+        """
+        batch_size = self.options.parallel.batch_size
+        texts: list[str] = []
+        samples: list[str] = []
+        position = start_position
+        paragraphs_count = 0
+        for paragraphs_count, (position, text) in enumerate(self._read_paragraphs(raw_text_paths, start_position), 1):
+            if self._skip_paragraph(text):
+                continue
+
+            texts.append(text)
+            samples.append(self.sample_distributor.get_sample(len(text)))
+            if len(texts) >= batch_size:
+                yield texts, samples, position, paragraphs_count
+                texts, samples = [], []
+
+        if texts:
+            yield texts, samples, position, paragraphs_count
+
+    def _submit_batch(
+            self,
+            executor: ProcessPoolExecutor,
+            texts: list[str],
+            samples: list[str],
+            position: tuple[int, int],
+            save_checkpoint: bool
+    ) -> '_PendingBatch':
+        # Only the paragraphs that are not cached are sent to the workers
+        keys, cached_sentences = self._get_cached_sentences(texts)
+        future = executor.submit(
+            _Worker.create_sentences_batch,
+            [text for text, sentences in zip(texts, cached_sentences) if sentences is None]
+        )
+        return _PendingBatch(
+            samples=samples,
+            keys=keys,
+            cached_sentences=cached_sentences,
+            future=future,
+            position=position,
+            distributor_state=self.sample_distributor.get_state() if save_checkpoint else None
+        )
+
+    def _write_batch(self, output_writer: CBOWWriter, batch: '_PendingBatch') -> None:
+        batch_sentences, batch_stats = batch.future.result()
+        self.stats.merge(batch_stats)
+
+        created_sentences = iter(batch_sentences)
+        with self.stats.stage('write'):
+            for key, sentences, sample in zip(batch.keys, batch.cached_sentences, batch.samples):
+                if sentences is None:
+                    sentences = next(created_sentences)
+                    self._put_cached_sentences(key, sentences)
+                output_writer.write(sentences, sample)
+
+        if batch.distributor_state is not None:
+            self._save_checkpoint(output_writer, batch.position, batch.distributor_state)
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        """Creates a process pool, the workers turn texts into sentences, see `_Worker.create_sentences_batch()`."""
+        return ProcessPoolExecutor(
+            max_workers=self.options.parallel.num_workers,
+            initializer=_Worker.init,
+            initargs=(self.window_size, self.sent_tokenize, self.options.word_tokenize, self.stats.enabled)
+        )
+
+    def _read_paragraphs(
+            self,
+            raw_text_paths: list[str],
+            start_position: tuple[int, int] = (0, 0)
+    ) -> Iterator[tuple[tuple[int, int], str]]:
+        """
+        Reads the paragraphs of the input files, starting from the given position.
 
-        # Check output file path. Clears the file if it already exists
-        self._create_empty_output_file(Path(self.output_csv_path))
+        Args:
+            raw_text_paths (list[str]): The input files.
+            start_position (tuple[int, int]): The index of the input file and the index of the paragraph in the file.
 
-        # Create sentence tokenizer
-        tokenizer = nltk.data.load('tokenizers/punkt/english.pickle')
-        tokenizer = validate_type(tokenizer, PunktSentenceTokenizer)
+        Returns:
+            Iterator[tuple[tuple[int, int], str]]: The positions and the texts of the paragraphs.
+        """
+        start_file_index, start_paragraph_index = start_position
+        for file_index, raw_text_path in enumerate(raw_text_paths):
+            if file_index < start_file_index:
+                continue
 
-        def sent_tokenize(_text: str) -> list[str]:
-            return tokenizer.tokenize(_text)
+            with open_text(raw_text_path) as input_file:
+                paragraphs = enumerate(TextParagraphsReader(input_file))
+                if file_index == start_file_index and start_paragraph_index:
+                    paragraphs = itertools.islice(paragraphs, start_paragraph_index, None)
 
-        with open(self.output_csv_path, 'w', encoding='UTF-8') as output_file:
-            for raw_text_path in self.raw_text_paths:
-                with open(raw_text_path, 'r', encoding='UTF-8') as input_file:
-                    paragraph_reader = TextParagraphsReader(input_file)
+                paragraphs = self.stats.timed_iter('read', paragraphs)
+                for paragraph_index, text in tqdm(paragraphs, unit=' paragraph', desc='Processing'):
+                    self.stats.add('paragraphs')
+                    self.stats.add('chars_in', len(text))
+                    yield (file_index, paragraph_index), text
 
-                    for text in tqdm(paragraph_reader, unit=' paragraph', desc='Processing'):
-                        self._process_text(text, output_file, sent_tokenize=sent_tokenize)
+    def _create_sentences_creator(self) -> '_SentencesCreator':
+        return _SentencesCreator(self.window_size, self.sent_tokenize, self.options.word_tokenize)
 
-    def _create_sample_distributor(self) -> SampleDistributor:
+    def _create_sample_distributor(self, seed: int) -> SampleDistributor:
         return SampleDistributor(
             train_ratio=self.train_ratio,
             val_ratio=self.val_ratio,
             test_ratio=self.test_ratio,
-            seed=self.seed
+            seed=seed
         )
 
     @staticmethod
@@ -112,12 +609,6 @@ class EnglishBookCBOWDatasetCreator:
 
         file_path.write_text('')
 
-    @staticmethod
-    def _preprocess_text(text: str) -> str:
-        words = word_tokenize(text, preserve_line=True)
-        text = ' '.join(words)
-        return text.lower()
-
     def _filter_text(self, text: str) -> bool:
         # Discard text where there are no two consecutive letters
         if not re.search(r'[^\W\d]{2,}', text):
@@ -128,55 +619,218 @@ class EnglishBookCBOWDatasetCreator:
 
         return False
 
+    def _filter_near_duplicate(self, text: str) -> bool:
+        """Returns whether the text is a near-duplicate of a paragraph read before, see `near_duplicates`."""
+        if self.near_duplicates is None:
+            return False
+
+        with self.stats.stage('near_duplicates'):
+            is_duplicate = self.near_duplicates.is_duplicate(text)
+        if is_duplicate:
+            self.stats.add('near_duplicate_paragraphs')
+
+        return is_duplicate
+
+    def _skip_paragraph(self, text: str) -> bool:
+        """Returns whether the paragraph is filtered out or is a near-duplicate, before it is assigned a sample."""
+        if self._filter_text(text):
+            self.stats.add('filtered_paragraphs')
+            return True
+
+        return self._filter_near_duplicate(text)
+
     def _process_text(
             self,
             text: str,
-            output_file: TextIO,
-            sent_tokenize: Callable[[str], list[str]]
+            output_writer: CBOWWriter,
+            sentences_creator: '_SentencesCreator'
     ) -> None:
-        if self._filter_text(text):
+        if self._skip_paragraph(text):
             return
 
+        # A cached paragraph is assigned a sample as well, so the splits do not depend on the cache
         sample = self.sample_distributor.get_sample(len(text))
+        (key,), (sentences,) = self._get_cached_sentences([text])
+        if sentences is None:
+            (sentences,) = sentences_creator.create_sentences([text], stats=self.stats)
+            self._put_cached_sentences(key, sentences)
+        with self.stats.stage('write'):
+            output_writer.write(sentences, sample)
+
+    def _get_cached_sentences(
+            self,
+            texts: list[str]
+    ) -> tuple[list[Optional[bytes]], list[Optional[list[list[str]]]]]:
+        """
+        Returns the `ParagraphCache` keys of the texts and their cached sentences, `None` for the texts
+        that are not cached. The keys are `None` if there is no cache.
+        """
+        cache = self.paragraph_cache
+        if cache is None:
+            return [None] * len(texts), [None] * len(texts)
+
+        keys = [cache.get_key(text) for text in texts]
+        cached_sentences = [cache.get(key) for key in keys]
+        for sentences in cached_sentences:
+            if sentences is not None:
+                self.stats.add('paragraph_cache_hits')
+                _add_sentences_stats(self.stats, sentences)
+
+        return keys, cached_sentences
+
+    def _put_cached_sentences(self, key: Optional[bytes], sentences: list[list[str]]) -> None:
+        if key is not None and self.paragraph_cache is not None:
+            self.paragraph_cache.put(key, sentences)
+
+
+@dataclass
+class _CreationState:
+    """The state of a run of `EnglishBookCBOWDatasetCreator.create()`, used only by the main process."""
+
+    sample_distributor: SampleDistributor
+    stats: StageStats = field(default_factory=NullStageStats)
+    paragraph_cache: Optional[ParagraphCache] = None
+    near_duplicates: Optional[MinHashDeduplicator] = None
+    # The process pool shared by the books of a run with segments, see `_create_from_segments()`
+    executor: Optional[ProcessPoolExecutor] = None
+    segment_counts: Counter = field(default_factory=Counter)
+    vocabulary_report: Optional[VocabularyReport] = None
+
+
+@dataclass
+class _PendingBatch:
+    """A batch of paragraphs in the process pool, see `EnglishBookCBOWDatasetCreator._create_parallel()`."""
+
+    samples: list[str]
+    # The cache keys and the cached sentences of the paragraphs, the future has the sentences of the others
+    keys: list[Optional[bytes]]
+    cached_sentences: list[Optional[list[list[str]]]]
+    future: Future
+    # The position of the last paragraph
+    position: tuple[int, int]
+    # The sample distributor state after the batch, if a checkpoint is saved after the batch is written
+    distributor_state: Optional[dict]
+
+
+class _SentencesCreator:
+    """
+    Turns the texts of paragraphs into tokenized sentences that are long enough for a CBOW window,
+    in the main process or in a worker process.
+    """
+
+    def __init__(
+            self,
+            window_size: int,
+            sent_tokenize: Optional[Callable[[str], list[str]]] = None,
+            word_tokenize: Optional[Callable[[str], list[str]]] = None
+    ):
+        self.window_size = window_size
+        self.sent_tokenize = sent_tokenize if sent_tokenize is not None else _load_punkt_sent_tokenize()
+        self.word_tokenize = word_tokenize if word_tokenize is not None else nltk_word_tokenize
 
-        # Prepare text
-        text = prepare_english_book_text(text)
-        text = text.replace(';', '.')
-        text = text.replace(':', '.')
-        text = reconstruct_direct_speech(text, sent_tokenize=sent_tokenize)
+    def create_sentences(self, texts: list[str], stats: StageStats) -> list[list[list[str]]]:
+        """
+        Turns the texts into tokenized sentences.
 
-        # Split into sentences
-        sentences = sent_tokenize(text)
-        sentences = [self._preprocess_text(s) for s in sentences]
-
-        # Create windows
-        window_size = self.window_size
-        windows = []
-        for sentence in sentences:
-            sentence_parts = sentence.split(' ')
-            if len(sentence_parts) < window_size + 1:
-                continue
+        If `sent_tokenize` is a `SentenceSpanTokenizer`, the prepared texts are split into sentences in one batch.
+        """
+        sent_tokenize = self.sent_tokenize
+        # Counts the paragraphs by the path of `reconstruct_direct_speech`
+        direct_speech_stats = stats if stats.enabled else None
+
+        prepared_texts = []
+        for text in texts:
+            # Prepare text
+            with stats.stage('prepare'):
+                text = prepare_english_book_text(text)
+                text = text.replace(';', '.')
+                text = text.replace(':', '.')
+            # Includes the sentence tokenization of the quoted parts
+            with stats.stage('direct_speech'):
+                text = reconstruct_direct_speech(text, sent_tokenize=sent_tokenize, stats=direct_speech_stats)
+
+            prepared_texts.append(text)
 
-            for ngram in nltk.ngrams(
-                [self.MASK_TOKEN] * window_size + sentence.split(' ')
-                + [self.MASK_TOKEN] * window_size, window_size * 2 + 1
-            ):
-                windows.append(ngram)
-
-        # Create CBOW data
-        data = []
-        for window in windows:
-            target_token = window[window_size]
-            context = []
-            for i, token in enumerate(window):
-                if token == self.MASK_TOKEN or i == window_size:
+        # Split into sentences
+        with stats.stage('sent_tokenize'):
+            if isinstance(sent_tokenize, SentenceSpanTokenizer):
+                sentence_spans = sent_tokenize.tokenize_batch(prepared_texts)
+                texts_sentences = [sentence_spans.get_sentences(i) for i in range(len(sentence_spans))]
+            else:
+                texts_sentences = [sent_tokenize(text) for text in prepared_texts]
+
+        res = []
+        for sentences in texts_sentences:
+            with stats.stage('word_tokenize'):
+                sentences = [self._preprocess_text(s) for s in sentences]
+
+            text_res = []
+            for sentence in sentences:
+                tokens = sentence.split(' ')
+                if len(tokens) < self.window_size + 1:
                     continue
-                else:
-                    context.append(token)
-            data.append([' '.join(token for token in context), target_token, sample])
 
-        # Convert to dataframe
-        df = pd.DataFrame(data, columns=['context', 'target', 'split'])
-        df.to_csv(output_file, index=False, header=not self._header_printed)
+                text_res.append(tokens)
+
+            _add_sentences_stats(stats, text_res)
+            res.append(text_res)
+
+        return res
+
+    def _preprocess_text(self, text: str) -> str:
+        words = self.word_tokenize(text)
+        text = ' '.join(words)
+        return text.lower()
+
 
-        self._header_printed = True
+def _load_punkt_sent_tokenize() -> PunktSentenceSpanTokenizer:
+    # Create sentence tokenizer
+    tokenizer = nltk.data.load('tokenizers/punkt/english.pickle')
+    tokenizer = validate_type(tokenizer, PunktSentenceTokenizer)
+
+    return PunktSentenceSpanTokenizer(tokenizer)
+
+
+def _add_sentences_stats(stats: StageStats, sentences: list[list[str]]) -> None:
+    stats.add('sentences', len(sentences))
+    stats.add('windows', sum(len(tokens) for tokens in sentences))
+
+
+def _get_qualified_name(function: Optional[Callable]) -> Optional[str]:
+    """Returns the qualified name of a function or a method, or of the class of a callable object."""
+    if function is None:
+        return None
+    if not hasattr(function, '__qualname__'):
+        function = type(function)
+
+    return f'{function.__module__}.{function.__qualname__}'
+
+
+class _Worker:
+    """The state and the tasks of a worker process, see `EnglishBookCBOWDatasetCreator._create_executor()`."""
+
+    sentences_creator: Optional[_SentencesCreator] = None
+    profile: bool = False
+
+    @classmethod
+    def init(
+            cls,
+            window_size: int,
+            sent_tokenize: Optional[Callable[[str], list[str]]],
+            word_tokenize: Optional[Callable[[str], list[str]]],
+            profile: bool
+    ) -> None:
+        # The default sentence tokenizer is loaded by each worker
+        cls.sentences_creator = _SentencesCreator(window_size, sent_tokenize, word_tokenize)
+        cls.profile = profile
+
+    @classmethod
+    def create_sentences_batch(cls, texts: list[str]) -> tuple[list[list[list[str]]], dict]:
+        """Returns the sentences of the texts and the stats of the batch, see `StageStats.to_dict()`."""
+        if cls.sentences_creator is None:
+            raise ValueError('Worker process is not initialized')
+
+        # Each batch has its own stats, which are merged in the main process
+        stats = StageStats() if cls.profile else NullStageStats()
+        batch_sentences = cls.sentences_creator.create_sentences(texts, stats=stats)
+        return batch_sentences, stats.to_dict()
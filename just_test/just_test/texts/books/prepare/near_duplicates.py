@@ -0,0 +1,215 @@
+import hashlib
+import math
+import re
+import zlib
+
+from typing import Iterable
+
+import numpy as np
+
+WORD_REGEX = re.compile(r'\w+')
+
+
+class BloomFilter:
+    """
+    A set of 64-bit keys in a fixed amount of memory, with false positives but without false negatives.
+
+    The size is chosen so that the false positive rate is `error_rate` after `capacity` keys are added,
+    it grows if more keys are added, see `get_false_positive_rate()`.
+
+    Args:
+        capacity (int): The expected number of keys.
+        error_rate (float): The false positive rate at `capacity` keys. Defaults to 1e-3.
+
+    Example:
+
+    >>> bloom_filter = BloomFilter(1000)
+    >>> bloom_filter.add(np.array([1, 2, 3], dtype=np.uint64))
+    >>> bloom_filter.contains(np.array([2, 4], dtype=np.uint64)).tolist()
+    [True, False]
+
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 1e-3):
+        if capacity < 1:
+            raise ValueError('capacity < 1')
+        if not 0 < error_rate < 1:
+            raise ValueError('error_rate must be between 0 and 1')
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        # The optimal number of bits and hash functions for the capacity and the error rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = np.zeros((self.num_bits + 7) // 8, dtype=np.uint8)
+        self.count = 0
+
+        self._hash_indexes = np.arange(self.num_hashes, dtype=np.uint64)
+
+    @property
+    def memory_bytes(self) -> int:
+        return self.bits.nbytes
+
+    def _get_positions(self, keys: np.ndarray) -> np.ndarray:
+        """Returns the bit positions of the keys, an array of shape `(len(keys), num_hashes)`."""
+        # Double hashing: the positions are `h1 + i * h2`, `h2` is odd
+        h1 = keys & np.uint64(0xFFFFFFFF)
+        h2 = (keys >> np.uint64(32)) | np.uint64(1)
+        return (h1[:, None] + self._hash_indexes * h2[:, None]) % np.uint64(self.num_bits)
+
+    def add(self, keys: np.ndarray) -> None:
+        positions = self._get_positions(keys).ravel()
+        masks = np.left_shift(1, positions & np.uint64(7)).astype(np.uint8)
+        np.bitwise_or.at(self.bits, positions >> np.uint64(3), masks)
+        self.count += len(keys)
+
+    def contains(self, keys: np.ndarray) -> np.ndarray:
+        """Returns whether each key was added, an array of booleans."""
+        positions = self._get_positions(keys)
+        bits = (self.bits[positions >> np.uint64(3)] >> (positions & np.uint64(7)).astype(np.uint8)) & 1
+        return bits.all(axis=1)
+
+    def get_false_positive_rate(self) -> float:
+        """Returns the estimated false positive rate for the number of added keys."""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+
+class MinHashDeduplicator:
+    """
+    Streaming filter of near-duplicate paragraphs, based on MinHash and locality-sensitive hashing (LSH).
+
+    A paragraph is a set of word shingles, `shingle_size` consecutive lowercase words. Its MinHash signature
+    of `num_perm` values is split into bands of rows, and the paragraph is a near-duplicate if any band
+    is the same as a band of a paragraph seen before. The paragraphs with the Jaccard similarity of
+    the shingles above `threshold` are very likely near-duplicates, those below it are unlikely to be.
+    The numbers of bands and rows are chosen for `threshold`, see `get_bands_and_rows()`.
+
+    The bands of the seen paragraphs are kept in a `BloomFilter`, so the memory does not depend on the size
+    of the corpus: about `1.8 * bands` bytes per paragraph of `capacity` with the default `error_rate`,
+    allocated in the constructor.
+    A false positive of the Bloom filter removes a unique paragraph, the probability is at most
+    `bands * error_rate` at `capacity` paragraphs, and it grows when more paragraphs are seen.
+
+    Args:
+        threshold (float): The Jaccard similarity above which a paragraph is a near-duplicate. Defaults to 0.8.
+        capacity (int): The expected number of unique paragraphs. Defaults to 10 million.
+        num_perm (int): The maximum number of MinHash values. Defaults to 128.
+        shingle_size (int): Number of words in a shingle. Defaults to 3.
+        error_rate (float): The false positive rate of the Bloom filter at `capacity`. Defaults to 1e-3.
+        seed (int): Random seed of the MinHash permutations. Defaults to 1719.
+
+    Example:
+
+    >>> deduplicator = MinHashDeduplicator(threshold=0.5, capacity=1000)
+    >>> text = 'Alice was beginning to get very tired of sitting by her sister on the bank'
+    >>> deduplicator.is_duplicate(text), deduplicator.is_duplicate(text + '!')
+    (False, True)
+    >>> deduplicator.is_duplicate('So she was considering in her own mind, as well as she could')
+    False
+    >>> deduplicator.removed_count, deduplicator.removed_bytes
+    (1, 75)
+
+    """
+
+    # The MinHash permutations are `(a * x + b) % PRIME` of the 32-bit shingle hashes `x`.
+    # The prime is the largest one below 2 ** 32, so that `a * x + b` does not overflow 64 bits.
+    PRIME = np.uint64((1 << 32) - 5)
+
+    def __init__(
+            self,
+            threshold: float = 0.8,
+            capacity: int = 10_000_000,
+            num_perm: int = 128,
+            shingle_size: int = 3,
+            error_rate: float = 1e-3,
+            seed: int = 1719
+    ):
+        if not 0 < threshold < 1:
+            raise ValueError('threshold must be between 0 and 1')
+        if num_perm < 2:
+            raise ValueError('num_perm < 2')
+        if shingle_size < 1:
+            raise ValueError('shingle_size < 1')
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = self.get_bands_and_rows(threshold, num_perm)
+        self.bloom_filter = BloomFilter(capacity * self.bands, error_rate=error_rate)
+
+        rnd = np.random.default_rng(seed)
+        self._a = rnd.integers(1, self.PRIME, size=self.bands * self.rows, dtype=np.uint64)[:, None]
+        self._b = rnd.integers(0, self.PRIME, size=self.bands * self.rows, dtype=np.uint64)[:, None]
+
+        self.checked_count = 0
+        self.checked_bytes = 0
+        self.removed_count = 0
+        self.removed_bytes = 0
+
+    @staticmethod
+    def get_bands_and_rows(threshold: float, num_perm: int) -> tuple[int, int]:
+        """
+        Returns the numbers of bands and rows, `bands * rows <= num_perm`, that minimize the sum of the probabilities
+        of a false positive below `threshold` and of a false negative above it, integrated over the similarity.
+        """
+        similarities = np.linspace(0, 1, 1001)
+        below = similarities <= threshold
+
+        def get_error(bands: int, rows: int) -> float:
+            probabilities = 1 - (1 - similarities ** rows) ** bands
+            errors = np.where(below, probabilities, 1 - probabilities)
+            return float(errors.mean())
+
+        candidates = [(bands, rows) for rows in range(1, num_perm + 1) for bands in range(1, num_perm // rows + 1)]
+        return min(candidates, key=lambda item: get_error(*item))
+
+    def get_shingles(self, text: str) -> set[str]:
+        words = WORD_REGEX.findall(text.lower())
+        if len(words) <= self.shingle_size:
+            return {' '.join(words)}
+
+        return {' '.join(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1)}
+
+    def get_signature(self, shingles: Iterable[str]) -> np.ndarray:
+        """Returns the MinHash values of the shingles, an array of `bands * rows` values."""
+        hashes = np.fromiter((zlib.crc32(shingle.encode('UTF-8')) for shingle in shingles), dtype=np.uint64)
+        permuted = (self._a * hashes + self._b) % self.PRIME
+        return permuted.min(axis=1)
+
+    def get_band_keys(self, signature: np.ndarray) -> np.ndarray:
+        """Returns a 64-bit key of each band of the signature, different for the same values in different bands."""
+        keys = [
+            int.from_bytes(
+                hashlib.blake2b(signature[i * self.rows:(i + 1) * self.rows].tobytes(), digest_size=8,
+                                person=i.to_bytes(8, 'little')).digest(),
+                'little'
+            )
+            for i in range(self.bands)
+        ]
+        return np.array(keys, dtype=np.uint64)
+
+    def is_duplicate(self, text: str) -> bool:
+        """
+        Returns whether the text is a near-duplicate of a text checked before.
+        Remembers the text if it is not, and counts the removed texts otherwise.
+        """
+        size = len(text.encode('UTF-8'))
+        self.checked_count += 1
+        self.checked_bytes += size
+
+        keys = self.get_band_keys(self.get_signature(self.get_shingles(text)))
+        if self.bloom_filter.contains(keys).any():
+            self.removed_count += 1
+            self.removed_bytes += size
+            return True
+
+        self.bloom_filter.add(keys)
+        return False
+
+    def __str__(self) -> str:
+        return (
+            f'Near-duplicates: removed {self.removed_count} of {self.checked_count} paragraphs, '
+            f'{self.removed_bytes / 1e6:.2f} of {self.checked_bytes / 1e6:.2f} MB, '
+            f'bands: {self.bands}x{self.rows}, memory {self.bloom_filter.memory_bytes / 1e6:.1f} MB, '
+            f'false positive rate {self.bloom_filter.get_false_positive_rate():.1e}'
+        )
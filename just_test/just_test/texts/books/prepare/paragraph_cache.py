@@ -0,0 +1,102 @@
+import hashlib
+import sys
+
+from collections import OrderedDict
+from typing import Optional
+
+
+class ParagraphCache:
+    """
+    A bounded LRU cache of the tokenized sentences of paragraphs, keyed by a hash of the paragraph text.
+
+    Books often repeat paragraphs, such as license headers, chapter titles and tables of contents,
+    a cached paragraph is not prepared and tokenized again. The least recently used paragraphs
+    are evicted when the cache has `max_size` paragraphs. The cached sentences are shared,
+    they must not be modified.
+
+    The memory use is an estimate of the size of the cached keys, lists and strings,
+    see `get_sentences_size()`.
+
+    Args:
+        max_size (int): The maximum number of cached paragraphs.
+
+    Example:
+
+    >>> cache = ParagraphCache(max_size=2)
+    >>> key = cache.get_key('THE END')
+    >>> cache.get(key) is None
+    True
+    >>> cache.put(key, [['the', 'end']])
+    >>> cache.get(key), cache.hits, cache.misses, cache.hit_ratio
+    ([['the', 'end']], 1, 1, 0.5)
+
+    """
+
+    # The approximate size of an `OrderedDict` item: the hash table entry and the linked list node
+    ENTRY_OVERHEAD = 100
+
+    def __init__(self, max_size: int):
+        if max_size < 1:
+            raise ValueError('max_size < 1')
+
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.memory_bytes = 0
+
+        # The values are the sentences and their estimated size in bytes
+        self._items: OrderedDict[bytes, tuple[list[list[str]], int]] = OrderedDict()
+
+    @staticmethod
+    def get_key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode('UTF-8'), digest_size=16).digest()
+
+    @staticmethod
+    def get_sentences_size(sentences: list[list[str]]) -> int:
+        """Returns the estimated size of the sentences in bytes, with the lists and the strings of the tokens."""
+        size = sys.getsizeof(sentences)
+        for tokens in sentences:
+            size += sys.getsizeof(tokens) + sum(map(sys.getsizeof, tokens))
+
+        return size
+
+    def get(self, key: bytes) -> Optional[list[list[str]]]:
+        """Returns the cached sentences of the paragraph, or `None` if it is not cached, and counts the lookup."""
+        item = self._items.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._items.move_to_end(key)
+        return item[0]
+
+    def put(self, key: bytes, sentences: list[list[str]]) -> None:
+        if key in self._items:
+            self._items.move_to_end(key)
+            return
+
+        size = sys.getsizeof(key) + self.get_sentences_size(sentences) + self.ENTRY_OVERHEAD
+        self._items[key] = (sentences, size)
+        self.memory_bytes += size
+
+        while len(self._items) > self.max_size:
+            _, (_, evicted_size) = self._items.popitem(last=False)
+            self.memory_bytes -= evicted_size
+            self.evictions += 1
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __str__(self) -> str:
+        return (
+            f'Paragraph cache: {len(self)} of {self.max_size} paragraphs, {self.memory_bytes / 1e6:.1f} MB, '
+            f'hit ratio {self.hit_ratio:.1%} ({self.hits} of {self.hits + self.misses}), '
+            f'evictions: {self.evictions}'
+        )
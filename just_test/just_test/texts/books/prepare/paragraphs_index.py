@@ -0,0 +1,224 @@
+import os
+import warnings
+
+from pathlib import Path
+from typing import Iterator, Optional, Union, overload
+
+import numpy as np
+
+from just_test.texts.books.prepare.paragraphs_reader import MappedTextParagraphsReader
+
+
+class ParagraphsIndex:
+    """
+    Byte offsets and lengths of the paragraphs of a UTF-8 text file.
+
+    The paragraphs are the same as `MappedTextParagraphsReader` returns. The index is cached next to the file,
+    see `get_index_path()`, together with the size and the modification time of the file,
+    so it is rebuilt when the file changes.
+
+    Args:
+        offsets (np.ndarray): Byte offsets of the paragraphs.
+        lengths (np.ndarray): Byte lengths of the paragraphs.
+        file_size (int): The size of the indexed file.
+        file_mtime_ns (int): The modification time of the indexed file, in nanoseconds.
+
+    Example:
+
+    >>> import tempfile
+    >>> with tempfile.TemporaryDirectory() as tmp_dir:
+    ...     path = Path(tmp_dir) / 'book.txt'
+    ...     _ = path.write_text('Paragraph one.\\n\\nParagraph two.\\n', encoding='UTF-8')
+    ...     index = ParagraphsIndex.load_or_build(path)
+    ...     len(index), index.offsets.tolist(), index.lengths.tolist(), ParagraphsIndex.get_index_path(path).exists()
+    (2, [0, 16], [14, 14], True)
+
+    """
+
+    VERSION = 1
+    DTYPE = np.int64
+
+    def __init__(self, offsets: np.ndarray, lengths: np.ndarray, file_size: int, file_mtime_ns: int):
+        self.offsets = np.asarray(offsets, dtype=self.DTYPE)
+        self.lengths = np.asarray(lengths, dtype=self.DTYPE)
+        self.file_size = file_size
+        self.file_mtime_ns = file_mtime_ns
+
+    @staticmethod
+    def get_index_path(path: Union[str, Path]) -> Path:
+        path = Path(path)
+        return path.with_name(f'{path.name}.paragraphs.npz')
+
+    @classmethod
+    def build(cls, path: Union[str, Path]) -> 'ParagraphsIndex':
+        """Builds the index of the file."""
+        stat = os.stat(path)
+        with MappedTextParagraphsReader(path) as reader:
+            spans = np.array(list(reader.iter_spans()), dtype=cls.DTYPE).reshape(-1, 2)
+
+        return cls(spans[:, 0], spans[:, 1] - spans[:, 0], stat.st_size, stat.st_mtime_ns)
+
+    @classmethod
+    def load(cls, index_path: Union[str, Path]) -> 'ParagraphsIndex':
+        with np.load(index_path) as data:
+            version, file_size, file_mtime_ns = data['header'].tolist()
+            if version != cls.VERSION:
+                raise ValueError(f'Unsupported paragraphs index version: {version}')
+
+            return cls(data['offsets'], data['lengths'], file_size, file_mtime_ns)
+
+    @classmethod
+    def load_or_build(cls, path: Union[str, Path], index_path: Optional[Union[str, Path]] = None) -> 'ParagraphsIndex':
+        """
+        Loads the cached index of the file, if it is valid, or builds and caches the index.
+
+        Args:
+            path (Union[str, Path]): The path to the text file.
+            index_path (Union[str, Path]): Optional, the path to the index file.
+                Defaults to `get_index_path(path)`.
+
+        Returns:
+            ParagraphsIndex: The index of the file.
+        """
+        if index_path is None:
+            index_path = cls.get_index_path(path)
+
+        if os.path.exists(index_path):
+            try:
+                index = cls.load(index_path)
+            except (OSError, ValueError, KeyError) as e:
+                warnings.warn(f'Invalid paragraphs index {index_path}: {e}')
+            else:
+                if index.is_valid(path):
+                    return index
+
+        index = cls.build(path)
+        try:
+            index.save(index_path)
+        except OSError as e:
+            warnings.warn(f'Cannot save paragraphs index {index_path}: {e}')
+
+        return index
+
+    def is_valid(self, path: Union[str, Path]) -> bool:
+        """Checks that the file has not changed since the index was built."""
+        stat = os.stat(path)
+        return stat.st_size == self.file_size and stat.st_mtime_ns == self.file_mtime_ns
+
+    def save(self, index_path: Union[str, Path]) -> None:
+        header = np.array([self.VERSION, self.file_size, self.file_mtime_ns], dtype=self.DTYPE)
+
+        # Write to a temporary file first, so that a crash does not leave a broken index
+        tmp_path = Path(f'{index_path}.tmp')
+        with tmp_path.open('wb') as fp:
+            np.savez(fp, header=header, offsets=self.offsets, lengths=self.lengths)
+        os.replace(tmp_path, index_path)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+
+class IndexedTextParagraphsReader:
+    """
+    Random access to the paragraphs of a UTF-8 text file by their numbers.
+
+    The paragraphs are the same as `MappedTextParagraphsReader` returns, the offsets are taken
+    from the `ParagraphsIndex` of the file. A reader can be restricted to a range of paragraphs,
+    see `shard()` and slicing, the restricted readers share the memory mapping with the original one.
+    Only the original reader closes the mapping, closing a restricted reader does nothing.
+
+    This class is a Sequence-like Iterable and a context manager that closes the mapping.
+
+    Args:
+        path (Union[str, Path]): The path to the text file.
+        index (ParagraphsIndex): Optional, the index of the file. Defaults to `ParagraphsIndex.load_or_build(path)`.
+
+    Methods:
+        shard(k: int, n: int) -> IndexedTextParagraphsReader:
+            Returns a reader of the k-th of n contiguous parts of the paragraphs.
+
+        close():
+            Closes the file and the mapping, if the reader is not restricted.
+
+    Example:
+
+    >>> import tempfile
+    >>> with tempfile.TemporaryDirectory() as tmp_dir:
+    ...     path = Path(tmp_dir) / 'book.txt'
+    ...     _ = path.write_text('One.\\n\\nTwo.\\n\\nThree.\\n', encoding='UTF-8')
+    ...     with IndexedTextParagraphsReader(path) as reader:
+    ...         len(reader), reader[-1], list(reader.shard(0, 2)), list(reader[1:])
+    (3, 'Three.', ['One.'], ['Two.', 'Three.'])
+
+    """
+
+    def __init__(self, path: Union[str, Path], index: Optional[ParagraphsIndex] = None):
+        self.path = Path(path)
+        self.index = index if index is not None else ParagraphsIndex.load_or_build(path)
+        self.indices = range(len(self.index))
+
+        self._reader = MappedTextParagraphsReader(path)
+        # The restricted readers do not own the mapping of the original reader
+        self._owns_reader = True
+
+    def shard(self, k: int, n: int) -> 'IndexedTextParagraphsReader':
+        """
+        Returns a reader of the k-th of n contiguous parts of the paragraphs.
+
+        Args:
+            k (int): The number of the shard, from 0 to `n - 1`.
+            n (int): The number of shards.
+
+        Returns:
+            IndexedTextParagraphsReader: The reader of the shard.
+        """
+        if n < 1:
+            raise ValueError('n < 1')
+        if not 0 <= k < n:
+            raise ValueError(f'k must be in range [0, {n})')
+
+        size = len(self.indices)
+        return self[k * size // n:(k + 1) * size // n]
+
+    def close(self) -> None:
+        if self._owns_reader:
+            self._reader.close()
+
+    @overload
+    def __getitem__(self, item: int) -> str:
+        ...
+
+    @overload
+    def __getitem__(self, item: slice) -> 'IndexedTextParagraphsReader':
+        ...
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            res = object.__new__(IndexedTextParagraphsReader)
+            res.path = self.path
+            res.index = self.index
+            res.indices = self.indices[item]
+            res._reader = self._reader
+            res._owns_reader = False
+            return res
+
+        i = self.indices[item]
+        offset = int(self.index.offsets[i])
+        return self._reader.read_span(offset, offset + int(self.index.lengths[i]))
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __iter__(self) -> Iterator[str]:
+        read_span = self._reader.read_span
+        offsets = self.index.offsets
+        lengths = self.index.lengths
+        for i in self.indices:
+            offset = int(offsets[i])
+            yield read_span(offset, offset + int(lengths[i]))
+
+    def __enter__(self) -> 'IndexedTextParagraphsReader':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
@@ -1,8 +1,16 @@
+import asyncio
 import io
+import itertools
+import mmap
+import os
+import queue
 import re
+import threading
+import time
 
 from collections import deque
-from typing import Deque, Optional
+from pathlib import Path
+from typing import Deque, Iterable, Iterator, Optional, Union
 
 
 class TextParagraphsReader:
@@ -13,13 +21,21 @@ class TextParagraphsReader:
     Args:
         text_stream (io.TextIOBase): The input text stream to read from.
         read_chunk_size (int): The size of chunks to read from the text stream.
-            Defaults to 4 KB.
+            Defaults to 64 KB. In the adaptive mode, the initial size of chunks.
         max_chunks_in_paragraph (int): The maximum number of chunks allowed in a
-            single paragraph. Defaults to 100.
+            single paragraph. A longer paragraph is split at whitespace. Defaults to 100 chunks,
+            but no more than `DEFAULT_MAX_PARAGRAPH_SIZE` characters (400 KB): 6 chunks of the default size.
+            In the adaptive mode, a paragraph is split when it is longer than
+            `max_chunks_in_paragraph * read_chunk_size` characters.
         delimiter_regex (re.Pattern): A regular expression used to split text into
             paragraphs. Defaults to splitting on blank lines.
         offcut_delimiter_regex (re.Pattern): A regular expression used to detect
             text fragments that end in the middle of a paragraph delimiter.
+        adaptive (bool): Grow the size of chunks in the adaptive mode. Defaults to False.
+            The size is doubled while reads are fast and halved when they are slow (see `ADAPTIVE_READ_TIME`),
+            but it is kept large enough for `ADAPTIVE_PARAGRAPHS_PER_CHUNK` paragraphs of the average
+            observed length, and within `read_chunk_size` and `max_read_chunk_size`.
+        max_read_chunk_size (int): The maximum size of chunks in the adaptive mode. Defaults to 256 KB.
 
     Methods:
         read() -> str:
@@ -39,6 +55,13 @@ class TextParagraphsReader:
 
     DEFAULT_DELIMITER_REGEX = re.compile(r'\r?\n(?:\W*\n)+\s*')
     DEFAULT_OFFCUT_DELIMITER_REGEX = re.compile(r'.+\r?\n\W*$', re.DOTALL)
+    # The default size of a paragraph that is split, in characters
+    DEFAULT_MAX_PARAGRAPH_SIZE = 100 * 4 * 1024
+
+    # Adaptive mode: the target duration of a read, in seconds
+    ADAPTIVE_READ_TIME = 0.005
+    # Adaptive mode: the minimum number of paragraphs of the average length in a chunk
+    ADAPTIVE_PARAGRAPHS_PER_CHUNK = 16
 
     def __init__(
             self,
@@ -50,19 +73,26 @@ class TextParagraphsReader:
             # Regular expression for a piece of text
             # that ends in the middle of a paragraph delimiter
             offcut_delimiter_regex: Optional[re.Pattern] = DEFAULT_OFFCUT_DELIMITER_REGEX,
+            adaptive: bool = False,
+            max_read_chunk_size: Optional[int] = None,
     ):
         min_chunk_size = 15
         if read_chunk_size is None:
-            read_chunk_size = 4 * 1024
+            read_chunk_size = 64 * 1024
         elif read_chunk_size < min_chunk_size:
             raise ValueError(f'read_chunk_size < {min_chunk_size}')
 
         min_max_chunks = 1
         if max_chunks_in_paragraph is None:
-            max_chunks_in_paragraph = 100
+            max_chunks_in_paragraph = max(min_max_chunks, min(100, self.DEFAULT_MAX_PARAGRAPH_SIZE // read_chunk_size))
         elif max_chunks_in_paragraph < min_max_chunks:
             raise ValueError(f'max_chunks_in_paragraph < {min_max_chunks}')
 
+        if max_read_chunk_size is None:
+            max_read_chunk_size = max(256 * 1024, read_chunk_size)
+        elif max_read_chunk_size < read_chunk_size:
+            raise ValueError('max_read_chunk_size < read_chunk_size')
+
         self.text_stream = text_stream
         self.read_chunk_size = read_chunk_size
         self.max_chunks_in_paragraph = max_chunks_in_paragraph
@@ -70,7 +100,18 @@ class TextParagraphsReader:
         self.delimiter_regex = delimiter_regex
         self.offcut_delimiter_regex = offcut_delimiter_regex
 
+        self.adaptive = adaptive
+        self.max_read_chunk_size = max_read_chunk_size
+        self.max_paragraph_size = max_chunks_in_paragraph * read_chunk_size
+
+        # The size of the next chunk, changes in the adaptive mode
+        self.chunk_size = read_chunk_size
+        self._paragraphs_count = 0
+        self._paragraphs_size = 0
+
         self.queue: Deque[list[str]] = deque([[]])
+        # The total size of the parts of the last paragraph in the queue
+        self._tail_size = 0
         self.eof = False  # end of file
 
     def read(self) -> str:
@@ -101,7 +142,7 @@ class TextParagraphsReader:
             if self.eof:
                 text = ''
             else:
-                text = self.text_stream.read(self.read_chunk_size)
+                text = self._read_chunk()
 
             if not text:
                 self.eof = True
@@ -112,18 +153,57 @@ class TextParagraphsReader:
 
                 raise StopIteration()
 
-            parts = self.delimiter_regex.split(text)
-            for part_idx, part in enumerate(parts):
-                self._process_split_part(part, is_first=part_idx == 0)
+            self._process_text(text)
+
+    def _read_chunk(self) -> str:
+        if not self.adaptive:
+            return self.text_stream.read(self.chunk_size)
+
+        start = time.perf_counter()
+        text = self.text_stream.read(self.chunk_size)
+        self._adapt_chunk_size(time.perf_counter() - start, len(text))
+
+        return text
+
+    def _adapt_chunk_size(self, elapsed: float, size: int) -> None:
+        if size < self.chunk_size:
+            # End of the stream
+            return
+
+        chunk_size = self.chunk_size
+        if elapsed < self.ADAPTIVE_READ_TIME / 2:
+            chunk_size *= 2
+        elif elapsed > self.ADAPTIVE_READ_TIME * 2:
+            chunk_size //= 2
+
+        if self._paragraphs_count:
+            average_size = self._paragraphs_size // self._paragraphs_count
+            chunk_size = max(chunk_size, self.ADAPTIVE_PARAGRAPHS_PER_CHUNK * average_size)
+
+        self.chunk_size = min(max(chunk_size, self.read_chunk_size), self.max_read_chunk_size)
+
+    def _process_text(self, text: str) -> None:
+        parts = self.delimiter_regex.split(text)
+        for part_idx, part in enumerate(parts):
+            self._process_split_part(part, is_first=part_idx == 0)
 
     def _retrieve_paragraph(self) -> str:
         parts = self.queue.popleft()
-        for i in range(-1, -len(parts) - 1, -1):
-            parts[i] = parts[i].rstrip()
-            if parts[i]:
-                break
+        if len(parts) == 1:
+            # The paragraph is within a single chunk
+            res = parts[0].rstrip()
+        else:
+            for i in range(-1, -len(parts) - 1, -1):
+                parts[i] = parts[i].rstrip()
+                if parts[i]:
+                    break
+
+            res = ''.join(parts)
 
-        return ''.join(parts)
+        self._paragraphs_count += 1
+        self._paragraphs_size += len(res)
+
+        return res
 
     def _append_paragraph_part(self, part: str) -> None:
         if not self.queue:
@@ -132,7 +212,12 @@ class TextParagraphsReader:
         peek = self.queue[-1]
 
         # Check for the maximum number of chunks in a paragraph
-        if len(peek) >= self.max_chunks_in_paragraph:
+        if self.adaptive:
+            oversized = self._tail_size >= self.max_paragraph_size
+        else:
+            oversized = len(peek) >= self.max_chunks_in_paragraph
+
+        if oversized:
             # Find the last non-empty chunk
             idx, last = -1, peek[-1]
             for i, chunk in reversed(list(enumerate(peek))):
@@ -150,6 +235,7 @@ class TextParagraphsReader:
                 return
 
         peek.append(part)
+        self._tail_size += len(part)
 
     def _append_paragraph(self, part: str) -> None:
         if part:
@@ -158,6 +244,7 @@ class TextParagraphsReader:
             peek = []
 
         self.queue.append(peek)
+        self._tail_size = len(part)
 
     def _process_split_part(self, part: str, is_first: bool) -> None:
         if not self.queue:
@@ -200,3 +287,361 @@ class TextParagraphsReader:
             else:
                 # delimiter was not broken
                 self._append_paragraph_part(part)
+
+
+class MappedTextParagraphsReader:
+    """Utility class for reading a local UTF-8 text file and splitting it into paragraphs via `mmap`.
+
+    Gives the same paragraphs as `TextParagraphsReader` with the default delimiters, but instead of reading
+    the file in chunks, runs the delimiter regex over the memory-mapped bytes of the whole file.
+    Only the paragraphs themselves are decoded, so there are no text fragments to join across chunk boundaries.
+
+    This class is both an Iterator and Iterable, and a context manager that closes the mapping.
+
+    Differences from `TextParagraphsReader`:
+        - Long paragraphs are never split (see `max_chunks_in_paragraph`).
+        - Only `\\n` and `\\r\\n` line breaks separate paragraphs; `\\r\\n` inside paragraphs
+          is translated to `\\n`, as in text mode.
+
+    Args:
+        path (Union[str, Path]): The path to the UTF-8 text file.
+
+    Methods:
+        read() -> str:
+            Reads and returns the next paragraph. Returns an empty string if no more paragraphs are available.
+
+        read_all() -> list[str]:
+            Reads and returns all remaining paragraphs as a list.
+
+        iter_spans() -> Iterator[tuple[int, int]]:
+            Iterates over the `(start, end)` byte offsets of all paragraphs in the file, without decoding them.
+
+        close():
+            Closes the file and the mapping.
+
+    Example:
+
+    >>> import tempfile
+    >>> with tempfile.TemporaryDirectory() as tmp_dir:
+    ...     path = Path(tmp_dir) / 'book.txt'
+    ...     _ = path.write_text('Paragraph one.\\n\\n“Paragraph two.”\\n', encoding='UTF-8')
+    ...     with MappedTextParagraphsReader(path) as reader:
+    ...         list(reader.iter_spans()), reader.read_all()
+    ([(0, 14), (16, 36)], ['Paragraph one.', '“Paragraph two.”'])
+
+    """
+
+    DELIMITER_REGEX = re.compile(r'\r?\n(?:\W*\n)+')
+    # Matches a superset of `DELIMITER_REGEX` in the UTF-8 bytes:
+    # the bytes of non-ASCII characters are treated as non-word characters.
+    # The optional leading `\r` is checked separately, so that the regex starts with a literal.
+    CANDIDATE_DELIMITER_REGEX = re.compile(rb'\n(?:[^\w\n]*\n)+')
+    NON_SPACE_REGEX = re.compile(rb'[^\s\x1c-\x1f]')
+    SPACE_BYTES = frozenset(b' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f')
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+
+        self._file = self.path.open('rb')
+        if os.fstat(self._file.fileno()).st_size:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            # An empty file cannot be mapped
+            self._mmap = b''
+        self._view = memoryview(self._mmap)
+
+        self._spans = self.iter_spans()
+
+    def read(self) -> str:
+        """Reads and returns the next paragraph from the file.
+
+        Returns:
+            str: The next paragraph, or an empty string if the iterator is exhausted.
+        """
+        return next(self, '')
+
+    def read_all(self) -> list[str]:
+        """Reads and returns all remaining paragraphs from the file.
+
+        Returns:
+            list[str]: A list of the paragraphs.
+        """
+        return list(self)
+
+    def iter_spans(self) -> Iterator[tuple[int, int]]:
+        """Iterates over the `(start, end)` byte offsets of the paragraphs.
+
+        The paragraph is `read_span(start, end)`. The spans are stripped of ASCII whitespace only.
+        """
+        data = self._mmap
+        pos = 0
+        for start, end in self._iter_delimiter_spans():
+            span = self._strip_span(pos, start)
+            if span is not None:
+                yield span
+            pos = end
+
+        span = self._strip_span(pos, len(data))
+        if span is not None:
+            yield span
+
+    def read_span(self, start: int, end: int) -> str:
+        """Decodes the paragraph at the given byte offsets."""
+        text = str(self._view[start:end], 'UTF-8').strip()
+        if '\r' in text:
+            text = text.replace('\r\n', '\n')
+
+        return text
+
+    def close(self) -> None:
+        self._view.release()
+        if isinstance(self._mmap, mmap.mmap):
+            self._mmap.close()
+        self._file.close()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        return self.read_span(*next(self._spans))
+
+    def __enter__(self) -> 'MappedTextParagraphsReader':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _iter_delimiter_spans(self) -> Iterator[tuple[int, int]]:
+        data = self._mmap
+        for candidate in self.CANDIDATE_DELIMITER_REGEX.finditer(data):
+            start, end = candidate.span()
+            if start and data[start - 1] == 0x0d:
+                start -= 1
+
+            candidate_bytes = data[start:end]
+            if candidate_bytes.isascii():
+                # For ASCII bytes the candidate is the delimiter
+                yield start, end
+                continue
+
+            # The candidate starts and ends with a line break, so it is valid UTF-8.
+            # Find the delimiters in the decoded text.
+            text = str(candidate_bytes, 'UTF-8')
+            for match in self.DELIMITER_REGEX.finditer(text):
+                yield (
+                    start + len(text[:match.start()].encode('UTF-8')),
+                    start + len(text[:match.end()].encode('UTF-8'))
+                )
+
+    def _strip_span(self, start: int, end: int) -> Optional[tuple[int, int]]:
+        data = self._mmap
+        m = self.NON_SPACE_REGEX.search(data, start, end)
+        if m is None:
+            return None
+
+        start = m.start()
+        space_bytes = self.SPACE_BYTES
+        while data[end - 1] in space_bytes:
+            end -= 1
+
+        if data[start] >= 0x80 and not str(self._view[start:end], 'UTF-8').strip():
+            # Non-ASCII whitespace only
+            return None
+
+        return start, end
+
+
+class PrefetchingParagraphsReader:
+    """Reads paragraphs from another reader in a background thread.
+
+    The source reader (for example, `TextParagraphsReader` over a compressed or network stream) runs
+    in a daemon thread, which puts batches of paragraphs into a bounded queue, so reading, decompression
+    and splitting overlap with the processing of the paragraphs. The paragraphs are returned in the same order.
+    An exception raised by the source reader is re-raised by `__next__`.
+
+    This class is both an Iterator and Iterable, and a context manager that stops the thread.
+
+    Args:
+        paragraphs (Iterable[str]): The source of paragraphs.
+        batch_size (int): The number of paragraphs in a batch. Defaults to 64.
+        max_batches (int): The maximum number of batches in the queue. Defaults to 16.
+
+    Example:
+
+    >>> with PrefetchingParagraphsReader(TextParagraphsReader(io.StringIO('One.\\n\\nTwo.'))) as reader:
+    ...     list(reader)
+    ['One.', 'Two.']
+
+    """
+
+    # The marker of the end of the source
+    _END = None
+
+    def __init__(self, paragraphs: Iterable[str], batch_size: int = 64, max_batches: int = 16):
+        if batch_size < 1:
+            raise ValueError('batch_size < 1')
+        if max_batches < 1:
+            raise ValueError('max_batches < 1')
+
+        self.batch_size = batch_size
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_batches)
+        self._stop = threading.Event()
+        self._batch: Deque[str] = deque()
+        self._finished = False
+
+        self._thread = threading.Thread(target=self._produce, args=(iter(paragraphs),), daemon=True)
+        self._thread.start()
+
+    def read(self) -> str:
+        """Reads and returns the next paragraph, or an empty string if no more paragraphs are available."""
+        return next(self, '')
+
+    def read_all(self) -> list[str]:
+        """Reads and returns all remaining paragraphs as a list."""
+        return list(self)
+
+    def close(self) -> None:
+        """Stops the background thread."""
+        self._stop.set()
+        # The thread stops at the next batch: a blocked `_put()` checks the stop event,
+        # and the drained queue has a free slot for the end marker
+        try:
+            while True:
+                self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            self._queue.put_nowait(self._END)
+        except queue.Full:
+            pass
+        self._thread.join()
+
+        self._finished = True
+        self._batch.clear()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        while not self._batch:
+            if self._finished:
+                raise StopIteration()
+
+            item = self._queue.get()
+            if item is self._END:
+                self._finished = True
+            elif isinstance(item, BaseException):
+                self._finished = True
+                raise item
+            else:
+                self._batch.extend(item)
+
+        return self._batch.popleft()
+
+    def __enter__(self) -> 'PrefetchingParagraphsReader':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _produce(self, paragraphs: Iterator[str]) -> None:
+        try:
+            while not self._stop.is_set():
+                batch = list(itertools.islice(paragraphs, self.batch_size))
+                if not batch:
+                    break
+
+                self._put(batch)
+
+            self._put(self._END)
+
+        except BaseException as e:
+            self._put(e)
+
+    def _put(self, item) -> None:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+
+class AsyncTextParagraphsReader:
+    """Reads a text stream and splits it into paragraphs for `async for`.
+
+    The paragraphs are the same as `TextParagraphsReader` with the same arguments returns.
+    The blocking reading and splitting of batches of paragraphs run in the default executor
+    of the event loop, so the loop is not blocked by slow or compressed streams.
+    The next batch is read ahead while the current one is consumed.
+
+    This class is both an AsyncIterator and AsyncIterable.
+
+    Args:
+        text_stream (io.TextIOBase): The input text stream to read from.
+        batch_size (int): The number of paragraphs read in the executor at once. Defaults to 64.
+        **kwargs: Other arguments of `TextParagraphsReader`.
+
+    Example:
+
+    >>> import asyncio
+    >>> async def read_all(text):
+    ...     return [paragraph async for paragraph in AsyncTextParagraphsReader(io.StringIO(text))]
+    >>> asyncio.run(read_all('One.\\n\\nTwo.'))
+    ['One.', 'Two.']
+
+    """
+
+    def __init__(self, text_stream: io.TextIOBase, batch_size: int = 64, **kwargs):
+        if batch_size < 1:
+            raise ValueError('batch_size < 1')
+
+        self.batch_size = batch_size
+        self.reader = TextParagraphsReader(text_stream, **kwargs)
+
+        self._batch: Deque[str] = deque()
+        self._finished = False
+        # The batch being read ahead in the executor
+        self._next_batch: Optional[asyncio.Future] = None
+
+    async def read(self) -> str:
+        """Reads and returns the next paragraph, or an empty string if no more paragraphs are available."""
+        try:
+            return await self.__anext__()
+        except StopAsyncIteration:
+            return ''
+
+    async def read_all(self) -> list[str]:
+        """Reads and returns all remaining paragraphs as a list."""
+        return [paragraph async for paragraph in self]
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> str:
+        if not self._batch:
+            if self._finished:
+                raise StopAsyncIteration()
+
+            if self._next_batch is None:
+                self._next_batch = self._start_read_batch()
+            batch = await self._next_batch
+            self._next_batch = None
+            if len(batch) < self.batch_size:
+                self._finished = True
+            else:
+                # Read the next batch while this one is consumed
+                self._next_batch = self._start_read_batch()
+            if not batch:
+                raise StopAsyncIteration()
+
+            self._batch.extend(batch)
+
+        return self._batch.popleft()
+
+    def _start_read_batch(self) -> asyncio.Future:
+        return asyncio.get_running_loop().run_in_executor(None, self._read_batch)
+
+    def _read_batch(self) -> list[str]:
+        return list(itertools.islice(self.reader, self.batch_size))
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+import warnings
+
+from pathlib import Path
+from typing import Optional, Union
+
+
+class SegmentsManifest:
+    """
+    Content hashes of the input books and the names of their output segments.
+
+    A segment is the output of a single book, named by the content hash of the book, so a book that has not
+    changed is not processed again, even if it is moved or renamed. The manifest also records the size
+    and the modification time of each book, so the hash of an unchanged file is not recomputed.
+    The segments are valid only for the parameters they were created with, see `config`.
+
+    The manifest also lists the names of all the segment files that were created in its directory,
+    see `segment_names`, including the segments of other parameters, so only these files are removed
+    when they are no longer needed, see `get_unused_segment_names()`.
+
+    Args:
+        config (dict): The parameters of the dataset that affect the segments.
+        books (dict): Optional, the records of the books by their paths:
+            `{'sha256': str, 'size': int, 'mtime_ns': int}`.
+        segment_names (set[str]): Optional, the names of the created segment files.
+
+    Example:
+
+    >>> import tempfile
+    >>> with tempfile.TemporaryDirectory() as tmp_dir:
+    ...     path = Path(tmp_dir) / 'book.txt'
+    ...     _ = path.write_text('Alice', encoding='UTF-8')
+    ...     manifest = SegmentsManifest({'window_size': 5})
+    ...     segment_name = manifest.get_segment_name(path)
+    ...     manifest.save(Path(tmp_dir) / 'manifest.json')
+    ...     loaded = SegmentsManifest.load(Path(tmp_dir) / 'manifest.json', {'window_size': 5})
+    ...     segment_name, loaded.get_segment_name(path) == segment_name
+    ('3bc51062973c458d5a6f2d8d64a023246354ad7e064b1e4e009ec8a0699a3043.csv', True)
+
+    """
+
+    VERSION = 1
+    HASH_BUFFER_SIZE = 1024 * 1024
+
+    def __init__(self, config: dict, books: Optional[dict[str, dict]] = None, segment_names: Optional[set[str]] = None):
+        self.config = config
+        self.books = books if books is not None else {}
+        self.segment_names = segment_names if segment_names is not None else set()
+
+    @classmethod
+    def load(cls, manifest_path: Union[str, Path], config: dict) -> 'SegmentsManifest':
+        """
+        Loads the manifest. Returns an empty manifest if there is no manifest file or it is invalid.
+        The manifest created with a different `config` keeps only the names of the created segment files.
+        """
+        if not os.path.exists(manifest_path):
+            return cls(config)
+
+        try:
+            with open(manifest_path, 'r', encoding='UTF-8') as fp:
+                data = json.load(fp)
+            if data['version'] != cls.VERSION:
+                raise ValueError(f'Unsupported manifest version: {data["version"]}')
+            segment_names = set(data['segments'])
+        except (OSError, ValueError, KeyError) as e:
+            warnings.warn(f'Invalid segments manifest {manifest_path}: {e}')
+            return cls(config)
+
+        if data['config'] != config:
+            return cls(config, segment_names=segment_names)
+
+        return cls(config, data['books'], segment_names)
+
+    def save(self, manifest_path: Union[str, Path]) -> None:
+        data = {
+            'version': self.VERSION,
+            'config': self.config,
+            'books': self.books,
+            'segments': sorted(self.segment_names),
+        }
+
+        # Write to a temporary file first, so that a crash does not leave a broken manifest
+        tmp_path = Path(f'{manifest_path}.tmp')
+        with tmp_path.open('w', encoding='UTF-8') as fp:
+            json.dump(data, fp, indent=1)
+        os.replace(tmp_path, manifest_path)
+
+    def get_hash(self, path: Union[str, Path]) -> str:
+        """Returns the SHA-256 of the file content, hashing the file only if it has changed since the last call."""
+        stat = os.stat(path)
+        record = self.books.get(str(path))
+        if record is not None and record['size'] == stat.st_size and record['mtime_ns'] == stat.st_mtime_ns:
+            return record['sha256']
+
+        with open(path, 'rb', buffering=self.HASH_BUFFER_SIZE) as fp:
+            content_hash = hashlib.file_digest(fp, 'sha256').hexdigest()
+
+        self.books[str(path)] = {'sha256': content_hash, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        return content_hash
+
+    def get_segment_name(self, path: Union[str, Path]) -> str:
+        return f'{self.get_hash(path)}.csv'
+
+    def get_segment_names(self) -> set[str]:
+        """Returns the names of the segments of all known books."""
+        return {f'{record["sha256"]}.csv' for record in self.books.values()}
+
+    def get_unused_segment_names(self) -> set[str]:
+        """Returns the names of the created segment files that are not the segments of the known books."""
+        return self.segment_names - self.get_segment_names()
+
+    def retain(self, paths: list[Union[str, Path]]) -> None:
+        """Forgets the books that are not in `paths`."""
+        keep = {str(path) for path in paths}
+        self.books = {path: record for path, record in self.books.items() if path in keep}
@@ -1,5 +1,7 @@
 import re
 
+from typing import Iterable, Iterator, Optional, Sequence
+
 # Matches the sentence boundary, based on punctuation marks
 SENTENCE_BOUNDARY_REGEX = re.compile(r'\w[^\s\w]*([?!.]+[^\s\w,]*)\s+\S')
 
@@ -24,16 +26,197 @@ def simple_sent_tokenize(text: str) -> list[str]:
     ['Hello world!', 'How are you?', "I'm fine."]
 
     """
-    res = []
+    return [text[start:end] for start, end in simple_sent_spans(text)]
+
+
+def simple_sent_spans(text: str) -> Iterator[tuple[int, int]]:
+    """
+    Lazily returns the `(start, end)` offsets of the sentences of `simple_sent_tokenize`,
+    without copying the sentences.
+
+    Args:
+        text (str): The input text to be processed.
+
+    Returns:
+        Iterator[tuple[int, int]]: The offsets of the sentences in the text.
+
+    Example:
+
+    >>> text = "Hello world! How are you? "
+    >>> [(start, end, text[start:end]) for start, end in simple_sent_spans(text)]
+    [(0, 12, 'Hello world!'), (13, 26, 'How are you? ')]
+
+    """
     pos = 0
     for m in SENTENCE_BOUNDARY_REGEX.finditer(text):
         _, to_pos = m.regs[1]
-        sentence = text[pos:to_pos].strip()
-        res.append(sentence)
+        yield strip_span(text, pos, to_pos)
         pos = to_pos
 
-    sentence = text[pos:].lstrip()
-    if sentence:
-        res.append(sentence)
+    # As `str.lstrip()`, the trailing whitespace of the last sentence is kept
+    start, _ = strip_span(text, pos, len(text))
+    if start < len(text):
+        yield start, len(text)
+
+
+def strip_span(text: str, start: int, end: int) -> tuple[int, int]:
+    """
+    Narrows the `text[start:end]` span as `str.strip()` does, without copying the text.
+
+    Example:
+
+    >>> strip_span(' One. ', 0, 6)
+    (1, 5)
+
+    """
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+
+    return start, end
+
+
+def count_sentences(text: str, limit: Optional[int] = 2) -> int:
+    """
+    Counts the sentences of `simple_sent_tokenize`, stopping as soon as `limit` sentences are found.
+
+    Args:
+        text (str): The input text to be processed.
+        limit (int): Optional, the maximum number of sentences to count. Defaults to 2, enough to tell
+            a single sentence from several. With `None`, all sentences are counted.
+
+    Returns:
+        int: The number of sentences, at most `limit`.
+
+    Example:
+
+    >>> text = "Hello world! How are you? I'm fine."
+    >>> count_sentences(text), count_sentences(text, limit=1), count_sentences(text, limit=None)
+    (2, 1, 3)
+
+    """
+    if limit is not None and limit < 1:
+        return 0
+    if not text or text.isspace():
+        return 0
+
+    # Each boundary ends a sentence and is followed by another one
+    count = 1
+    if count == limit:
+        return count
+
+    for _ in SENTENCE_BOUNDARY_REGEX.finditer(text):
+        count += 1
+        if count == limit:
+            break
+
+    return count
+
+
+class SentenceSpans:
+    """
+    Sentence spans of a batch of texts, the result of `SentenceSpanTokenizer.tokenize_batch()`.
+
+    The spans of all texts are stored in one list, the spans of the text `i` are
+    `spans[bounds[i]:bounds[i + 1]]`. A span is the `(start, end)` offsets of a sentence in its text,
+    the sentence strings are created only on request, see `get_sentences()`.
+
+    Args:
+        texts (Sequence[str]): The texts.
+        spans (list[tuple[int, int]]): The spans of the sentences of all texts.
+        bounds (list[int]): The indices of the first span of each text in `spans`, and the number of spans.
+    """
+
+    def __init__(self, texts: Sequence[str], spans: list[tuple[int, int]], bounds: list[int]):
+        self.texts = texts
+        self.spans = spans
+        self.bounds = bounds
+
+    def get_spans(self, i: int) -> list[tuple[int, int]]:
+        return self.spans[self.bounds[i]:self.bounds[i + 1]]
+
+    def get_sentences(self, i: int) -> list[str]:
+        text = self.texts[i]
+        return [text[start:end] for start, end in self.get_spans(i)]
+
+    def count(self, i: int) -> int:
+        """Returns the number of sentences of the text `i`."""
+        return self.bounds[i + 1] - self.bounds[i]
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+
+class SentenceSpanTokenizer:
+    """
+    Base class for the sentence tokenizers that return the offsets of the sentences.
+
+    A tokenizer is a callable with the same result as the `sent_tokenize` functions, so it can be passed
+    wherever they are used. Subclasses implement `span_tokenize()`.
+
+    Methods:
+        span_tokenize(text: str) -> Iterable[tuple[int, int]]:
+            Returns the `(start, end)` offsets of the sentences of the text.
+
+        tokenize_batch(texts: Sequence[str]) -> SentenceSpans:
+            Returns the sentence spans of many texts at once.
+    """
+
+    def span_tokenize(self, text: str) -> Iterable[tuple[int, int]]:
+        raise NotImplementedError
+
+    def tokenize(self, text: str) -> list[str]:
+        return [text[start:end] for start, end in self.span_tokenize(text)]
+
+    def tokenize_batch(self, texts: Sequence[str]) -> SentenceSpans:
+        span_tokenize = self.span_tokenize
+        spans: list[tuple[int, int]] = []
+        bounds = [0]
+        for text in texts:
+            spans.extend(span_tokenize(text))
+            bounds.append(len(spans))
+
+        return SentenceSpans(texts, spans, bounds)
+
+    def __call__(self, text: str) -> list[str]:
+        return self.tokenize(text)
+
+
+class SimpleSentenceSpanTokenizer(SentenceSpanTokenizer):
+    """
+    The spans of the sentences of `simple_sent_tokenize`.
+
+    Example:
+
+    >>> tokenizer = SimpleSentenceSpanTokenizer()
+    >>> batch = tokenizer.tokenize_batch(["Hello world! How are you?", "I'm fine."])
+    >>> batch.get_spans(0), batch.get_sentences(1)
+    ([(0, 12), (13, 25)], ["I'm fine."])
+
+    """
+
+    def span_tokenize(self, text: str) -> Iterator[tuple[int, int]]:
+        return simple_sent_spans(text)
+
+
+class PunktSentenceSpanTokenizer(SentenceSpanTokenizer):
+    """
+    The spans of the sentences of the Punkt tokenizer, see `nltk.tokenize.punkt.PunktSentenceTokenizer.span_tokenize`.
+
+    Args:
+        tokenizer (PunktSentenceTokenizer): Optional, the Punkt tokenizer. Defaults to the Punkt English model,
+            which is loaded on the first use.
+    """
+
+    def __init__(self, tokenizer=None):
+        self.tokenizer = tokenizer
+
+    def span_tokenize(self, text: str) -> Iterable[tuple[int, int]]:
+        if self.tokenizer is None:
+            # nltk is imported only when it is needed
+            import nltk
+            self.tokenizer = nltk.data.load('tokenizers/punkt/english.pickle')
+
+        return self.tokenizer.span_tokenize(text)
 
-    return res
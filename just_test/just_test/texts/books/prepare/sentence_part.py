@@ -2,7 +2,7 @@ import re
 
 from typing import Callable, Optional
 
-from just_test.texts.books.prepare.sent_tokenize import simple_sent_tokenize
+from just_test.texts.books.prepare.sent_tokenize import count_sentences, simple_sent_tokenize
 
 # Matches sentences that end with a period, question mark,
 # or exclamation mark, possibly followed by whitespace.
@@ -13,6 +13,32 @@ END_SENTENCE_REGEX = re.compile(r'.+[.?!]\W*$', re.DOTALL)
 LAST_PUNCTUATION_REPLACEMENT_REGEX = re.compile(r'(\w)([!,.:;?]?)(\W*)$')
 
 
+def is_opened(text: str) -> bool:
+    """Checks if the sentence is opened (does not end with . ? ! punctuation marks)."""
+    return END_SENTENCE_REGEX.match(text) is None
+
+
+def capitalize_text(text: str) -> str:
+    """Capitalizes the first letter of the text if it is not already uppercase."""
+    if text and not text[0].isupper():
+        return text[0].upper() + text[1:]
+    else:
+        return text
+
+
+def replace_punct(text: str, punct: str) -> str:
+    """Replace (or add if not present) the last punctuation in the text."""
+    return LAST_PUNCTUATION_REPLACEMENT_REGEX.sub(rf'\g<1>{punct}\g<3>', text)
+
+
+def close_text(text: str) -> str:
+    """Closes the sentence by adding a period if it is not already closed."""
+    if is_opened(text):
+        return replace_punct(text, '.')
+    else:
+        return text
+
+
 class SentencePart:
     """
     Represents a part of a sentence with associated properties and methods for manipulation.
@@ -24,7 +50,18 @@ class SentencePart:
         sent_tokenize (Callable[[str], list[str]]): A callable function for tokenizing the text into sentences.
             By default, a less-than-precise regular expression-based function is used that treats abbreviations
             as the end of a sentence. Instead of the default value, use any model-based function.
+
+    The sentences of the text and the `opened`, `punct` and `is_multi_sentence` properties are calculated
+    on first access and cached until the text changes.
+
+    A long text is split into many short-lived parts, so the instances are kept compact with `__slots__`.
+    All parts of a text refer to the same tokenizer callable.
     """
+
+    __slots__ = (
+        '_text', 'direct', '_quoted_text', '_sent_tokenize', '_sentences', '_opened', '_punct', '_multi_sentence'
+    )
+
     def __init__(
             self,
             text: str,
@@ -33,11 +70,27 @@ class SentencePart:
             quoted_text: Optional[str] = None,
             sent_tokenize: Callable[[str], list[str]] =simple_sent_tokenize
     ):
-        self.text = text
+        self._text = text
         self.direct = direct
         self._sent_tokenize = sent_tokenize
         self._quoted_text = quoted_text
 
+        # Cache, see `_clear_cache()`
+        self._sentences: Optional[list[str]] = None
+        self._opened: Optional[bool] = None
+        self._punct: Optional[str] = None
+        self._multi_sentence: Optional[bool] = None
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    @text.setter
+    def text(self, value: str) -> None:
+        if value != self._text:
+            self._text = value
+            self._clear_cache()
+
     @property
     def quoted_text(self) -> str:
         return self._quoted_text or self.text
@@ -45,26 +98,41 @@ class SentencePart:
     @property
     def opened(self) -> bool:
         """Checks if the sentence is opened (does not end with . ? ! punctuation marks)."""
-        return END_SENTENCE_REGEX.match(self.text) is None
+        if self._opened is None:
+            self._opened = is_opened(self.text)
+
+        return self._opened
 
     @property
     def is_multi_sentence(self) -> bool:
-        """Determines if the text contains multiple sentences."""
-        return len(self._sent_tokenize(self.text)) > 1
+        """
+        Determines if the text contains multiple sentences.
+
+        With the default tokenizer, the sentences are only counted up to two, see `count_sentences`.
+        """
+        if self._multi_sentence is None:
+            if self._sentences is None and self._sent_tokenize is simple_sent_tokenize:
+                self._multi_sentence = count_sentences(self.text, limit=2) > 1
+            else:
+                self._multi_sentence = len(self._get_sentences()) > 1
+
+        return self._multi_sentence
 
     @property
     def punct(self) -> str:
         """Retrieves the trailing punctuation from the text, if any."""
-        m = LAST_PUNCTUATION_REPLACEMENT_REGEX.search(self.text)
-        if m:
-            return m.group(2)
-        else:
-            return ''
+        if self._punct is None:
+            m = LAST_PUNCTUATION_REPLACEMENT_REGEX.search(self.text)
+            if m:
+                self._punct = m.group(2)
+            else:
+                self._punct = ''
+
+        return self._punct
 
     def capitalize(self) -> None:
         """Capitalizes the first letter of the text if it is not already uppercase."""
-        if self.text and not self.text[0].isupper():
-            self.text = self.text[0].upper() + self.text[1:]
+        self.text = capitalize_text(self.text)
 
     def close(self) -> None:
         """Closes the sentence by adding a period if it is not already closed."""
@@ -73,7 +141,7 @@ class SentencePart:
 
     def replace_punct(self, punct: str) -> None:
         """Replace (or add if not present) the last punctuation in the text."""
-        self.text = LAST_PUNCTUATION_REPLACEMENT_REGEX.sub(rf'\g<1>{punct}\g<3>', self.text)
+        self.text = replace_punct(self.text, punct)
 
     def clear_punct(self) -> None:
         """Removes trailing punctuation from the text."""
@@ -81,7 +149,7 @@ class SentencePart:
 
     def sent_tokenize(self) -> list['SentencePart']:
         res = []
-        for text in self._sent_tokenize(self.text):
+        for text in self._get_sentences():
             res.append(SentencePart(
                 text,
                 direct=self.direct,
@@ -90,6 +158,18 @@ class SentencePart:
 
         return res
 
+    def _get_sentences(self) -> list[str]:
+        if self._sentences is None:
+            self._sentences = self._sent_tokenize(self.text)
+
+        return self._sentences
+
+    def _clear_cache(self) -> None:
+        self._sentences = None
+        self._opened = None
+        self._punct = None
+        self._multi_sentence = None
+
     def __str__(self) -> str:
         return repr(self)
 
@@ -0,0 +1,196 @@
+import hashlib
+import math
+import random
+
+from dataclasses import dataclass
+from typing import Iterable, Mapping, Optional, Union
+
+import numpy as np
+
+
+class CountMinSketch:
+    """
+    Approximate token counts in a fixed amount of memory.
+
+    The counts are kept in `depth` rows of `width` counters, a token is counted in one counter
+    of each row, chosen by a hash of the token. The estimate is the minimum of the counters of the token,
+    it is never less than the exact count and exceeds it by at most `e * total / width`
+    with probability `1 - exp(-depth)`.
+
+    The hashes do not depend on the Python hash seed, so the estimates are the same in every run.
+    The interface is a subset of `collections.Counter`, so either can be used to count tokens.
+
+    Args:
+        width (int): Number of counters in a row.
+        depth (int): Number of rows. Defaults to 4.
+
+    Example:
+
+    >>> sketch = CountMinSketch(1024)
+    >>> sketch.update(['the', 'cat', 'and', 'the', 'hat'])
+    >>> sketch['the'], sketch['cat'], sketch['dog'], sketch.total()
+    (2, 1, 0, 5)
+
+    """
+
+    DTYPE = np.int64
+
+    def __init__(self, width: int, depth: int = 4):
+        if width < 1:
+            raise ValueError('width < 1')
+        if depth < 1:
+            raise ValueError('depth < 1')
+
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=self.DTYPE)
+
+        self._rows = np.arange(depth, dtype=np.uint64)[:, None]
+        self._total = 0
+
+    def _get_columns(self, tokens: list[str]) -> np.ndarray:
+        """Returns the counter index of each token in each row, an array of shape `(depth, len(tokens))`."""
+        hashes = np.array(
+            [
+                int.from_bytes(hashlib.blake2b(token.encode('UTF-8'), digest_size=8).digest(), 'little')
+                for token in tokens
+            ],
+            dtype=np.uint64
+        )
+
+        # Double hashing: the row hashes are `h1 + i * h2`, `h2` is odd
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        return ((h1 + self._rows * h2) % np.uint64(self.width)).astype(np.intp)
+
+    def update(self, tokens: Iterable[str]) -> None:
+        tokens = list(tokens)
+        if not tokens:
+            return
+
+        columns = self._get_columns(tokens)
+        rows = np.broadcast_to(np.arange(self.depth)[:, None], columns.shape)
+        np.add.at(self.table, (rows, columns), 1)
+        self._total += len(tokens)
+
+    def total(self) -> int:
+        return self._total
+
+    def __getitem__(self, token: str) -> int:
+        columns = self._get_columns([token])[:, 0]
+        return int(self.table[np.arange(self.depth), columns].min())
+
+
+class TokenSubsampler:
+    """
+    Removes rare and frequent tokens from sentences, as word2vec does before creating the windows.
+
+    Tokens seen less than `min_count` times are always removed. A token with the frequency `f`
+    (its count divided by the total count) is kept with the probability `(sqrt(f / t) + 1) * t / f`,
+    where `t` is the `threshold`, so the tokens with `f` much greater than `t` are mostly removed,
+    and those with `f` below about `2.6 * t` are always kept.
+
+    Args:
+        counts (Union[Mapping[str, int], CountMinSketch]): The token counts, `collections.Counter` or
+            `CountMinSketch`.
+        total (int): The total count of the tokens.
+        threshold (float): Optional, the subsampling threshold, word2vec uses 1e-3 to 1e-5.
+            By default, only `min_count` is applied.
+        min_count (int): The minimum count of a kept token. Defaults to 1.
+        seed (int): Random seed for reproducibility. Defaults to 1719.
+
+    Example:
+
+    >>> subsampler = TokenSubsampler({'the': 6, 'cat': 2, 'hat': 1}, total=9, threshold=0.1, min_count=2)
+    >>> round(subsampler.get_keep_probability('the'), 3), subsampler.get_keep_probability('cat')
+    (0.537, 1.0)
+    >>> 'hat' in subsampler.filter(['the', 'cat', 'hat'])
+    False
+
+    """
+
+    def __init__(
+            self,
+            counts: Union[Mapping[str, int], CountMinSketch],
+            total: int,
+            threshold: Optional[float] = None,
+            min_count: int = 1,
+            seed: int = 1719
+    ):
+        if threshold is not None and threshold <= 0:
+            raise ValueError('threshold <= 0')
+        if min_count < 1:
+            raise ValueError('min_count < 1')
+
+        self.counts = counts
+        self.total = total
+        self.threshold = threshold
+        self.min_count = min_count
+        self.rnd = random.Random(seed)
+
+        # The probabilities are computed once per token
+        self._keep_probabilities: dict[str, float] = {}
+
+    def get_keep_probability(self, token: str) -> float:
+        probability = self._keep_probabilities.get(token)
+        if probability is not None:
+            return probability
+
+        count = self.counts[token]
+        if count < self.min_count:
+            probability = 0.0
+        elif self.threshold is None:
+            probability = 1.0
+        else:
+            ratio = self.threshold * self.total / count
+            probability = min((math.sqrt(1 / ratio) + 1) * ratio, 1.0)
+
+        self._keep_probabilities[token] = probability
+        return probability
+
+    def filter(self, tokens: Iterable[str]) -> list[str]:
+        """Returns the kept tokens."""
+        get_keep_probability = self.get_keep_probability
+        rnd_random = self.rnd.random
+
+        res = []
+        for token in tokens:
+            probability = get_keep_probability(token)
+            if probability >= 1.0 or (probability > 0.0 and rnd_random() < probability):
+                res.append(token)
+
+        return res
+
+
+@dataclass
+class VocabularyReport:
+    """
+    The vocabulary and the output size of a run with subsampling.
+
+    Attributes:
+        vocabulary_size (Optional[int]): Number of distinct tokens, `None` if the tokens were counted
+            with `CountMinSketch`.
+        kept_vocabulary_size (int): Number of distinct tokens in the output.
+        windows_count (int): Number of windows without subsampling.
+        kept_windows_count (int): Number of written windows.
+    """
+
+    vocabulary_size: Optional[int]
+    kept_vocabulary_size: int
+    windows_count: int
+    kept_windows_count: int
+
+    @property
+    def reduction(self) -> float:
+        """The ratio of the output size without subsampling to the written output size."""
+        if not self.kept_windows_count:
+            return math.inf if self.windows_count else 1.0
+
+        return self.windows_count / self.kept_windows_count
+
+    def __str__(self) -> str:
+        vocabulary_size = '?' if self.vocabulary_size is None else self.vocabulary_size
+        return (
+            f'Vocabulary: {self.kept_vocabulary_size} of {vocabulary_size} tokens, '
+            f'windows: {self.kept_windows_count} of {self.windows_count} ({self.reduction:.2f}x smaller)'
+        )
@@ -0,0 +1,60 @@
+from pathlib import Path
+from typing import Iterable, Union
+
+
+class Vocabulary:
+    """
+    Maps tokens to integer ids in the order in which the tokens are first seen.
+
+    Args:
+        tokens (Iterable[str]): Optional, the initial tokens. Usually the first one is the padding
+            token, so that it gets id 0.
+
+    Example:
+
+    >>> vocabulary = Vocabulary(['<MASK>'])
+    >>> vocabulary.encode(['the', 'cat', 'and', 'the', 'hat'])
+    [1, 2, 3, 1, 4]
+    >>> len(vocabulary), vocabulary.tokens[2]
+    (5, 'cat')
+
+    """
+
+    def __init__(self, tokens: Iterable[str] = ()):
+        self.tokens: list[str] = []
+        self.ids: dict[str, int] = {}
+        for token in tokens:
+            self.add(token)
+
+    def add(self, token: str) -> int:
+        """Returns the id of the token, adding the token if it is new."""
+        token_id = self.ids.get(token)
+        if token_id is None:
+            token_id = len(self.tokens)
+            self.ids[token] = token_id
+            self.tokens.append(token)
+
+        return token_id
+
+    def encode(self, tokens: Iterable[str]) -> list[int]:
+        """Returns the ids of the tokens, adding the new ones."""
+        ids = self.ids
+        return [ids[token] if token in ids else self.add(token) for token in tokens]
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Saves the tokens one per line, the line number is the token id."""
+        with open(path, 'w', encoding='UTF-8') as fp:
+            for token in self.tokens:
+                fp.write(token)
+                fp.write('\n')
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'Vocabulary':
+        with open(path, 'r', encoding='UTF-8', newline='\n') as fp:
+            return cls(line.removesuffix('\n') for line in fp)
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def __contains__(self, token: str) -> bool:
+        return token in self.ids
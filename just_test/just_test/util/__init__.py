@@ -1,7 +1,23 @@
-from . import ml
-from . import validate
+from typing import TYPE_CHECKING
+
+from just_test._lazy import lazy_submodules
+
+if TYPE_CHECKING:
+    from . import csv_writer
+    from . import ml
+    from . import npy_writer
+    from . import stage_stats
+    from . import text_files
+    from . import validate
 
 __all__ = [
+    "csv_writer",
     "ml",
+    "npy_writer",
+    "stage_stats",
+    "text_files",
     "validate",
 ]
+
+# The submodules are imported on the first access
+__getattr__, __dir__ = lazy_submodules(__name__, __all__)
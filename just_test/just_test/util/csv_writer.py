@@ -0,0 +1,91 @@
+import csv
+import io
+import os
+
+from typing import Iterable, Optional, Sequence, TextIO
+
+
+class BufferedCsvWriter:
+    """
+    Writes CSV rows to a text stream in large blocks.
+
+    Rows are formatted into an in-memory buffer, which is written to the stream
+    when it grows beyond `buffer_size` characters, and on `flush()` and `close()`.
+    The quoting is the same as in `pandas.DataFrame.to_csv` with the default
+    parameters: fields are quoted only when needed, quotes are doubled,
+    and lines end with `os.linesep`.
+
+    The header, if given, is written together with the first rows, even if there are none.
+
+    Args:
+        stream (TextIO): The output text stream.
+        header (Sequence[str]): Optional, the column names.
+        buffer_size (int): The buffer size in characters. Defaults to 1 MB.
+
+    Example:
+
+    >>> stream = io.StringIO()
+    >>> with BufferedCsvWriter(stream, header=['context', 'target']) as writer:
+    ...     writer.writerows([['a b', 'c'], ['d, e', 'f']])
+    >>> stream.getvalue().splitlines()
+    ['context,target', 'a b,c', '"d, e",f']
+
+    """
+
+    DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+    def __init__(
+            self,
+            stream: TextIO,
+            header: Optional[Sequence[str]] = None,
+            buffer_size: Optional[int] = None
+    ):
+        if buffer_size is None:
+            buffer_size = self.DEFAULT_BUFFER_SIZE
+        elif buffer_size < 1:
+            raise ValueError('buffer_size < 1')
+
+        self.stream = stream
+        self.header = header
+        self.buffer_size = buffer_size
+
+        self.header_written = header is None
+        self.rows_written = 0
+
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator=os.linesep)
+
+    def writerow(self, row: Sequence[str]) -> None:
+        self.writerows([row])
+
+    def writerows(self, rows: Iterable[Sequence[str]]) -> None:
+        if not self.header_written:
+            self._writer.writerow(self.header)
+            self.header_written = True
+
+        if isinstance(rows, list):
+            self.rows_written += len(rows)
+            self._writer.writerows(rows)
+        else:
+            for row in rows:
+                self._writer.writerow(row)
+                self.rows_written += 1
+
+        if self._buffer.tell() >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes the buffered rows to the stream."""
+        if self._buffer.tell():
+            self.stream.write(self._buffer.getvalue())
+            self._buffer.seek(0)
+            self._buffer.truncate()
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> 'BufferedCsvWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
@@ -1,9 +1,13 @@
-from itertools import cycle
 import random
 
 
 class SampleDistributor:
-    """Helper class to distribute samples into training, validation, and testing sets."""
+    """
+    Helper class to distribute samples into training, validation, and testing sets.
+
+    The state of the distributor can be saved with `get_state()` and restored with `set_state()`,
+    so that the distribution continues exactly as if it was not interrupted.
+    """
 
     TRAIN = 'train'
     VAL = 'val'
@@ -20,9 +24,38 @@ class SampleDistributor:
         self.test_length = 0
         self.sum_length = 0
 
-        self.sample_cycle = cycle(self.SAMPLES)
+        # The index of the next sample in `SAMPLES`, the samples are taken in a cycle
+        self.sample_idx = 0
         self.rnd = random.Random(seed)
 
+    def get_state(self) -> dict:
+        """Returns the state of the distributor, a JSON-serializable dict."""
+        version, internal_state, gauss_next = self.rnd.getstate()
+        return {
+            'train_length': self.train_length,
+            'val_length': self.val_length,
+            'test_length': self.test_length,
+            'sum_length': self.sum_length,
+            'sample_idx': self.sample_idx,
+            'rnd_state': [version, list(internal_state), gauss_next],
+        }
+
+    def set_state(self, state: dict) -> None:
+        """Restores the state returned by `get_state()`."""
+        self.train_length = state['train_length']
+        self.val_length = state['val_length']
+        self.test_length = state['test_length']
+        self.sum_length = state['sum_length']
+        self.sample_idx = state['sample_idx']
+
+        version, internal_state, gauss_next = state['rnd_state']
+        self.rnd.setstate((version, tuple(internal_state), gauss_next))
+
+    def _next_sample(self) -> str:
+        sample = self.SAMPLES[self.sample_idx]
+        self.sample_idx = (self.sample_idx + 1) % len(self.SAMPLES)
+        return sample
+
     def _check_ratio(self, sample: str) -> bool:
         if self.sum_length < 1:
             return True
@@ -53,11 +86,11 @@ class SampleDistributor:
 
         # Shift by random number
         for _ in range(self.rnd.randint(0, samp_length - 1)):
-            next(self.sample_cycle)
+            self._next_sample()
 
         for i in range(samp_length):
             is_last = i == samp_length - 1
-            sample = next(self.sample_cycle)
+            sample = self._next_sample()
             if is_last or self._check_ratio(sample):
                 self._update_ratio(sample, length)
                 return sample
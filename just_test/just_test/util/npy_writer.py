@@ -0,0 +1,84 @@
+import struct
+
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+
+
+class NpyAppendWriter:
+    """
+    Writes a `.npy` file, the first dimension of which grows as arrays are appended.
+
+    The header is written with a reserved length, and it is rewritten with the final shape
+    on `close()`, so the data is written only once and the resulting file can be memory-mapped
+    with `numpy.load(path, mmap_mode='r')`.
+
+    Args:
+        path (Union[str, Path]): The path to the output file.
+        dtype: The data type of the array.
+        row_shape (tuple[int, ...]): The shape of one row, i.e. of all dimensions except the first one.
+
+    Example:
+
+    >>> import tempfile
+    >>> with tempfile.TemporaryDirectory() as tmp_dir:
+    ...     path = Path(tmp_dir) / 'windows.npy'
+    ...     with NpyAppendWriter(path, np.int32, row_shape=(2,)) as writer:
+    ...         writer.append([[1, 2], [3, 4]])
+    ...         writer.append([[5, 6]])
+    ...     np.load(path).tolist()
+    [[1, 2], [3, 4], [5, 6]]
+
+    """
+
+    # The total length of the magic string, the header length field and the header itself.
+    # A multiple of 64 keeps the data aligned, as numpy does.
+    HEADER_SIZE = 128
+
+    def __init__(self, path: Union[str, Path], dtype, row_shape: tuple[int, ...] = ()):
+        self.path = Path(path)
+        self.dtype = np.dtype(dtype)
+        self.row_shape = tuple(row_shape)
+        self.length = 0
+
+        self._file = self.path.open('wb')
+        self._write_header()
+
+    def append(self, array) -> None:
+        array = np.ascontiguousarray(array, dtype=self.dtype)
+        if array.shape[1:] != self.row_shape:
+            raise ValueError(f'Expected rows of shape {self.row_shape}, got {array.shape[1:]}')
+
+        self._file.write(array.tobytes())
+        self.length += len(array)
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+
+        self._file.seek(0)
+        self._write_header()
+        self._file.close()
+
+    def _write_header(self) -> None:
+        header = repr({
+            'descr': np.lib.format.dtype_to_descr(self.dtype),
+            'fortran_order': False,
+            'shape': (self.length,) + self.row_shape,
+        }).encode('latin1')
+
+        # Version 1.0: magic string, 2-byte header length, header padded with spaces and ending with '\n'
+        magic = np.lib.format.magic(1, 0)
+        header_length = self.HEADER_SIZE - len(magic) - 2
+        if len(header) + 1 > header_length:
+            raise ValueError('The array header is too long')
+
+        header = header.ljust(header_length - 1) + b'\n'
+        self._file.write(magic + struct.pack('<H', header_length) + header)
+
+    def __enter__(self) -> 'NpyAppendWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
@@ -0,0 +1,157 @@
+import csv
+import json
+import time
+
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, Iterator, TypeVar, Union
+
+T = TypeVar('T')
+
+
+class _StageTimer:
+    __slots__ = ('_seconds', '_name', '_start')
+
+    def __init__(self, seconds: Counter, name: str):
+        self._seconds = seconds
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._seconds[self._name] += time.perf_counter() - self._start
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class StageStats:
+    """
+    Seconds spent in the stages of a pipeline and counters of the processed items.
+
+    The stats of worker processes can be sent as `to_dict()` and added with `merge()`,
+    then the seconds of a stage are the sum over the processes.
+
+    Example:
+
+    >>> stats = StageStats()
+    >>> with stats.stage('tokenize'):
+    ...     stats.add('sentences', 2)
+    >>> items = list(stats.timed_iter('read', ['a', 'b']))
+    >>> stats.counts['sentences'], sorted(stats.seconds)
+    (2, ['read', 'tokenize'])
+    >>> other = StageStats()
+    >>> other.merge(stats.to_dict())
+    >>> other.counts['sentences']
+    2
+
+    """
+
+    def __init__(self):
+        self.seconds: Counter = Counter()
+        self.counts: Counter = Counter()
+
+    @property
+    def enabled(self) -> bool:
+        return True
+
+    def stage(self, name: str) -> Union[_StageTimer, _NullTimer]:
+        """Returns a context manager that adds the time spent in it to the stage."""
+        return _StageTimer(self.seconds, name)
+
+    def timed_iter(self, name: str, iterable: Iterable[T]) -> Iterator[T]:
+        """Iterates over `iterable`, adding the time spent in getting the items to the stage."""
+        seconds = self.seconds
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                seconds[name] += time.perf_counter() - start
+                return
+            seconds[name] += time.perf_counter() - start
+            yield item
+
+    def add(self, name: str, count: int = 1) -> None:
+        self.counts[name] += count
+
+    def merge(self, data: dict) -> None:
+        """Adds the stats returned by `to_dict()`."""
+        self.seconds.update(data['seconds'])
+        self.counts.update(data['counts'])
+
+    def to_dict(self) -> dict:
+        return {'seconds': dict(self.seconds), 'counts': dict(self.counts)}
+
+    def get_rates(self, stage: str = 'total') -> dict[str, float]:
+        """Returns the counts per second of the stage."""
+        seconds = self.seconds.get(stage)
+        if not seconds:
+            return {}
+
+        return {name: count / seconds for name, count in self.counts.items()}
+
+    def summary(self, total_stage: str = 'total') -> str:
+        """Returns a text table of the stages and the counters, with the rates per second of `total_stage`."""
+        total_seconds = self.seconds.get(total_stage, 0.0)
+        rates = self.get_rates(total_stage)
+
+        lines = ['Stage seconds:']
+        for name, seconds in sorted(self.seconds.items(), key=lambda item: -item[1]):
+            share = f' ({seconds / total_seconds:.1%})' if total_seconds and name != total_stage else ''
+            lines.append(f'  {name}: {seconds:.3f}{share}')
+
+        lines.append('Counts:')
+        for name, count in sorted(self.counts.items()):
+            rate = f' ({rates[name]:.1f}/s)' if name in rates else ''
+            lines.append(f'  {name}: {count}{rate}')
+
+        return '\n'.join(lines)
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Saves the stats to a JSON file, or to a CSV file with `kind,name,value` rows if the path ends with .csv.
+        """
+        path = Path(path)
+        if path.suffix.lower() == '.csv':
+            with path.open('w', encoding='UTF-8', newline='') as fp:
+                writer = csv.writer(fp)
+                writer.writerow(('kind', 'name', 'value'))
+                writer.writerows(('seconds', name, seconds) for name, seconds in sorted(self.seconds.items()))
+                writer.writerows(('count', name, count) for name, count in sorted(self.counts.items()))
+        else:
+            with path.open('w', encoding='UTF-8') as fp:
+                json.dump(self.to_dict(), fp, indent=1, sort_keys=True)
+
+
+class NullStageStats(StageStats):
+    """`StageStats` that record nothing, to keep the instrumented code unchanged when the stats are not needed."""
+
+    @property
+    def enabled(self) -> bool:
+        return False
+
+    def stage(self, name: str) -> Union[_StageTimer, _NullTimer]:
+        return _NULL_TIMER
+
+    def timed_iter(self, name: str, iterable: Iterable[T]) -> Iterator[T]:
+        return iter(iterable)
+
+    def add(self, name: str, count: int = 1) -> None:
+        pass
+
+    def merge(self, data: dict) -> None:
+        pass
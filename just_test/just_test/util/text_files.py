@@ -0,0 +1,98 @@
+import bz2
+import gzip
+import io
+import lzma
+
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+
+class _ClosingBufferedReader(io.BufferedReader):
+    """A buffered reader of a decompressed stream that also closes the underlying compressed file."""
+
+    def __init__(self, raw: io.IOBase, buffer_size: int, file: io.IOBase):
+        super().__init__(raw, buffer_size)
+        self._file = file
+
+    def close(self) -> None:
+        try:
+            super().close()
+        finally:
+            self._file.close()
+
+
+def _open_zstd(file: io.BufferedIOBase) -> io.IOBase:
+    if zstandard is None:
+        raise ImportError('zstandard is required to read .zst files')
+
+    return zstandard.ZstdDecompressor().stream_reader(file, read_size=DEFAULT_BUFFER_SIZE)
+
+
+# File name suffixes of the compressed files and functions that open a decompressed stream of a binary file
+DECOMPRESSORS: dict[str, Callable[[io.BufferedIOBase], io.IOBase]] = {
+    '.gz': lambda file: gzip.GzipFile(fileobj=file, mode='rb'),
+    '.bz2': lambda file: bz2.BZ2File(file, mode='rb'),
+    '.xz': lambda file: lzma.LZMAFile(file, mode='rb'),
+    '.zst': _open_zstd,
+}
+
+
+def is_zstd_available() -> bool:
+    return zstandard is not None
+
+
+def open_text(
+        path: Union[str, Path],
+        encoding: str = 'UTF-8',
+        buffer_size: Optional[int] = None
+) -> io.TextIOWrapper:
+    """
+    Opens a text file for reading, decompressing it on the fly if the file name ends with
+    one of the `DECOMPRESSORS` suffixes (.gz, .bz2, .xz, .zst).
+
+    Both the compressed file and the decompressed stream are read with large buffers,
+    so that there are few reads from slow (for example, network) file systems.
+    Reading .zst files requires zstandard.
+
+    Args:
+        path (Union[str, Path]): The path to the file.
+        encoding (str): The text encoding. Defaults to 'UTF-8'.
+        buffer_size (int): Optional, the buffer size in bytes. Defaults to 1 MB.
+
+    Returns:
+        io.TextIOWrapper: The text stream with universal newlines, as `open(path, 'r')` returns.
+
+    Example:
+
+    >>> import tempfile
+    >>> with tempfile.TemporaryDirectory() as tmp_dir:
+    ...     path = Path(tmp_dir) / 'book.txt.gz'
+    ...     with gzip.open(path, 'wt', encoding='UTF-8') as fp:
+    ...         _ = fp.write('Alice\\r\\n')
+    ...     with open_text(path) as fp:
+    ...         fp.read()
+    'Alice\\n'
+
+    """
+    if buffer_size is None:
+        buffer_size = DEFAULT_BUFFER_SIZE
+
+    decompressor = DECOMPRESSORS.get(Path(path).suffix.lower())
+    if decompressor is None:
+        return open(path, 'r', encoding=encoding, buffering=buffer_size)
+
+    file = open(path, 'rb', buffering=buffer_size)
+    try:
+        stream = _ClosingBufferedReader(decompressor(file), buffer_size, file)
+    except BaseException:
+        file.close()
+        raise
+
+    return io.TextIOWrapper(stream, encoding=encoding)
@@ -0,0 +1,108 @@
+"""
+    A command-line benchmark for building the CBOW dataset from compressed book files.
+
+    Parameters:
+    `files`: strings, paths to UTF-8 book files,
+    `copies`: an integer, the number of copies of the books concatenated into one file,
+    `formats`: strings, the compression formats to compare: gz, bz2, xz, zst,
+    `punkt`: a flag, use the Punkt English model instead of `simple_sent_tokenize`.
+
+    Compresses the books in the temporary directory and compares the end-to-end time of
+    `EnglishBookCBOWDatasetCreator.create()` on the compressed file with decompressing the file
+    to disk first and running on the plain text file, as before.
+
+"""
+
+import argparse
+import bz2
+import gzip
+import lzma
+import os
+import shutil
+import tempfile
+import time
+
+from just_test.texts.books.prepare.english_cbow_dataset import EnglishBookCBOWDatasetCreator
+from just_test.texts.books.prepare.sent_tokenize import simple_sent_tokenize
+from just_test.util.text_files import is_zstd_available, open_text
+
+OPENERS = {
+    'gz': gzip.open,
+    'bz2': bz2.open,
+    'xz': lzma.open,
+}
+
+
+def compress(plain_path: str, path: str, compression: str) -> None:
+    if compression == 'zst':
+        import zstandard
+        with open(plain_path, 'rb') as fp, open(path, 'wb') as compressed_fp:
+            zstandard.ZstdCompressor().copy_stream(fp, compressed_fp)
+    else:
+        with open(plain_path, 'rb') as fp, OPENERS[compression](path, 'wb') as compressed_fp:
+            shutil.copyfileobj(fp, compressed_fp)
+
+
+def create_dataset(path: str, output_path: str, sent_tokenize) -> float:
+    start = time.perf_counter()
+    EnglishBookCBOWDatasetCreator([path], output_path, sent_tokenize=sent_tokenize).create()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the CBOW dataset creation from compressed books.")
+    parser.add_argument("--files", type=str, nargs='+', required=True, help="Paths to UTF-8 book files.")
+    parser.add_argument("--copies", type=int, default=1, help="Number of copies of the books.")
+    parser.add_argument("--formats", type=str, nargs='+', default=['gz', 'bz2', 'xz', 'zst'],
+                        help="Compression formats.")
+    parser.add_argument("--punkt", action="store_true", help="Use the Punkt English model.")
+    args = parser.parse_args()
+
+    sent_tokenize = None if args.punkt else simple_sent_tokenize
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        plain_path = os.path.join(tmp_dir, 'books.txt')
+        with open(plain_path, 'w', encoding='UTF-8') as fp:
+            for _ in range(args.copies):
+                for path in args.files:
+                    with open(path, 'r', encoding='UTF-8') as book_fp:
+                        fp.write(book_fp.read())
+                    fp.write('\n\n')
+
+        output_path = os.path.join(tmp_dir, 'cbow.csv')
+        plain_time = create_dataset(plain_path, output_path, sent_tokenize)
+        with open(output_path, 'rb') as fp:
+            expected = fp.read()
+
+        print(f"plain: {os.path.getsize(plain_path) / 2 ** 20:.2f} MB, create {plain_time:.2f} s")
+
+        for compression in args.formats:
+            if compression == 'zst' and not is_zstd_available():
+                print("zst: skipped, zstandard is not installed")
+                continue
+
+            path = f'{plain_path}.{compression}'
+            compress(plain_path, path, compression)
+
+            # Decompress to disk first
+            start = time.perf_counter()
+            decompressed_path = os.path.join(tmp_dir, 'decompressed.txt')
+            with open_text(path) as fp, open(decompressed_path, 'w', encoding='UTF-8') as decompressed_fp:
+                shutil.copyfileobj(fp, decompressed_fp)
+            decompress_time = time.perf_counter() - start
+            two_step_time = decompress_time + create_dataset(decompressed_path, output_path, sent_tokenize)
+            os.remove(decompressed_path)
+
+            streaming_time = create_dataset(path, output_path, sent_tokenize)
+            with open(output_path, 'rb') as fp:
+                identical = fp.read() == expected
+
+            print(f"{compression}: {os.path.getsize(path) / 2 ** 20:.2f} MB, "
+                  f"decompress to disk + create {two_step_time:.2f} s (decompress {decompress_time:.2f} s), "
+                  f"streaming create {streaming_time:.2f} s, identical output: {identical}")
+
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+    A command-line benchmark for writing CBOW rows to CSV.
+
+    Parameters:
+    `paragraphs`: an integer, the number of paragraphs to write,
+    `rows`: an integer, the number of rows per paragraph,
+    `repeat`: an integer, the number of runs of each method.
+
+    Compares rows per second of the per-paragraph `pandas.DataFrame.to_csv` path
+    with `BufferedCsvWriter`, and checks that both produce the same output.
+
+"""
+
+import argparse
+import io
+import random
+import time
+from typing import Callable
+
+import pandas as pd
+
+from just_test.util.csv_writer import BufferedCsvWriter
+
+HEADER = ['context', 'target', 'split']
+WORDS = ['the', 'alice', ',', 'said', '``', "''", 'rabbit', "n't", 'queen', '.', 'a', 'hatter']
+
+
+def create_paragraphs(paragraphs: int, rows: int) -> list[list[list[str]]]:
+    rnd = random.Random(1719)
+    res = []
+    for _ in range(paragraphs):
+        sample = rnd.choice(['train', 'val', 'test'])
+        res.append([
+            [' '.join(rnd.choices(WORDS, k=10)), rnd.choice(WORDS), sample]
+            for _ in range(rnd.randint(1, 2 * rows))
+        ])
+
+    return res
+
+
+def write_with_pandas(data: list[list[list[str]]], stream: io.StringIO) -> None:
+    header_printed = False
+    for paragraph in data:
+        df = pd.DataFrame(paragraph, columns=HEADER)
+        df.to_csv(stream, index=False, header=not header_printed)
+        header_printed = True
+
+
+def write_with_buffered_writer(data: list[list[list[str]]], stream: io.StringIO) -> None:
+    with BufferedCsvWriter(stream, header=HEADER) as writer:
+        for paragraph in data:
+            writer.writerows(paragraph)
+
+
+def measure(func: Callable, data: list[list[list[str]]], repeat: int) -> tuple[float, str]:
+    best = float('inf')
+    output = ''
+    for _ in range(repeat):
+        stream = io.StringIO()
+        start = time.perf_counter()
+        func(data, stream)
+        best = min(best, time.perf_counter() - start)
+        output = stream.getvalue()
+
+    return best, output
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark writing CBOW rows to CSV.")
+    parser.add_argument("--paragraphs", type=int, default=20000, help="Number of paragraphs.")
+    parser.add_argument("--rows", type=int, default=20, help="Average number of rows per paragraph.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of runs of each method.")
+    args = parser.parse_args()
+
+    data = create_paragraphs(args.paragraphs, args.rows)
+    rows = sum(len(paragraph) for paragraph in data)
+
+    pandas_time, pandas_output = measure(write_with_pandas, data, args.repeat)
+    writer_time, writer_output = measure(write_with_buffered_writer, data, args.repeat)
+
+    if pandas_output != writer_output:
+        raise ValueError("The outputs are different")
+
+    print(f"Rows: {rows}, paragraphs: {len(data)}")
+    print(f"pandas.DataFrame.to_csv: {rows / pandas_time:,.0f} rows/s")
+    print(f"BufferedCsvWriter:       {rows / writer_time:,.0f} rows/s")
+    print(f"Speedup: {pandas_time / writer_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+    A command-line benchmark for reading book files by paragraphs with different chunk sizes.
+
+    Parameters:
+    `files`: strings, paths to UTF-8 book files, optional,
+    `synthetic_size`: an integer, the size of the generated synthetic book in MB, 0 to skip it,
+    `chunk_sizes`: integers, the chunk sizes in KB to sweep,
+    `repeat`: an integer, the number of runs of each configuration.
+
+    For each file, reads all paragraphs with `TextParagraphsReader` for each chunk size, in the adaptive
+    mode and with `MappedTextParagraphsReader`, and reports paragraphs per second, MB per second
+    and the peak memory traced by tracemalloc (in a separate run, as tracing slows down reading).
+
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Iterator
+
+from just_test.texts.books.prepare.paragraphs_reader import MappedTextParagraphsReader, TextParagraphsReader
+
+WORDS = ['the', 'Alice', 'said', 'rabbit', 'queen', 'a', 'hatter', 'été', '—', '“Oh!”', 'very', 'tired']
+
+
+def create_synthetic_book(path: str, size: int) -> None:
+    rnd = random.Random(1719)
+    with open(path, 'w', encoding='UTF-8') as fp:
+        written = 0
+        while written < size:
+            lines = [' '.join(rnd.choices(WORDS, k=12)) for _ in range(rnd.randint(1, 12))]
+            paragraph = '\n'.join(lines) + rnd.choice(['\n\n', '\n\n\n', '\n   \n\n', '\n\n* * *\n\n'])
+            fp.write(paragraph)
+            written += len(paragraph)
+
+
+def read_stream(path: str, **kwargs) -> Iterator[str]:
+    with open(path, 'r', encoding='UTF-8') as fp:
+        yield from TextParagraphsReader(fp, **kwargs)
+
+
+def read_mapped(path: str) -> Iterator[str]:
+    with MappedTextParagraphsReader(path) as reader:
+        yield from reader
+
+
+def measure(name: str, path: str, read: Callable[[str], Iterator[str]], repeat: int) -> None:
+    size = os.path.getsize(path) / 2 ** 20
+
+    best = float('inf')
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = sum(1 for _ in read(path))
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    for _ in read(path):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"  {name:>10}: {count / best:12.0f} paragraphs/s, {size / best:7.2f} MB/s, "
+          f"peak {peak / 2 ** 20:7.2f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark reading book files by paragraphs.")
+    parser.add_argument("--files", type=str, nargs='*', default=[], help="Paths to UTF-8 book files.")
+    parser.add_argument("--synthetic_size", type=int, default=50, help="Size of the synthetic book in MB.")
+    parser.add_argument("--chunk_sizes", type=int, nargs='+', default=[4, 16, 64, 256, 1024],
+                        help="Chunk sizes in KB.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of runs of each configuration.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = list(args.files)
+        if args.synthetic_size:
+            synthetic_path = os.path.join(tmp_dir, 'synthetic.txt')
+            create_synthetic_book(synthetic_path, args.synthetic_size * 2 ** 20)
+            paths.append(synthetic_path)
+
+        for path in paths:
+            print(f"{path} ({os.path.getsize(path) / 2 ** 20:.2f} MB)")
+            for chunk_size in args.chunk_sizes:
+                measure(
+                    f"{chunk_size} KB",
+                    path,
+                    lambda p: read_stream(p, read_chunk_size=chunk_size * 1024),
+                    args.repeat
+                )
+
+            measure("adaptive", path, lambda p: read_stream(p, adaptive=True), args.repeat)
+            measure("mmap", path, read_mapped, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+    A command-line benchmark for `prepare_english_book_text`.
+
+    Parameters:
+    `file`: a string, optional, the path to a UTF-8 book file.
+        Defaults to the test texts of the package,
+    `repeat`: an integer, the number of runs.
+
+    Splits the text into paragraphs and reports the throughput
+    of `prepare_english_book_text` in MB/s of input text.
+
+"""
+
+import argparse
+from pathlib import Path
+import time
+
+import just_test
+from just_test.texts.books.prepare.english import prepare_english_book_text
+from just_test.texts.books.prepare.paragraphs_reader import TextParagraphsReader
+
+RESOURCES_PATH = Path(just_test.__file__).parent / "tests/resources/texts/books/prepare"
+
+
+def read_paragraphs(file_path: Path) -> list[str]:
+    with open(file_path, 'r', encoding='UTF-8') as fp:
+        return TextParagraphsReader(fp).read_all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark prepare_english_book_text.")
+    parser.add_argument("--file", type=str, required=False, help="Path to a UTF-8 book file.")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of runs.")
+    args = parser.parse_args()
+
+    if args.file:
+        paragraphs = read_paragraphs(Path(args.file))
+    else:
+        if not RESOURCES_PATH.exists():
+            parser.error("The test texts are not installed, use --file")
+        paragraphs = []
+        for file_path in sorted(RESOURCES_PATH.glob('*.txt')):
+            paragraphs.extend(read_paragraphs(file_path))
+        # Make the run long enough to measure
+        paragraphs *= 20
+
+    size = sum(len(p.encode('UTF-8')) for p in paragraphs)
+
+    best = float('inf')
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        for paragraph in paragraphs:
+            prepare_english_book_text(paragraph)
+        best = min(best, time.perf_counter() - start)
+
+    print(f"Paragraphs: {len(paragraphs)}, size: {size / 1e6:.2f} MB")
+    print(f"prepare_english_book_text: {size / 1e6 / best:.2f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
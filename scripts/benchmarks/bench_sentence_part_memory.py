@@ -0,0 +1,57 @@
+"""
+    A command-line tool for measuring the memory of the direct speech text parts with tracemalloc.
+
+    Parameters:
+    `file`: a string, the path to a UTF-8 book file (a full novel).
+
+    Splits every paragraph of the book into parts, keeping all of them alive, first as `SentencePart`
+    objects (`_split_text_to_parts`) and then as `(start, end, flags)` offsets (`_split_text_to_spans`),
+    and reports the memory allocated by each representation.
+
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+
+from just_test.texts.books.prepare.direct_speech import _split_text_to_parts, _split_text_to_spans
+from just_test.texts.books.prepare.english import prepare_english_book_text
+from just_test.texts.books.prepare.paragraphs_reader import TextParagraphsReader
+
+
+def measure(name, split, paragraphs):
+    tracemalloc.start()
+    start = time.perf_counter()
+    res = [split(text) for text in paragraphs]
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    count = sum(len(parts) for parts in res)
+    print(f"{name}: {count} parts, {current / 2 ** 20:.2f} MB retained, {peak / 2 ** 20:.2f} MB peak, "
+          f"{current / max(count, 1):.0f} bytes per part, {elapsed:.2f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the memory of the direct speech text parts.")
+    parser.add_argument("--file", type=str, required=True, help="Path to a UTF-8 book file.")
+    args = parser.parse_args()
+
+    with open(args.file, 'r', encoding='UTF-8') as fp:
+        paragraphs = [prepare_english_book_text(text) for text in TextParagraphsReader(fp)]
+
+    print(f"Paragraphs: {len(paragraphs)}, characters: {sum(len(text) for text in paragraphs)}")
+
+    for secondary in (False, True):
+        print(f"secondary={secondary}")
+        measure("  parts", lambda text: _split_text_to_parts(text, secondary=secondary), paragraphs)
+        measure("  spans", lambda text: _split_text_to_spans(text, secondary=secondary), paragraphs)
+
+    parts = _split_text_to_parts('"What a day!" he exclaimed.')
+    print(f"sys.getsizeof(SentencePart): {sys.getsizeof(parts[0])} bytes, "
+          f"has __dict__: {hasattr(parts[0], '__dict__')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+    A command-line benchmark of `regex_word_tokenize` against nltk `word_tokenize`.
+
+    Parameters:
+    `file`: a string, optional, the path to a UTF-8 book file.
+        Defaults to the test texts of the package,
+    `repeat`: an integer, the number of runs.
+
+    Prepares the sentences of the paragraphs as `EnglishBookCBOWDatasetCreator` does, reports
+    the throughput of both tokenizers in MB/s of the sentences and the number of sentences
+    with different tokens.
+
+"""
+
+import argparse
+from pathlib import Path
+import time
+from typing import Callable
+
+import just_test
+from just_test.texts.books.prepare.direct_speech import reconstruct_direct_speech
+from just_test.texts.books.prepare.english import prepare_english_book_text
+from just_test.texts.books.prepare.paragraphs_reader import TextParagraphsReader
+from just_test.texts.books.prepare.sent_tokenize import simple_sent_tokenize
+from just_test.texts.books.prepare.word_tokenize import (
+    UNSUPPORTED_TEXT_REGEX,
+    nltk_word_tokenize,
+    regex_word_tokenize,
+)
+
+RESOURCES_PATH = Path(just_test.__file__).parent / "tests/resources/texts/books/prepare"
+
+
+def read_paragraphs(file_path: Path) -> list[str]:
+    with open(file_path, 'r', encoding='UTF-8') as fp:
+        return TextParagraphsReader(fp).read_all()
+
+
+def create_sentences(paragraphs: list[str]) -> list[str]:
+    sentences = []
+    for paragraph in paragraphs:
+        text = prepare_english_book_text(paragraph)
+        text = text.replace(';', '.').replace(':', '.')
+        text = reconstruct_direct_speech(text, sent_tokenize=simple_sent_tokenize)
+        sentences.extend(simple_sent_tokenize(text))
+
+    return sentences
+
+
+def measure(word_tokenize: Callable[[str], list[str]], sentences: list[str], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for sentence in sentences:
+            word_tokenize(sentence)
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark regex_word_tokenize against nltk word_tokenize.")
+    parser.add_argument("--file", type=str, required=False, help="Path to a UTF-8 book file.")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of runs.")
+    args = parser.parse_args()
+
+    if args.file:
+        paragraphs = read_paragraphs(Path(args.file))
+    else:
+        if not RESOURCES_PATH.exists():
+            parser.error("The test texts are not installed, use --file")
+        paragraphs = []
+        for file_path in sorted(RESOURCES_PATH.glob('*.txt')):
+            paragraphs.extend(read_paragraphs(file_path))
+
+    sentences = create_sentences(paragraphs)
+    size = sum(len(s.encode('UTF-8')) for s in sentences)
+    different = sum(1 for s in sentences if regex_word_tokenize(s) != nltk_word_tokenize(s))
+    unsupported = sum(1 for s in sentences if UNSUPPORTED_TEXT_REGEX.search(s))
+
+    nltk_seconds = measure(nltk_word_tokenize, sentences, args.repeat)
+    regex_seconds = measure(regex_word_tokenize, sentences, args.repeat)
+
+    print(f"Sentences: {len(sentences)}, size: {size / 1e6:.2f} MB, tokenized by nltk: {unsupported}")
+    print(f"nltk word_tokenize: {size / 1e6 / nltk_seconds:.2f} MB/s")
+    print(f"regex_word_tokenize: {size / 1e6 / regex_seconds:.2f} MB/s ({nltk_seconds / regex_seconds:.1f}x)")
+    print(f"Sentences with different tokens: {different}")
+
+
+if __name__ == "__main__":
+    main()
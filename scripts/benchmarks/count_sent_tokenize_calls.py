@@ -0,0 +1,72 @@
+"""
+    A command-line tool for counting sentence tokenizer calls on a book.
+
+    Parameters:
+    `file`: a string, the path to a UTF-8 book file,
+    `punkt`: a flag, use the Punkt English model instead of `simple_sent_tokenize`.
+
+    Prepares each paragraph as `EnglishBookCBOWDatasetCreator` does and reports
+    how many sentence tokenizer calls `SentencePart` made and how many its cache saved.
+    The calls are counted by wrapping `SentencePart._get_sentences` in this script only,
+    so the library code is not instrumented.
+
+"""
+
+import argparse
+import functools
+import time
+
+from just_test.texts.books.prepare.direct_speech import reconstruct_direct_speech
+from just_test.texts.books.prepare.english import prepare_english_book_text
+from just_test.texts.books.prepare.paragraphs_reader import TextParagraphsReader
+from just_test.texts.books.prepare.sent_tokenize import simple_sent_tokenize
+from just_test.texts.books.prepare.sentence_part import SentencePart
+from just_test.util.stage_stats import StageStats
+
+
+def count_sentence_requests(stats: StageStats) -> None:
+    """Wraps `SentencePart._get_sentences` to count the tokenizer calls and the requests served by the cache."""
+    get_sentences = SentencePart._get_sentences
+
+    @functools.wraps(get_sentences)
+    def wrapper(self: SentencePart) -> list[str]:
+        stats.add('sent_tokenize_calls' if self._sentences is None else 'sent_tokenize_cached')
+        return get_sentences(self)
+
+    SentencePart._get_sentences = wrapper
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count sentence tokenizer calls on a book.")
+    parser.add_argument("--file", type=str, required=True, help="Path to a UTF-8 book file.")
+    parser.add_argument("--punkt", action="store_true", help="Use the Punkt English model.")
+    args = parser.parse_args()
+
+    sent_tokenize = simple_sent_tokenize
+    if args.punkt:
+        import nltk
+        sent_tokenize = nltk.data.load('tokenizers/punkt/english.pickle').tokenize
+
+    stats = StageStats()
+    count_sentence_requests(stats)
+
+    start = time.perf_counter()
+    with open(args.file, 'r', encoding='UTF-8') as fp:
+        for text in TextParagraphsReader(fp):
+            text = prepare_english_book_text(text)
+            text = text.replace(';', '.').replace(':', '.')
+            reconstruct_direct_speech(text, sent_tokenize=sent_tokenize, stats=stats)
+    elapsed = time.perf_counter() - start
+
+    calls = stats.counts['sent_tokenize_calls']
+    cached = stats.counts['sent_tokenize_cached']
+    fast, full = stats.counts['direct_speech_fast'], stats.counts['direct_speech_full']
+    print(f"Paragraphs: fast path {fast}, full path {full}")
+    print(f"Sentence tokenizer calls: {calls}, saved by the cache: {cached}")
+    if calls + cached:
+        print(f"Saved: {cached / (calls + cached):.1%}")
+    print(f"Time: {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()